@@ -13,26 +13,101 @@ VIBA AI 에이전트 시스템
 @date 2025.07.07
 """
 
-from openai import AsyncOpenAI
+import aiohttp
 import asyncio
+import hashlib
+import heapq
 import uuid
-import json
 import logging
+import orjson
+from aiolimiter import AsyncLimiter
+from cachetools import LRUCache
+from collections import Counter, deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from types import MappingProxyType
+from typing import AsyncIterator, Deque, Dict, List, Mapping, Optional, Any, Tuple
 from pydantic import BaseModel, Field
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from itertools import islice
 import os
+import random
+import sys
+import time
+
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    aioredis = None
+    REDIS_AVAILABLE = False
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    tiktoken = None
+    TIKTOKEN_AVAILABLE = False
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
-# OpenAI 클라이언트 초기화
-openai_client = AsyncOpenAI(
-    api_key=os.getenv("OPENAI_API_KEY", "your-api-key-here")
-)
+# Redis 세션 저장소 키
+SESSION_KEY_PREFIX = "sess:"
+# 에이전트별 활성 세션 정렬 집합 (멤버: 세션 ID, 점수: 만료 시각 epoch 초)
+AGENT_SESSIONS_KEY_PREFIX = "agent_sessions:"
+
+# 메시지 role 문자열 (세션 메시지 간 동일 객체 공유)
+ROLE_SYSTEM = sys.intern("system")
+ROLE_USER = sys.intern("user")
+ROLE_ASSISTANT = sys.intern("assistant")
+
+# 세션당 보관하는 최대 메시지 수 (초과 시 오래된 메시지부터 제거)
+MESSAGE_WINDOW = int(os.getenv("VIBA_MSG_WINDOW", "64"))
+
+# API 메시지 리스트 풀 최대 크기
+MESSAGE_POOL_SIZE = max(32, (os.cpu_count() or 1) * 2)
+
+# 응답 최대 토큰 수 (컨텍스트 예산에서 제외)
+MAX_RESPONSE_TOKENS = int(os.getenv("OPENAI_MAX_TOKENS", "1000"))
 
-@dataclass
+# OpenAI API 설정
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "your-api-key-here")
+OPENAI_CHAT_COMPLETIONS_URL = os.getenv(
+    "OPENAI_BASE_URL", "https://api.openai.com/v1"
+).rstrip("/") + "/chat/completions"
+
+# OpenAI API 재시도 설정
+OPENAI_MAX_ATTEMPTS = 5
+OPENAI_RETRY_BUDGET_SECONDS = 30.0
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# 프롬프트 캐싱 라우팅 키 전송 여부 (시스템 프롬프트 prefix 재사용)
+OPENAI_PROMPT_CACHE = os.getenv("OAI_PROMPT_CACHE", "true").lower() == "true"
+
+@lru_cache(maxsize=None)
+def _get_encoding(model: str):
+    """모델별 tiktoken 인코더 조회 (모델당 1회 생성)"""
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # 인코딩 파일을 내려받을 수 없는 환경 등
+        logger.warning(f"tiktoken 인코더 로드 실패, 글자 수 기반 추정 사용: {e}")
+        return None
+
+def count_tokens(text: str, model: str) -> int:
+    """텍스트 토큰 수 계산 (인코더 사용 불가 시 글자 수로 보수적 추정)"""
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return len(text)
+
+@dataclass(slots=True, frozen=True)
 class AIAgent:
     """AI 에이전트 기본 클래스"""
     id: str
@@ -41,46 +116,37 @@ class AIAgent:
     specialty: str
     experience: str
     system_prompt: str
-    capabilities: List[str]
+    capabilities: Tuple[str, ...]
     max_context_length: int = 4000
     temperature: float = 0.7
     model: str = "gpt-4-1106-preview"
 
-@dataclass
+@dataclass(slots=True)
 class ChatSession:
     """채팅 세션 관리 클래스"""
     session_id: str
     agent_id: str
     user_id: Optional[str]
-    messages: List[Dict[str, str]]
+    messages: Deque[Dict[str, str]]
     context: Dict[str, Any]
     created_at: datetime
     updated_at: datetime
     expires_at: datetime
-
-class VIBAAIAgentManager:
-    """VIBA AI 에이전트 매니저"""
-    
-    def __init__(self):
-        self.agents = self._initialize_agents()
-        self.sessions: Dict[str, ChatSession] = {}
-        self.session_timeout = timedelta(hours=24)
-    
-    def _initialize_agents(self) -> Dict[str, AIAgent]:
-        """8개 전문 AI 에이전트 초기화"""
-        
-        agents = {
-            "materials_specialist": AIAgent(
-                id="materials_specialist",
-                name="재료 전문가 AI",
-                description="건축 재료 선택과 친환경 솔루션을 제안하는 전문 AI입니다.",
-                specialty="재료 공학",
-                experience="10,000+ 프로젝트 경험",
-                capabilities=[
-                    "친환경 재료 추천", "비용 최적화", "성능 분석", 
-                    "지속가능성 평가", "재료 호환성 검토", "수명 주기 분석"
-                ],
-                system_prompt="""당신은 VIBA AI의 건축 재료 전문가입니다. 
+    expires_at_monotonic: float = 0.0
+
+# 8개 전문 AI 에이전트 사양 (불변, 모듈 로드 시 1회 생성)
+_AGENTS_SPEC: Tuple[AIAgent, ...] = (
+    AIAgent(
+        id="materials_specialist",
+        name="재료 전문가 AI",
+        description="건축 재료 선택과 친환경 솔루션을 제안하는 전문 AI입니다.",
+        specialty="재료 공학",
+        experience="10,000+ 프로젝트 경험",
+        capabilities=(
+            "친환경 재료 추천", "비용 최적화", "성능 분석", 
+            "지속가능성 평가", "재료 호환성 검토", "수명 주기 분석"
+        ),
+        system_prompt="""당신은 VIBA AI의 건축 재료 전문가입니다. 
                 
 전문 분야:
 - 친환경 건축 재료 선택 및 평가
@@ -97,19 +163,19 @@ class VIBAAIAgentManager:
 5. 한국어로 친근하게 설명
 
 항상 최신 건축 기준과 친환경 트렌드를 반영하여 답변하세요."""
-            ),
-            
-            "design_theorist": AIAgent(
-                id="design_theorist",
-                name="설계 이론가 AI",
-                description="건축 설계 이론과 공간 구성을 전문으로 하는 AI입니다.",
-                specialty="설계 이론",
-                experience="5,000+ 설계 분석",
-                capabilities=[
-                    "공간 설계", "비례 시스템", "동선 계획", 
-                    "기능성 분석", "미학적 평가", "사용자 경험 설계"
-                ],
-                system_prompt="""당신은 VIBA AI의 건축 설계 이론 전문가입니다.
+    ),
+    
+    AIAgent(
+        id="design_theorist",
+        name="설계 이론가 AI",
+        description="건축 설계 이론과 공간 구성을 전문으로 하는 AI입니다.",
+        specialty="설계 이론",
+        experience="5,000+ 설계 분석",
+        capabilities=(
+            "공간 설계", "비례 시스템", "동선 계획", 
+            "기능성 분석", "미학적 평가", "사용자 경험 설계"
+        ),
+        system_prompt="""당신은 VIBA AI의 건축 설계 이론 전문가입니다.
 
 전문 분야:
 - 건축 설계 이론 및 원칙
@@ -126,19 +192,19 @@ class VIBAAIAgentManager:
 5. 문화적 맥락과 지역성 반영
 
 창의적이면서도 실용적인 설계 솔루션을 제시하세요."""
-            ),
-            
-            "bim_specialist": AIAgent(
-                id="bim_specialist",
-                name="BIM 전문가 AI",
-                description="BIM 모델링과 3D 설계를 담당하는 전문 AI입니다.",
-                specialty="BIM 모델링",
-                experience="2,000+ BIM 모델",
-                capabilities=[
-                    "3D 모델링", "IFC 변환", "충돌 검사", 
-                    "시공성 검토", "4D/5D BIM", "협업 워크플로우"
-                ],
-                system_prompt="""당신은 VIBA AI의 BIM(Building Information Modeling) 전문가입니다.
+    ),
+    
+    AIAgent(
+        id="bim_specialist",
+        name="BIM 전문가 AI",
+        description="BIM 모델링과 3D 설계를 담당하는 전문 AI입니다.",
+        specialty="BIM 모델링",
+        experience="2,000+ BIM 모델",
+        capabilities=(
+            "3D 모델링", "IFC 변환", "충돌 검사", 
+            "시공성 검토", "4D/5D BIM", "협업 워크플로우"
+        ),
+        system_prompt="""당신은 VIBA AI의 BIM(Building Information Modeling) 전문가입니다.
 
 전문 분야:
 - 3D BIM 모델링 및 데이터 관리
@@ -155,19 +221,19 @@ class VIBAAIAgentManager:
 5. 국내 BIM 가이드라인 준수
 
 효율적이고 정확한 BIM 워크플로우를 제안하세요."""
-            ),
-            
-            "structural_engineer": AIAgent(
-                id="structural_engineer",
-                name="구조 엔지니어 AI",
-                description="구조 계산과 안전성 검토를 수행하는 AI입니다.",
-                specialty="구조 공학",
-                experience="15,000+ 구조 해석",
-                capabilities=[
-                    "구조 계산", "안전성 검토", "내진 설계", 
-                    "하중 분석", "재료 역학", "구조 최적화"
-                ],
-                system_prompt="""당신은 VIBA AI의 구조 공학 전문가입니다.
+    ),
+    
+    AIAgent(
+        id="structural_engineer",
+        name="구조 엔지니어 AI",
+        description="구조 계산과 안전성 검토를 수행하는 AI입니다.",
+        specialty="구조 공학",
+        experience="15,000+ 구조 해석",
+        capabilities=(
+            "구조 계산", "안전성 검토", "내진 설계", 
+            "하중 분석", "재료 역학", "구조 최적화"
+        ),
+        system_prompt="""당신은 VIBA AI의 구조 공학 전문가입니다.
 
 전문 분야:
 - 구조 계산 및 안전성 검토
@@ -184,19 +250,19 @@ class VIBAAIAgentManager:
 5. 시공성과 경제성 고려
 
 안전하고 경제적인 구조 설계를 제안하세요."""
-            ),
-            
-            "mep_specialist": AIAgent(
-                id="mep_specialist",
-                name="MEP 전문가 AI",
-                description="기계/전기/배관 시스템을 설계하는 전문 AI입니다.",
-                specialty="MEP 시스템",
-                experience="8,000+ MEP 설계",
-                capabilities=[
-                    "HVAC 설계", "전기 시스템", "배관 계획", 
-                    "에너지 분석", "설비 최적화", "통합 제어"
-                ],
-                system_prompt="""당신은 VIBA AI의 MEP(기계/전기/배관) 시스템 전문가입니다.
+    ),
+    
+    AIAgent(
+        id="mep_specialist",
+        name="MEP 전문가 AI",
+        description="기계/전기/배관 시스템을 설계하는 전문 AI입니다.",
+        specialty="MEP 시스템",
+        experience="8,000+ MEP 설계",
+        capabilities=(
+            "HVAC 설계", "전기 시스템", "배관 계획", 
+            "에너지 분석", "설비 최적화", "통합 제어"
+        ),
+        system_prompt="""당신은 VIBA AI의 MEP(기계/전기/배관) 시스템 전문가입니다.
 
 전문 분야:
 - HVAC 시스템 설계 및 최적화
@@ -213,19 +279,19 @@ class VIBAAIAgentManager:
 5. 최신 기술 트렌드 반영
 
 지속가능하고 효율적인 MEP 시스템을 제안하세요."""
-            ),
-            
-            "cost_estimator": AIAgent(
-                id="cost_estimator",
-                name="비용 추정 AI",
-                description="정확한 공사비 산출과 예산 관리를 담당하는 AI입니다.",
-                specialty="건설 경제",
-                experience="20,000+ 견적 분석",
-                capabilities=[
-                    "공사비 산출", "예산 관리", "가치 공학", 
-                    "시장 분석", "리스크 평가", "생애주기 비용"
-                ],
-                system_prompt="""당신은 VIBA AI의 건설 비용 및 경제성 분석 전문가입니다.
+    ),
+    
+    AIAgent(
+        id="cost_estimator",
+        name="비용 추정 AI",
+        description="정확한 공사비 산출과 예산 관리를 담당하는 AI입니다.",
+        specialty="건설 경제",
+        experience="20,000+ 견적 분석",
+        capabilities=(
+            "공사비 산출", "예산 관리", "가치 공학", 
+            "시장 분석", "리스크 평가", "생애주기 비용"
+        ),
+        system_prompt="""당신은 VIBA AI의 건설 비용 및 경제성 분석 전문가입니다.
 
 전문 분야:
 - 정확한 공사비 산출 및 예산 관리
@@ -242,19 +308,19 @@ class VIBAAIAgentManager:
 5. 투자 대비 효과 분석
 
 정확하고 현실적인 비용 분석을 제공하세요."""
-            ),
-            
-            "schedule_manager": AIAgent(
-                id="schedule_manager",
-                name="일정 관리 AI",
-                description="프로젝트 일정과 리소스를 최적화하는 AI입니다.",
-                specialty="프로젝트 관리",
-                experience="5,000+ 프로젝트 관리",
-                capabilities=[
-                    "일정 계획", "리소스 배분", "공정 관리", 
-                    "위험 분석", "품질 관리", "팀 협업"
-                ],
-                system_prompt="""당신은 VIBA AI의 건설 프로젝트 관리 전문가입니다.
+    ),
+    
+    AIAgent(
+        id="schedule_manager",
+        name="일정 관리 AI",
+        description="프로젝트 일정과 리소스를 최적화하는 AI입니다.",
+        specialty="프로젝트 관리",
+        experience="5,000+ 프로젝트 관리",
+        capabilities=(
+            "일정 계획", "리소스 배분", "공정 관리", 
+            "위험 분석", "품질 관리", "팀 협업"
+        ),
+        system_prompt="""당신은 VIBA AI의 건설 프로젝트 관리 전문가입니다.
 
 전문 분야:
 - 프로젝트 일정 계획 및 진도 관리
@@ -271,19 +337,19 @@ class VIBAAIAgentManager:
 5. 협업 도구 및 프로세스 제안
 
 성공적인 프로젝트 완수를 위한 체계적인 관리 방안을 제시하세요."""
-            ),
-            
-            "interior_designer": AIAgent(
-                id="interior_designer",
-                name="인테리어 디자인 AI",
-                description="공간 디자인과 인테리어 계획을 담당하는 AI입니다.",
-                specialty="인테리어 디자인",
-                experience="3,000+ 인테리어 설계",
-                capabilities=[
-                    "공간 계획", "색채 설계", "조명 계획", 
-                    "가구 배치", "재료 선택", "스타일 큐레이션"
-                ],
-                system_prompt="""당신은 VIBA AI의 인테리어 디자인 전문가입니다.
+    ),
+    
+    AIAgent(
+        id="interior_designer",
+        name="인테리어 디자인 AI",
+        description="공간 디자인과 인테리어 계획을 담당하는 AI입니다.",
+        specialty="인테리어 디자인",
+        experience="3,000+ 인테리어 설계",
+        capabilities=(
+            "공간 계획", "색채 설계", "조명 계획", 
+            "가구 배치", "재료 선택", "스타일 큐레이션"
+        ),
+        system_prompt="""당신은 VIBA AI의 인테리어 디자인 전문가입니다.
 
 전문 분야:
 - 실내 공간 계획 및 디자인
@@ -300,9 +366,69 @@ class VIBAAIAgentManager:
 5. 예산 범위 내 최적 솔루션
 
 아름답고 실용적인 인테리어 디자인을 제안하세요."""
-            )
-        }
+    )
+)
+
+class VIBAAIAgentManager:
+    """VIBA AI 에이전트 매니저"""
+    
+    def __init__(self):
+        self.sessions: Dict[str, ChatSession] = {}
+        self._agent_usage: Counter = Counter()
+        # (만료 시각, 세션 ID) 최소 힙 - 만료된 세션만 꺼내 정리
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self.session_timeout = timedelta(hours=24)
+        self._session_timeout_seconds = self.session_timeout.total_seconds()
         
+        # Redis 세션 저장소 (REDIS_URL 미설정 시 메모리 기반 세션 관리 사용)
+        redis_url = os.getenv("REDIS_URL")
+        if REDIS_AVAILABLE and redis_url:
+            self.redis = aioredis.from_url(redis_url, decode_responses=True)
+            logger.info("Redis 기반 세션 관리 사용")
+        else:
+            self.redis = None
+        
+        # OpenAI 동시 호출 수 제한
+        self._sem = asyncio.Semaphore(int(os.getenv("OAI_CONCURRENCY", "32")))
+        
+        # 요청별 API 메시지 리스트 재사용 풀
+        self._msg_pool: List[List[Dict[str, str]]] = []
+        
+        # OpenAI 분당 요청 수(RPM) 제한 토큰 버킷 (워커 프로세스별)
+        self._rpm_limit = int(os.getenv("OAI_RPM", "500"))
+        self._bucket = AsyncLimiter(max_rate=self._rpm_limit, time_period=60)
+        
+        # 응답 캐시 (에이전트 + 대화 내역 기준 LRU, 크기 0이면 비활성화)
+        cache_size = int(os.getenv("OAI_RESPONSE_CACHE_SIZE", "4096"))
+        self._resp_cache: Optional[LRUCache] = LRUCache(maxsize=cache_size) if cache_size > 0 else None
+        
+        # OpenAI HTTP 세션 (이벤트 루프 안에서 최초 호출 시 생성)
+        self._http_session: Optional[aiohttp.ClientSession] = None
+    
+    @cached_property
+    def agents(self) -> Mapping[str, AIAgent]:
+        """에이전트 목록 (첫 접근 시 초기화)"""
+        return self._initialize_agents()
+    
+    @cached_property
+    def _system_messages(self) -> Dict[str, Dict[str, str]]:
+        """에이전트별 시스템 프롬프트 메시지 (매 요청 동일한 prefix 유지)"""
+        return {
+            agent.id: {"role": ROLE_SYSTEM, "content": agent.system_prompt}
+            for agent in self.agents.values()
+        }
+    
+    @cached_property
+    def _system_tokens(self) -> Dict[str, int]:
+        """에이전트별 시스템 프롬프트 토큰 수"""
+        return {
+            agent.id: count_tokens(agent.system_prompt, agent.model)
+            for agent in self.agents.values()
+        }
+    
+    def _initialize_agents(self) -> Mapping[str, AIAgent]:
+        """8개 전문 AI 에이전트 초기화 (모듈 로드 시 생성된 사양 공유)"""
+        agents = MappingProxyType({agent.id: agent for agent in _AGENTS_SPEC})
         logger.info(f"AI 에이전트 {len(agents)}개 초기화 완료")
         return agents
     
@@ -319,12 +445,12 @@ class VIBAAIAgentManager:
                 "description": agent.description,
                 "specialty": agent.specialty,
                 "experience": agent.experience,
-                "capabilities": agent.capabilities
+                "capabilities": list(agent.capabilities)
             }
             for agent in self.agents.values()
         ]
     
-    def create_session(self, agent_id: str, user_id: Optional[str] = None) -> str:
+    async def create_session(self, agent_id: str, user_id: Optional[str] = None) -> str:
         """새로운 채팅 세션 생성"""
         if agent_id not in self.agents:
             raise ValueError(f"에이전트를 찾을 수 없습니다: {agent_id}")
@@ -336,76 +462,117 @@ class VIBAAIAgentManager:
             session_id=session_id,
             agent_id=agent_id,
             user_id=user_id,
-            messages=[],
+            messages=deque(maxlen=MESSAGE_WINDOW),
             context={},
             created_at=now,
             updated_at=now,
-            expires_at=now + self.session_timeout
+            expires_at=now + self.session_timeout,
+            expires_at_monotonic=time.monotonic() + self._session_timeout_seconds
         )
         
-        self.sessions[session_id] = session
+        if self.redis:
+            await self._save_session(session)
+            await self.redis.zadd(
+                f"{AGENT_SESSIONS_KEY_PREFIX}{agent_id}",
+                {session_id: time.time() + self._session_timeout_seconds}
+            )
+        else:
+            self.sessions[session_id] = session
+            self._agent_usage[agent_id] += 1
+            heapq.heappush(self._expiry_heap, (session.expires_at_monotonic, session_id))
         logger.info(f"새로운 세션 생성: {session_id} (에이전트: {agent_id})")
         return session_id
     
-    def get_session(self, session_id: str) -> Optional[ChatSession]:
+    async def get_session(self, session_id: str) -> Optional[ChatSession]:
         """세션 정보 조회"""
+        if self.redis:
+            key = f"{SESSION_KEY_PREFIX}{session_id}"
+            data = await self.redis.get(key)
+            if data is None:
+                return None
+            session = self._deserialize_session(data)
+            # 조회 시 세션 키 TTL과 활성 세션 집합의 만료 시각을 함께 갱신
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.expire(key, int(self._session_timeout_seconds))
+                pipe.zadd(
+                    f"{AGENT_SESSIONS_KEY_PREFIX}{session.agent_id}",
+                    {session_id: time.time() + self._session_timeout_seconds}
+                )
+                await pipe.execute()
+            session.expires_at = datetime.now() + self.session_timeout
+            session.expires_at_monotonic = time.monotonic() + self._session_timeout_seconds
+            return session
+        
         session = self.sessions.get(session_id)
-        if session and session.expires_at > datetime.now():
+        if session and session.expires_at_monotonic > time.monotonic():
             return session
         elif session:
             # 만료된 세션 삭제
-            del self.sessions[session_id]
+            self._remove_session(session_id)
             logger.info(f"만료된 세션 삭제: {session_id}")
         return None
     
+    def _remove_session(self, session_id: str):
+        """메모리 세션 삭제 및 에이전트 사용 카운터 갱신"""
+        session = self.sessions.pop(session_id, None)
+        if session is None:
+            return
+        self._agent_usage[session.agent_id] -= 1
+        if not self._agent_usage[session.agent_id]:
+            del self._agent_usage[session.agent_id]
+    
+    async def _save_session(self, session: ChatSession):
+        """세션을 Redis에 저장 (TTL 기반 만료)"""
+        if not self.redis:
+            return
+        await self.redis.set(
+            f"{SESSION_KEY_PREFIX}{session.session_id}",
+            self._serialize_session(session),
+            ex=int(self._session_timeout_seconds)
+        )
+    
+    @staticmethod
+    def _serialize_session(session: ChatSession) -> bytes:
+        """세션 직렬화 (orjson이 dataclass/datetime을 직접 처리, deque는 list로 변환)"""
+        return orjson.dumps(session, default=list)
+    
+    @staticmethod
+    def _deserialize_session(data: str) -> ChatSession:
+        """세션 역직렬화"""
+        raw = orjson.loads(data)
+        for field_name in ("created_at", "updated_at", "expires_at"):
+            raw[field_name] = datetime.fromisoformat(raw[field_name])
+        raw["messages"] = deque(raw["messages"], maxlen=MESSAGE_WINDOW)
+        return ChatSession(**raw)
+    
     async def chat(self, session_id: str, message: str, user_id: Optional[str] = None) -> Dict[str, Any]:
         """AI 에이전트와 채팅"""
-        session = self.get_session(session_id)
-        if not session:
-            raise ValueError(f"세션을 찾을 수 없습니다: {session_id}")
-        
-        agent = self.agents[session.agent_id]
-        
-        # 메시지 기록에 사용자 메시지 추가
-        session.messages.append({
-            "role": "user",
-            "content": message,
-            "timestamp": datetime.now().isoformat()
-        })
-        
-        # OpenAI API 호출을 위한 메시지 구성
-        api_messages = [
-            {"role": "system", "content": agent.system_prompt}
-        ]
-        
-        # 최근 대화 내역 추가 (컨텍스트 길이 제한)
-        recent_messages = session.messages[-10:]  # 최근 10개 메시지만
-        for msg in recent_messages:
-            api_messages.append({
-                "role": msg["role"],
-                "content": msg["content"]
-            })
+        session, agent, now, api_messages = await self._begin_turn(session_id, message)
+        now_iso = now.isoformat()
         
         try:
-            # OpenAI API 호출
-            response = await self._call_openai_api(
-                messages=api_messages,
-                model=agent.model,
-                temperature=agent.temperature,
-                max_tokens=1000
-            )
+            # 동일 대화 맥락의 응답 캐시 조회
+            cache_key = self._response_cache_key(agent.id, api_messages)
+            ai_response = self._resp_cache.get(cache_key) if self._resp_cache is not None else None
             
-            ai_response = response.choices[0].message.content
+            if ai_response is None:
+                # OpenAI API 호출
+                response = await self._call_openai_api(
+                    messages=api_messages,
+                    model=agent.model,
+                    temperature=agent.temperature,
+                    max_tokens=MAX_RESPONSE_TOKENS,
+                    prompt_cache_key=agent.id
+                )
+                
+                ai_response = response["choices"][0]["message"]["content"]
+                if self._resp_cache is not None:
+                    self._resp_cache[cache_key] = ai_response
+            else:
+                logger.info(f"AI 응답 캐시 적중: {session_id}")
             
             # 응답을 세션에 추가
-            session.messages.append({
-                "role": "assistant",
-                "content": ai_response,
-                "timestamp": datetime.now().isoformat()
-            })
-            
-            # 세션 업데이트
-            session.updated_at = datetime.now()
+            await self._finish_turn(session, agent, now, ai_response)
             
             logger.info(f"AI 응답 생성 완료: {session_id} ({len(ai_response)} chars)")
             
@@ -417,20 +584,15 @@ class VIBAAIAgentManager:
                     "specialty": agent.specialty
                 },
                 "session_id": session_id,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now_iso
             }
             
         except Exception as e:
             logger.error(f"OpenAI API 호출 실패: {e}")
             
             # 폴백 응답
-            fallback_response = f"죄송합니다. 현재 {agent.name} 서비스에 일시적인 문제가 발생했습니다. 잠시 후 다시 시도해주세요."
-            
-            session.messages.append({
-                "role": "assistant",
-                "content": fallback_response,
-                "timestamp": datetime.now().isoformat()
-            })
+            fallback_response = self._fallback_response(agent)
+            await self._finish_turn(session, agent, now, fallback_response)
             
             return {
                 "response": fallback_response,
@@ -440,53 +602,320 @@ class VIBAAIAgentManager:
                     "specialty": agent.specialty
                 },
                 "session_id": session_id,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now_iso,
                 "error": True
             }
+        finally:
+            self._release_message_buffer(api_messages)
     
-    async def _call_openai_api(self, messages: List[Dict], model: str, temperature: float, max_tokens: int):
-        """OpenAI API 비동기 호출"""
+    async def chat_stream(self, session_id: str, message: str, user_id: Optional[str] = None) -> AsyncIterator[str]:
+        """AI 에이전트와 스트리밍 채팅 (Server-Sent Events 이벤트 문자열 생성기 반환)
+        
+        세션 조회 오류(ValueError)는 스트림 시작 전에 발생합니다.
+        """
+        session, agent, now, api_messages = await self._begin_turn(session_id, message)
+        return self._stream_events(session, agent, now, api_messages)
+    
+    async def _stream_events(self, session: ChatSession, agent: AIAgent, now: datetime,
+                             api_messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+        """토큰 단위 SSE 이벤트 생성 후 완성된 응답을 세션에 저장"""
         try:
-            response = await openai_client.chat.completions.create(
-                model=model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                timeout=30
+            cache_key = self._response_cache_key(agent.id, api_messages)
+            cached = self._resp_cache.get(cache_key) if self._resp_cache is not None else None
+            
+            if cached is not None:
+                logger.info(f"AI 응답 캐시 적중: {session.session_id}")
+                yield self._sse_event({"delta": cached})
+                await self._finish_turn(session, agent, now, cached)
+                yield self._sse_event({"done": True, "session_id": session.session_id, "timestamp": now.isoformat()})
+                return
+            
+            chunks = []
+            error = False
+            try:
+                async for delta in self._stream_openai_api(
+                    messages=api_messages,
+                    model=agent.model,
+                    temperature=agent.temperature,
+                    max_tokens=MAX_RESPONSE_TOKENS,
+                    prompt_cache_key=agent.id
+                ):
+                    chunks.append(delta)
+                    yield self._sse_event({"delta": delta})
+            except Exception as e:
+                logger.error(f"OpenAI API 스트리밍 실패: {e}")
+                error = True
+            
+            if error and not chunks:
+                # 폴백 응답
+                ai_response = self._fallback_response(agent)
+                yield self._sse_event({"delta": ai_response})
+            else:
+                ai_response = "".join(chunks)
+                if not error and self._resp_cache is not None:
+                    self._resp_cache[cache_key] = ai_response
+            
+            await self._finish_turn(session, agent, now, ai_response)
+            logger.info(f"AI 스트리밍 응답 완료: {session.session_id} ({len(ai_response)} chars)")
+            
+            event = {"done": True, "session_id": session.session_id, "timestamp": now.isoformat()}
+            if error:
+                event["error"] = True
+            yield self._sse_event(event)
+        finally:
+            self._release_message_buffer(api_messages)
+    
+    @staticmethod
+    def _sse_event(data: Dict[str, Any]) -> str:
+        """Server-Sent Events 형식 문자열 생성"""
+        return f"data: {orjson.dumps(data).decode()}\n\n"
+    
+    async def _begin_turn(self, session_id: str, message: str) -> Tuple[ChatSession, AIAgent, datetime, List[Dict[str, str]]]:
+        """사용자 메시지를 세션에 추가하고 API 메시지 구성"""
+        session = await self.get_session(session_id)
+        if not session:
+            raise ValueError(f"세션을 찾을 수 없습니다: {session_id}")
+        
+        agent = self.agents[session.agent_id]
+        now = datetime.now()
+        
+        # 메시지 기록에 사용자 메시지 추가
+        session.messages.append({
+            "role": ROLE_USER,
+            "content": message,
+            "tokens": count_tokens(message, agent.model),
+            "timestamp": now.isoformat()
+        })
+        
+        # OpenAI API 호출을 위한 메시지 구성
+        api_messages = self._acquire_message_buffer()
+        api_messages.append(self._system_messages[agent.id])
+        self._build_history(session, agent, api_messages)
+        return session, agent, now, api_messages
+    
+    async def _finish_turn(self, session: ChatSession, agent: AIAgent, now: datetime, content: str):
+        """어시스턴트 응답을 세션에 추가하고 저장"""
+        session.messages.append({
+            "role": ROLE_ASSISTANT,
+            "content": content,
+            "tokens": count_tokens(content, agent.model),
+            "timestamp": now.isoformat()
+        })
+        
+        # 세션 업데이트
+        session.updated_at = now
+        await self._save_session(session)
+    
+    @staticmethod
+    def _fallback_response(agent: AIAgent) -> str:
+        """OpenAI 호출 실패 시 폴백 응답"""
+        return f"죄송합니다. 현재 {agent.name} 서비스에 일시적인 문제가 발생했습니다. 잠시 후 다시 시도해주세요."
+    
+    @staticmethod
+    def _response_cache_key(agent_id: str, api_messages: List[Dict[str, str]]) -> Tuple[str, bytes]:
+        """응답 캐시 키 생성 (에이전트 ID, 대화 내역 해시)"""
+        digest = hashlib.blake2b(digest_size=16)
+        # 시스템 프롬프트는 에이전트별로 고정이므로 제외
+        for msg in islice(api_messages, 1, None):
+            digest.update(msg["role"].encode())
+            digest.update(b"\0")
+            digest.update(msg["content"].encode())
+            digest.update(b"\0")
+        return agent_id, digest.digest()
+    
+    def _build_history(self, session: ChatSession, agent: AIAgent, out: List[Dict[str, str]]):
+        """컨텍스트 토큰 예산에 맞춰 최근 대화 내역을 out에 추가"""
+        budget = agent.max_context_length - MAX_RESPONSE_TOKENS - self._system_tokens[agent.id]
+        count = 0
+        
+        # 최신 메시지부터 예산을 초과하기 전까지 포함 (가장 최근 메시지는 항상 포함)
+        for msg in reversed(session.messages):
+            tokens = msg.get("tokens")
+            if tokens is None:
+                tokens = count_tokens(msg["content"], agent.model)
+            if tokens > budget and count:
+                break
+            budget -= tokens
+            count += 1
+        
+        for msg in islice(session.messages, len(session.messages) - count, None):
+            out.append({
+                "role": msg["role"],
+                "content": msg["content"]
+            })
+    
+    def _acquire_message_buffer(self) -> List[Dict[str, str]]:
+        """API 메시지 리스트 풀에서 재사용 버퍼 조회"""
+        return self._msg_pool.pop() if self._msg_pool else []
+    
+    def _release_message_buffer(self, buffer: List[Dict[str, str]]):
+        """API 메시지 리스트를 비운 뒤 풀에 반환"""
+        buffer.clear()
+        if len(self._msg_pool) < MESSAGE_POOL_SIZE:
+            self._msg_pool.append(buffer)
+    
+    async def chat_many(self, items: List[Tuple[str, str]]) -> List[Any]:
+        """여러 세션의 채팅을 동시에 처리 (세마포어로 동시 호출 수 제한)"""
+        return await asyncio.gather(
+            *(self.chat(session_id, message) for session_id, message in items),
+            return_exceptions=True
+        )
+    
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """재사용 가능한 aiohttp 세션 조회"""
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=200, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=30),
+                headers={"Authorization": f"Bearer {OPENAI_API_KEY}"}
             )
-            return response
-        except Exception as e:
-            logger.error(f"OpenAI API 호출 오류: {e}")
-            raise
+        return self._http_session
+    
+    async def _call_openai_api(self, messages: List[Dict], model: str, temperature: float, max_tokens: int,
+                               prompt_cache_key: Optional[str] = None) -> Dict[str, Any]:
+        """OpenAI API 비동기 호출 (/v1/chat/completions 직접 호출)"""
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+        if prompt_cache_key and OPENAI_PROMPT_CACHE:
+            payload["prompt_cache_key"] = prompt_cache_key
+        
+        # 일시적 오류(429/5xx, 연결 오류, 타임아웃)는 지수 백오프 + 지터로 재시도
+        deadline = time.monotonic() + OPENAI_RETRY_BUDGET_SECONDS
+        for attempt in range(OPENAI_MAX_ATTEMPTS):
+            retry_after = None
+            try:
+                async with self._sem, self._bucket:
+                    async with self._get_http_session().post(OPENAI_CHAT_COMPLETIONS_URL, json=payload) as response:
+                        if response.status in RETRYABLE_STATUS_CODES:
+                            retry_after = response.headers.get("Retry-After")
+                        response.raise_for_status()
+                        return await response.json()
+            except (aiohttp.ClientResponseError, aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                status = getattr(e, "status", None)
+                retryable = status is None or status in RETRYABLE_STATUS_CODES
+                delay = self._retry_delay(attempt, retry_after)
+                if retryable and attempt < OPENAI_MAX_ATTEMPTS - 1 and time.monotonic() + delay < deadline:
+                    logger.warning(f"OpenAI API 재시도 ({attempt + 1}/{OPENAI_MAX_ATTEMPTS}, {delay:.1f}초 후): {e}")
+                    await asyncio.sleep(delay)
+                    continue
+                logger.error(f"OpenAI API 호출 오류: {e}")
+                raise
+            except Exception as e:
+                logger.error(f"OpenAI API 호출 오류: {e}")
+                raise
+    
+    async def _stream_openai_api(self, messages: List[Dict], model: str, temperature: float, max_tokens: int,
+                                 prompt_cache_key: Optional[str] = None) -> AsyncIterator[str]:
+        """OpenAI API 스트리밍 호출 (stream=True, 응답 토큰 조각 생성)"""
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": True
+        }
+        if prompt_cache_key and OPENAI_PROMPT_CACHE:
+            payload["prompt_cache_key"] = prompt_cache_key
+        
+        async with self._sem, self._bucket:
+            # 전체 생성 시간 대신 청크 간 대기 시간으로 타임아웃 적용
+            async with self._get_http_session().post(
+                OPENAI_CHAT_COMPLETIONS_URL,
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=None, sock_read=30)
+            ) as response:
+                response.raise_for_status()
+                async for line in response.content:
+                    line = line.strip()
+                    if not line.startswith(b"data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == b"[DONE]":
+                        break
+                    choices = orjson.loads(data).get("choices")
+                    if not choices:
+                        continue
+                    delta = choices[0].get("delta", {}).get("content")
+                    if delta:
+                        yield delta
+    
+    @staticmethod
+    def _retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+        """재시도 대기 시간 계산 (Retry-After 헤더 우선)"""
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                pass
+        return min(2 ** attempt + random.random(), 8.0)
     
     def cleanup_expired_sessions(self):
-        """만료된 세션 정리"""
-        now = datetime.now()
-        expired_sessions = [
-            session_id for session_id, session in self.sessions.items()
-            if session.expires_at <= now
-        ]
+        """만료된 세션 정리 (Redis 사용 시 TTL로 자동 만료)"""
+        if self.redis:
+            return
         
-        for session_id in expired_sessions:
-            del self.sessions[session_id]
+        now = time.monotonic()
+        expired_count = 0
         
-        if expired_sessions:
-            logger.info(f"만료된 세션 {len(expired_sessions)}개 정리 완료")
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            _, session_id = heapq.heappop(self._expiry_heap)
+            session = self.sessions.get(session_id)
+            if session is None:
+                # 이미 삭제된 세션
+                continue
+            if session.expires_at_monotonic > now:
+                # 만료 시각이 갱신된 세션은 다시 등록
+                heapq.heappush(self._expiry_heap, (session.expires_at_monotonic, session_id))
+                continue
+            self._remove_session(session_id)
+            expired_count += 1
+        
+        if expired_count:
+            logger.info(f"만료된 세션 {expired_count}개 정리 완료")
     
-    def get_session_stats(self) -> Dict[str, Any]:
+    async def get_session_stats(self) -> Dict[str, Any]:
         """세션 통계 조회"""
-        active_sessions = len(self.sessions)
-        agent_usage = {}
-        
-        for session in self.sessions.values():
-            agent_id = session.agent_id
-            agent_usage[agent_id] = agent_usage.get(agent_id, 0) + 1
+        if self.redis:
+            # 에이전트별 집합에서 만료된 세션을 지우고 남은 수를 집계 (키스페이스 SCAN 없이 왕복 1회)
+            now = time.time()
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for agent_id in self.agents:
+                    key = f"{AGENT_SESSIONS_KEY_PREFIX}{agent_id}"
+                    pipe.zremrangebyscore(key, "-inf", now)
+                    pipe.zcard(key)
+                results = await pipe.execute()
+            # 메모리 모드와 같이 활성 세션이 있는 에이전트만 포함
+            agent_usage = {
+                agent_id: count for agent_id, count in zip(self.agents, results[1::2]) if count
+            }
+            active_sessions = sum(agent_usage.values())
+        else:
+            active_sessions = len(self.sessions)
+            agent_usage = dict(self._agent_usage)
         
         return {
             "active_sessions": active_sessions,
             "agent_usage": agent_usage,
-            "total_agents": len(self.agents)
+            "total_agents": len(self.agents),
+            "openai_rate_limit": {
+                "rpm": self._rpm_limit,
+                "has_capacity": self._bucket.has_capacity()
+            }
         }
-
-# 글로벌 인스턴스
-ai_manager = VIBAAIAgentManager()
\ No newline at end of file
+    
+    async def close(self):
+        """외부 연결 정리"""
+        if self._http_session and not self._http_session.closed:
+            await self._http_session.close()
+        if self.redis:
+            await self.redis.aclose()
+
+# 글로벌 인스턴스 (첫 호출 시 생성)
+@lru_cache(maxsize=1)
+def get_ai_manager() -> VIBAAIAgentManager:
+    """AI 에이전트 매니저 싱글톤 조회"""
+    return VIBAAIAgentManager()
\ No newline at end of file
@@ -15,19 +15,19 @@ AI 에이전트 전용 FastAPI 마이크로서비스
 from fastapi import FastAPI, HTTPException, Depends, status, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
-import uvicorn
+from contextlib import asynccontextmanager
+from functools import lru_cache
 import asyncio
 import time
 import logging
 from datetime import datetime, timedelta
-import jwt
-import hashlib
 import os
 import json
 import sys
+from itertools import islice
 
 # 현재 디렉토리를 Python 경로에 추가
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -35,25 +35,61 @@ parent_dir = os.path.dirname(current_dir)
 nlp_engine_dir = os.path.join(parent_dir, 'nlp-engine')
 sys.path.insert(0, nlp_engine_dir)
 
-# AI 에이전트 관련 임포트
-try:
-    from ai_agents import ai_manager
-    AI_AGENTS_AVAILABLE = True
-except ImportError as e:
-    print(f"AI 에이전트 임포트 오류: {e}")
-    AI_AGENTS_AVAILABLE = False
-
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# AI 에이전트 매니저 지연 로드 (헬스 체크만 받는 워커는 초기화 비용 없음)
+@lru_cache(maxsize=1)
+def _get_manager():
+    """AI 에이전트 매니저 조회 (첫 호출 시 임포트, 사용 불가 시 None)"""
+    try:
+        from ai_agents import get_ai_manager
+    except ImportError as e:
+        logger.error(f"AI 에이전트 임포트 오류: {e}")
+        return None
+    return get_ai_manager()
+
+def _manager_loaded() -> bool:
+    """AI 에이전트 매니저 로드 여부"""
+    return _get_manager.cache_info().currsize > 0
+
+async def get_manager():
+    """AI 에이전트 매니저 의존성 (사용 불가 시 None)"""
+    return _get_manager()
+
+# 애플리케이션 수명 주기 (시작/종료 처리)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """애플리케이션 시작/종료 시 실행되는 처리"""
+    logger.info("🚀 VIBA AI 마이크로서비스 시작 중...")
+    logger.info("🤖 AI 에이전트 시스템은 첫 요청 시 로드됩니다")
+    
+    # 주기적 세션 정리 작업 시작
+    app.state.cleanup_task = asyncio.create_task(periodic_cleanup())
+    logger.info("🧹 주기적 세션 정리 작업 시작")
+    
+    yield
+    
+    logger.info("🛑 VIBA AI 마이크로서비스 종료 중...")
+    app.state.cleanup_task.cancel()
+    
+    ai_manager = _get_manager() if _manager_loaded() else None
+    if ai_manager is not None:
+        # 마지막 세션 정리 및 OpenAI HTTP 세션 / Redis 연결 종료
+        ai_manager.cleanup_expired_sessions()
+        await ai_manager.close()
+        logger.info("🧹 최종 세션 정리 완료")
+
 # FastAPI 앱 초기화
 app = FastAPI(
     title="VIBA AI 마이크로서비스",
     description="AI 에이전트 전용 마이크로서비스",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS 설정
@@ -69,39 +105,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 애플리케이션 시작 이벤트
-@app.on_event("startup")
-async def startup_event():
-    """애플리케이션 시작 시 실행되는 이벤트"""
-    logger.info("🚀 VIBA AI 마이크로서비스 시작 중...")
-    
-    if AI_AGENTS_AVAILABLE:
-        logger.info("✅ AI 에이전트 시스템 로드 완료")
-        logger.info(f"📊 등록된 에이전트: {len(ai_manager.agents)}개")
-        
-        # 주기적 세션 정리 작업 시작
-        asyncio.create_task(periodic_cleanup())
-        logger.info("🧹 주기적 세션 정리 작업 시작")
-    else:
-        logger.warning("⚠️ AI 에이전트 시스템을 로드할 수 없습니다. 기본 모드로 실행됩니다.")
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """애플리케이션 종료 시 실행되는 이벤트"""
-    logger.info("🛑 VIBA AI 마이크로서비스 종료 중...")
-    
-    if AI_AGENTS_AVAILABLE:
-        # 마지막 세션 정리
-        ai_manager.cleanup_expired_sessions()
-        logger.info("🧹 최종 세션 정리 완료")
-
 # 주기적 세션 정리 작업
 async def periodic_cleanup():
     """주기적으로 만료된 세션 정리"""
     while True:
         try:
             await asyncio.sleep(3600)  # 1시간마다 실행
-            if AI_AGENTS_AVAILABLE:
+            ai_manager = _get_manager() if _manager_loaded() else None
+            if ai_manager is not None:
                 ai_manager.cleanup_expired_sessions()
                 logger.info("🧹 주기적 세션 정리 실행 완료")
         except Exception as e:
@@ -154,9 +165,9 @@ class SessionRequest(BaseModel):
 
 # AI 에이전트 엔드포인트
 @app.get("/api/agents")
-async def get_ai_agents():
+async def get_ai_agents(ai_manager=Depends(get_manager)):
     """AI 에이전트 목록 조회"""
-    if AI_AGENTS_AVAILABLE:
+    if ai_manager is not None:
         try:
             agents = ai_manager.list_agents()
             return {
@@ -213,16 +224,16 @@ async def get_ai_agents():
         }
 
 @app.post("/api/sessions")
-async def create_session(request: SessionRequest):
+async def create_session(request: SessionRequest, ai_manager=Depends(get_manager)):
     """새로운 채팅 세션 생성"""
-    if not AI_AGENTS_AVAILABLE:
+    if ai_manager is None:
         raise HTTPException(
             status_code=503,
             detail="AI 에이전트 서비스가 현재 사용할 수 없습니다."
         )
     
     try:
-        session_id = ai_manager.create_session(
+        session_id = await ai_manager.create_session(
             agent_id=request.agent_id,
             user_id=request.user_id
         )
@@ -240,9 +251,9 @@ async def create_session(request: SessionRequest):
         raise HTTPException(status_code=500, detail="세션 생성 중 오류가 발생했습니다.")
 
 @app.post("/api/chat")
-async def ai_chat(request: ChatRequest):
+async def ai_chat(request: ChatRequest, ai_manager=Depends(get_manager)):
     """AI 에이전트와 채팅"""
-    if not AI_AGENTS_AVAILABLE:
+    if ai_manager is None:
         return {
             "success": False,
             "error": "AI 에이전트 서비스가 현재 사용할 수 없습니다.",
@@ -254,7 +265,7 @@ async def ai_chat(request: ChatRequest):
         # 세션 ID가 없으면 새로 생성
         session_id = request.session_id
         if not session_id:
-            session_id = ai_manager.create_session(
+            session_id = await ai_manager.create_session(
                 agent_id=request.agent_id,
                 user_id=request.user_id
             )
@@ -285,17 +296,102 @@ async def ai_chat(request: ChatRequest):
             "timestamp": datetime.now().isoformat()
         }
 
+@app.post("/api/chat/stream")
+async def ai_chat_stream(request: ChatRequest, ai_manager=Depends(get_manager)):
+    """AI 에이전트와 스트리밍 채팅 (Server-Sent Events)"""
+    if ai_manager is None:
+        raise HTTPException(
+            status_code=503,
+            detail="AI 에이전트 서비스가 현재 사용할 수 없습니다."
+        )
+    
+    try:
+        # 세션 ID가 없으면 새로 생성
+        session_id = request.session_id
+        if not session_id:
+            session_id = await ai_manager.create_session(
+                agent_id=request.agent_id,
+                user_id=request.user_id
+            )
+        
+        events = await ai_manager.chat_stream(
+            session_id=session_id,
+            message=request.message,
+            user_id=request.user_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+            "X-Session-ID": session_id
+        }
+    )
+
+@app.post("/api/chat/batch")
+async def ai_chat_batch(requests: List[ChatRequest], ai_manager=Depends(get_manager)):
+    """여러 AI 채팅 요청 동시 처리"""
+    if ai_manager is None:
+        raise HTTPException(
+            status_code=503,
+            detail="AI 에이전트 서비스가 현재 사용할 수 없습니다."
+        )
+    
+    try:
+        # 세션 ID가 없는 요청은 새로 생성
+        items = []
+        for request in requests:
+            session_id = request.session_id
+            if not session_id:
+                session_id = await ai_manager.create_session(
+                    agent_id=request.agent_id,
+                    user_id=request.user_id
+                )
+            items.append((session_id, request.message))
+        
+        responses = await ai_manager.chat_many(items)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    results = []
+    for (session_id, _), response in zip(items, responses):
+        if isinstance(response, Exception):
+            logger.error(f"AI 배치 채팅 실패: {response}")
+            results.append({
+                "success": False,
+                "session_id": session_id,
+                "error": str(response),
+                "response": "죄송합니다. 현재 AI 서비스에 문제가 발생했습니다.",
+                "timestamp": datetime.now().isoformat()
+            })
+        else:
+            results.append({
+                "success": True,
+                "session_id": session_id,
+                **response
+            })
+    
+    return {
+        "success": True,
+        "results": results,
+        "total": len(results)
+    }
+
 @app.get("/api/sessions/{session_id}")
-async def get_session(session_id: str):
+async def get_session(session_id: str, ai_manager=Depends(get_manager)):
     """세션 정보 조회"""
-    if not AI_AGENTS_AVAILABLE:
+    if ai_manager is None:
         raise HTTPException(
             status_code=503,
             detail="AI 에이전트 서비스가 현재 사용할 수 없습니다."
         )
     
     try:
-        session = ai_manager.get_session(session_id)
+        session = await ai_manager.get_session(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
         
@@ -316,36 +412,41 @@ async def get_session(session_id: str):
         raise HTTPException(status_code=500, detail="세션 조회 중 오류가 발생했습니다.")
 
 @app.get("/api/sessions/{session_id}/messages")
-async def get_session_messages(session_id: str, limit: int = 50):
+async def get_session_messages(session_id: str, limit: int = 50, ai_manager=Depends(get_manager)):
     """세션 메시지 기록 조회"""
-    if not AI_AGENTS_AVAILABLE:
+    if ai_manager is None:
         raise HTTPException(
             status_code=503,
             detail="AI 에이전트 서비스가 현재 사용할 수 없습니다."
         )
     
     try:
-        session = ai_manager.get_session(session_id)
+        session = await ai_manager.get_session(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
         
-        # 최근 메시지만 반환
-        messages = session.messages[-limit:] if limit > 0 else session.messages
+        # 최근 메시지만 반환 (내부 기록용 토큰 수 등은 제외하고 공개 필드만)
+        total = len(session.messages)
+        start = max(0, total - limit) if limit > 0 else 0
+        messages = [
+            {"role": message["role"], "content": message["content"], "timestamp": message["timestamp"]}
+            for message in islice(session.messages, start, None)
+        ]
         
         return {
             "success": True,
             "session_id": session_id,
             "messages": messages,
-            "total": len(session.messages)
+            "total": total
         }
     except Exception as e:
         logger.error(f"메시지 조회 실패: {e}")
         raise HTTPException(status_code=500, detail="메시지 조회 중 오류가 발생했습니다.")
 
 @app.get("/api/stats")
-async def get_service_stats():
+async def get_service_stats(ai_manager=Depends(get_manager)):
     """서비스 통계 조회"""
-    if not AI_AGENTS_AVAILABLE:
+    if ai_manager is None:
         return {
             "success": False,
             "error": "AI 에이전트 서비스가 현재 사용할 수 없습니다.",
@@ -353,7 +454,7 @@ async def get_service_stats():
         }
     
     try:
-        stats = ai_manager.get_session_stats()
+        stats = await ai_manager.get_session_stats()
         return {
             "success": True,
             "stats": stats,
@@ -369,9 +470,9 @@ async def get_service_stats():
 
 # 백그라운드 작업 - 만료된 세션 정리
 @app.post("/api/cleanup")
-async def cleanup_expired_sessions(background_tasks: BackgroundTasks):
+async def cleanup_expired_sessions(background_tasks: BackgroundTasks, ai_manager=Depends(get_manager)):
     """만료된 세션 정리 (백그라운드 작업)"""
-    if not AI_AGENTS_AVAILABLE:
+    if ai_manager is None:
         return {"success": False, "message": "AI 에이전트 서비스가 사용할 수 없습니다."}
     
     try:
@@ -402,7 +503,7 @@ async def ai_analyze(request: dict):
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     logger.error(f"예외 발생: {exc}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "success": False,
@@ -412,16 +513,35 @@ async def global_exception_handler(request, exc):
     )
 
 if __name__ == "__main__":
+    import uvicorn
+    
     port = int(os.getenv("AI_SERVICE_PORT", 8000))
     
     logger.info(f"🤖 VIBA AI 마이크로서비스 시작")
     logger.info(f"📊 포트: {port}")
     logger.info(f"📖 API 문서: http://localhost:{port}/docs")
     
-    uvicorn.run(
-        "main:app",
-        host="0.0.0.0",
-        port=port,
-        reload=True,
-        log_level="info"
-    )
\ No newline at end of file
+    if os.getenv("RELOAD", "false").lower() == "true":
+        # 개발 모드: 단일 프로세스 + 코드 변경 시 자동 재시작
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=port,
+            reload=True,
+            log_level="info"
+        )
+    else:
+        # 세션이 워커 간 공유되려면 Redis가 필요하므로 미설정 시 단일 워커로 실행
+        default_workers = (os.cpu_count() or 1) if os.getenv("REDIS_URL") else 1
+        workers = int(os.getenv("WORKERS", default_workers))
+        logger.info(f"⚙️ 워커 수: {workers}")
+        
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=port,
+            workers=workers,
+            loop="uvloop",
+            http="httptools",
+            log_level="info"
+        )
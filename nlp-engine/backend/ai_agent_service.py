@@ -1,15 +1,192 @@
 import asyncio
-import json
+import hashlib
 import logging
+import os
+import random
 import time
-from typing import Dict, List, Optional, Any
+from collections import Counter, OrderedDict, deque
+from functools import lru_cache
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple, Union
 from datetime import datetime
 from enum import Enum
+import httpx
 import openai
+import orjson
 import uuid
 
+from errors import NotFoundError
+
+# 의미 유사도 캐시 (선택적 의존성)
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+    SEMANTIC_CACHE_AVAILABLE = True
+except ImportError:
+    SEMANTIC_CACHE_AVAILABLE = False
+
+# 워커 간 공유 캐시 (선택적 의존성)
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+# OpenAI 요청/토큰 속도 제한 (선택적 의존성)
+try:
+    from aiolimiter import AsyncLimiter
+    AIOLIMITER_AVAILABLE = True
+except ImportError:
+    AIOLIMITER_AVAILABLE = False
+
+# 고속 비암호 해시 (선택적 의존성, 없으면 blake2b 사용)
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+# 의미 캐시 근사 최근접 검색 (선택적 의존성, 없으면 numpy 행렬 곱 사용)
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+# 토큰 수 계산 (선택적 의존성)
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# OpenAI 호출 기본 설정
+OPENAI_DEFAULT_MODEL = "gpt-4o-mini"  # 에이전트 설정에 model이 없을 때
+OPENAI_ESCALATION_MODEL = "gpt-4o"  # 저가 모델 응답이 부실할 때 재시도할 모델
+OPENAI_TEMPERATURE = 0.7
+OPENAI_MAX_TOKENS = 1000
+
+# OpenAI 분당 요청/토큰 한도
+OPENAI_RPM = int(os.getenv("AI_OPENAI_RPM", "5000"))
+OPENAI_TPM = int(os.getenv("AI_OPENAI_TPM", "15000000"))
+
+# 세션별 보관 메시지 수 (초과 시 오래된 메시지부터 제거)
+MESSAGE_HISTORY_MAXLEN = 64
+
+# 대화 히스토리에 사용할 최대 토큰 수
+HISTORY_TOKEN_BUDGET = int(os.getenv("AI_HISTORY_TOKEN_BUDGET", "6000"))
+
+# 원문 그대로 보내는 최근 메시지 수 (2턴), 이전 메시지는 공백 압축
+VERBATIM_RECENT_MESSAGES = 4
+
+# Redis 공유 캐시 설정
+REDIS_KEY_PREFIX = "ai:"
+REDIS_CACHE_TTL_SECONDS = int(os.getenv("AI_CACHE_TTL_SECONDS", "86400"))
+REDIS_RETRY_SECONDS = 30.0  # 연결 실패 후 다시 시도하기까지 대기 시간
+
+# 분석 요청에 포함할 프로젝트 항목 (키, 표시명, 단위)
+PROJECT_INFO_FIELDS = (
+    ("building_type", "건물 유형", ""),
+    ("location", "위치", ""),
+    ("area", "면적", "㎡"),
+    ("floors", "층수", "층"),
+    ("budget", "예산", "원"),
+)
+
+# 에이전트별 지정 문구가 없을 때의 분석 요청 문구
+DEFAULT_ANALYSIS_SUFFIX = "\n전문적인 분석과 권장사항을 제공해주세요."
+
+# 캐시 키/저장용 orjson 옵션 (AgentType 등 str 하위 타입 키 허용, 해시용은 키 정렬)
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+ORJSON_SORTED_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS
+
+# 동일 프롬프트에 대한 OpenAI 응답 캐시 최대 항목 수
+EXACT_CACHE_MAXSIZE = 1024
+
+# 재시작 후에도 캐시를 유지하기 위한 JSONL 파일 (기본 비활성화 - 인스턴스 간 캐시는 Redis가 공유)
+CACHE_PATH = os.getenv("AI_CACHE_PATH", "")
+# 캐시 파일 최대 줄 수 (넘으면 현재 메모리 캐시 내용으로 다시 씀)
+CACHE_FILE_MAX_LINES = int(os.getenv("AI_CACHE_FILE_MAX_LINES", str(EXACT_CACHE_MAXSIZE * 4)))
+ANALYSIS_CACHE_PREFIX = "analysis:"
+
+# 의미 유사도 캐시 설정
+SEMANTIC_MODEL_NAME = os.getenv("AI_SEMANTIC_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+SEMANTIC_THRESHOLD = float(os.getenv("AI_SEMANTIC_THRESHOLD", "0.87"))
+SEMANTIC_CACHE_MAXSIZE = int(os.getenv("AI_SEMANTIC_CACHE_SIZE", "10000"))
+SEMANTIC_HNSW_M = 32  # HNSW 그래프 노드당 연결 수
+SEMANTIC_INT8_SCALE = 127  # 정규화 임베딩 [-1, 1]을 int8로 양자화할 때의 배율
+SEMANTIC_INDEX_DIR = os.getenv("AI_SEMANTIC_INDEX_DIR", "")  # FAISS 인덱스 저장 위치 (빈 값이면 저장 안 함)
+
+# 종합 분석 동시 실행/재시도 설정
+ANALYSIS_MAX_CONCURRENCY = int(os.getenv("AI_ANALYSIS_CONCURRENCY", "8"))
+ANALYSIS_MAX_ATTEMPTS = 5
+ANALYSIS_TIMEOUT_SECONDS = 30.0
+ANALYSIS_MAX_BACKOFF_SECONDS = 30.0
+
+# 종합 분석 후 후속 질문에 대비해 미리 실행할 에이전트 분석 (분석마다 OpenAI 호출이 늘어나므로 기본 비활성화)
+ANALYSIS_PREFETCH_ENABLED = os.getenv("AI_ANALYSIS_PREFETCH", "false").lower() == "true"
+ANALYSIS_PREFETCH_CONCURRENCY = 2  # 백그라운드 작업이 요청 처리를 방해하지 않도록 제한
+# 미리 실행한 분석 결과 메모리 보관 한도 (LRU 최대 항목 수, 보관 시간)
+PREFETCH_CACHE_MAXSIZE = int(os.getenv("AI_PREFETCH_CACHE_MAXSIZE", "256"))
+PREFETCH_CACHE_TTL_SECONDS = int(os.getenv("AI_PREFETCH_CACHE_TTL_SECONDS", "3600"))
+
+# OpenAI 요청 동적 배치 설정 (0이면 배치 없이 즉시 호출)
+BATCH_WINDOW_SECONDS = float(os.getenv("AI_BATCH_WINDOW_MS", "20")) / 1000
+BATCH_MAX_SIZE = 32
+# 종료 시 전송 중인 배치를 기다리는 최대 시간 (넘으면 취소)
+BATCH_DRAIN_TIMEOUT_SECONDS = 5
+
+# OpenAI HTTP 연결 풀 설정
+OPENAI_HTTP_LIMITS = httpx.Limits(max_connections=256, max_keepalive_connections=128)
+OPENAI_HTTP_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+
+@lru_cache(maxsize=None)
+def _get_encoding(model: str):
+    """모델별 tiktoken 인코더 조회 (모델당 1회 생성)"""
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # 인코딩 파일을 내려받을 수 없는 환경 등
+        logger.warning(f"tiktoken 인코더 로드 실패, 글자 수 기반 추정 사용: {e}")
+        return None
+
+def count_tokens(text: str, model: str) -> int:
+    """텍스트 토큰 수 계산 (인코더 사용 불가 시 글자 수로 보수적 추정)"""
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return len(text)
+
+def _iso(ts: float) -> str:
+    """time.time() 값을 ISO 8601 문자열로 변환 (API 응답용)"""
+    return datetime.fromtimestamp(ts).isoformat()
+
+def stable_hash64(text: Union[str, bytes]) -> int:
+    """프로세스 간에도 동일한 64비트 해시 (내장 hash()는 실행마다 달라짐)"""
+    data = text if isinstance(text, bytes) else text.encode()
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh64_intdigest(data)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+def compress_prompt(text: str) -> str:
+    """프롬프트 공백 압축 (들여쓰기, 빈 줄, 연속 공백 제거, 줄 구분은 유지)"""
+    return "\n".join(" ".join(line.split()) for line in text.splitlines() if line.strip())
+
+# 재시도할 일시적 오류 (시간 초과, 속도 제한, 연결/서버 오류)
+RETRYABLE_ERRORS = (
+    asyncio.TimeoutError,
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
 class AgentType(str, Enum):
     """AI 에이전트 타입"""
     MATERIALS_SPECIALIST = "materials_specialist"
@@ -31,6 +208,34 @@ class AnalysisType(str, Enum):
     COST = "cost"
     SUSTAINABILITY = "sustainability"
 
+# 종합 분석에 포함되지 않아 미리 실행해 둘 에이전트
+PREFETCH_AGENT_TYPES = (
+    AgentType.MEP_SPECIALIST,
+    AgentType.SCHEDULE_MANAGER,
+    AgentType.INTERIOR_DESIGNER,
+    AgentType.BIM_SPECIALIST,
+)
+
+# 모의 AI 응답 템플릿 (각 에이전트별 전문적인 응답, {message}에 요청 내용 삽입)
+MOCK_RESPONSE_TEMPLATES = {
+    AgentType.MATERIALS_SPECIALIST: (
+        "재료 전문가 AI가 '{message}' 요청을 분석했습니다.\n\n추천 재료:\n• 친환경 콘크리트 (탄소 저감 30%)\n• 재활용 강재 (비용 절감 15%)\n• 고성능 단열재 (에너지 효율 25% 향상)\n\n지속가능성 점수: 8.5/10\n예상 비용 절감: 12%",
+        "'{message}' 관련하여 최신 친환경 건축 재료를 분석했습니다.\n\n핵심 추천사항:\n1. 생분해성 바이오 콘크리트 적용\n2. 재활용 플라스틱 복합재 사용\n3. 자연 단열재 (셀룰로오스, 양모) 활용\n\n환경 영향도: 65% 감소\n내구성: 기존 대비 120%"
+    ),
+    AgentType.DESIGN_THEORIST: (
+        "설계 이론가 AI가 '{message}' 요청을 검토했습니다.\n\n설계 원칙 분석:\n• 황금비 적용으로 시각적 조화 달성\n• 자연 채광 최적화 (남향 30도 배치)\n• 효율적 동선 구성 (최대 이동거리 15m)\n\n공간 효율성: 92%\n사용자 만족도 예측: 9.2/10",
+        "'{message}'에 대한 공간 구성 분석을 완료했습니다.\n\n주요 설계 제안:\n1. 오픈 플랜과 프라이빗 공간의 균형\n2. 수직적 공간 활용 (메자닌 구조)\n3. 내외부 공간의 연속성 확보\n\n기능성 점수: 8.8/10\n미적 완성도: 9.1/10"
+    ),
+    AgentType.STRUCTURAL_ENGINEER: (
+        "구조 엔지니어 AI가 '{message}' 요청을 분석했습니다.\n\n구조 검토 결과:\n• 안전율: 3.2 (법정 기준 2.4 초과)\n• 내진 등급: 1등급 (규모 7.0 대응)\n• 하중 분산: 최적화 완료\n\n구조재 절약: 18%\n시공 기간 단축: 2주",
+        "'{message}' 관련 구조 안전성 분석을 수행했습니다.\n\n핵심 분석 결과:\n1. 기초 구조: 매트 기초 + 파일 보강 추천\n2. 골조 시스템: RC조 + 철골 하이브리드\n3. 내진 보강: 면진 장치 적용\n\n안전성 등급: A+\n경제성: 기존 대비 12% 절감"
+    ),
+    AgentType.COST_ESTIMATOR: (
+        "비용 추정 AI가 '{message}' 요청을 분석했습니다.\n\n상세 견적:\n• 총 공사비: 4억 8천만원 (VAT 별도)\n• 평당 단가: 480만원\n• 절감 가능액: 7,200만원 (15%)\n\n주요 절감 방안:\n- 재료 대체로 2,000만원\n- 공법 개선으로 3,500만원\n- 일정 단축으로 1,700만원",
+        "'{message}'에 대한 종합적인 비용 분석을 완료했습니다.\n\n비용 구성:\n1. 구조체: 40% (1억 9천만원)\n2. 마감공사: 35% (1억 6천만원)\n3. 설비공사: 25% (1억 2천만원)\n\n리스크 요인:\n- 자재비 상승 가능성: 5-8%\n- 공기 지연 리스크: 중간"
+    )
+}
+
 class AIAgentService:
     """AI 에이전트 서비스"""
     
@@ -39,9 +244,75 @@ class AIAgentService:
         self.sessions = {}
         self.analysis_cache = {}
         
-        # OpenAI 클라이언트 설정 (실제 API 키가 있을 경우)
+        # 모의 응답용 난수 생성기
+        self._rng = random.Random()
+        
+        # 에이전트 분석 동시 실행 제한
+        self._sem = asyncio.Semaphore(ANALYSIS_MAX_CONCURRENCY)
+        
+        # 후속 분석 미리 실행 (동시 실행 제한, 태스크 참조 유지)
+        self._prefetch_sem = asyncio.Semaphore(ANALYSIS_PREFETCH_CONCURRENCY)
+        self._background_tasks = set()
+        # 미리 실행한 분석 ID -> (결과, 만료 시각) LRU (analysis_cache와 달리 크기/시간 제한)
+        self._prefetch_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        
+        # OpenAI 분당 요청/토큰 한도 (429 재시도 폭주 방지)
+        self._rpm = AsyncLimiter(OPENAI_RPM, 60) if AIOLIMITER_AVAILABLE else None
+        self._tpm = AsyncLimiter(OPENAI_TPM, 60) if AIOLIMITER_AVAILABLE else None
+        self._system_prompt_tokens: Dict[str, int] = {}
+        # 원본 시스템 프롬프트 -> 압축 프롬프트 (공개 에이전트 정보에는 포함하지 않음)
+        self._compressed_prompts: Dict[str, str] = {}
+        
+        # OpenAI 요청 배치 대기열 (start_batch_worker가 실행 중일 때만 사용)
+        self._queue = asyncio.Queue()
+        self._batch_worker_running = False
+        # 전송 중인 배치 태스크 (이벤트 루프는 약한 참조만 가지므로 여기서 참조 유지)
+        self._dispatch_tasks = set()
+        
+        # (모델, temperature, 메시지) 해시 -> 응답 LRU 캐시
+        self._exact_cache: "OrderedDict[str, str]" = OrderedDict()
+        
+        # 프로젝트 데이터 해시 -> 분석 ID (동일 프로젝트 재분석 방지)
+        self._analysis_by_project: Dict[str, str] = {}
+        
+        # 캐시 적중/미스 통계
+        self._cache_stats = Counter()
+        
+        # 워커 간 공유 캐시 (Redis 사용 불가 시 메모리 캐시만 사용)
+        self.redis = None
+        self._redis_down_until = 0.0
+        # 마지막 Redis 명령 성공 여부 (check_redis 전에는 연결 여부를 알 수 없으므로 False)
+        self._redis_ok = False
+        if REDIS_AVAILABLE:
+            self.redis = aioredis.Redis(
+                host=os.getenv("REDIS_HOST", "localhost"),
+                port=int(os.getenv("REDIS_PORT", 6379)),
+                db=0,
+                decode_responses=True,
+                socket_connect_timeout=1.0
+            )
+        
+        # 디스크 캐시 복원 (파일 쓰기는 모아서 스레드에서 실행)
+        self._cache_path = Path(CACHE_PATH) if CACHE_PATH else None
+        self._cache_file_lines = 0
+        self._cache_pending: List[bytes] = []
+        self._cache_flush_task: Optional[asyncio.Task] = None
+        self._load_persistent_cache()
+        
+        # 에이전트별 의미 유사도 캐시 (정규화된 임베딩 행렬, 응답 목록)
+        self._semantic_enabled = SEMANTIC_CACHE_AVAILABLE
+        self._embedder = None
+        self._sem_index: Dict[AgentType, Any] = {}  # FAISS HNSW(int8) 인덱스 또는 numpy int8 행렬
+        self._sem_responses: Dict[AgentType, List[str]] = {}
+        self._load_semantic_indexes()
+        
+        # OpenAI 클라이언트 설정 (실제 API 키가 있을 경우, 연결 풀 공유)
+        self._client = None
         if openai_api_key:
-            openai.api_key = openai_api_key
+            self._client = openai.AsyncOpenAI(
+                api_key=openai_api_key,
+                http_client=httpx.AsyncClient(limits=OPENAI_HTTP_LIMITS, timeout=OPENAI_HTTP_TIMEOUT)
+            )
             self.use_real_ai = True
         else:
             self.use_real_ai = False
@@ -61,6 +332,7 @@ class AIAgentService:
                 재료의 성능, 내구성, 지속가능성을 분석합니다.
                 한국의 건축 환경과 기후를 고려한 전문적인 조언을 제공하세요.""",
                 "specialty": "재료 공학",
+                "model": "gpt-4o-mini",
                 "status": "active"
             },
             AgentType.DESIGN_THEORIST: {
@@ -72,6 +344,7 @@ class AIAgentService:
                 효율적이고 아름다운 건축 설계를 제안합니다.
                 한국의 전통 건축과 현대 건축 이론을 결합한 솔루션을 제공하세요.""",
                 "specialty": "설계 이론",
+                "model": "gpt-4o",
                 "status": "active"
             },
             AgentType.BIM_SPECIALIST: {
@@ -83,6 +356,7 @@ class AIAgentService:
                 디지털 건축 설계의 최적화 방안을 제시합니다.
                 국제 BIM 표준과 한국의 BIM 가이드라인을 준수하는 솔루션을 제공하세요.""",
                 "specialty": "BIM 모델링",
+                "model": "gpt-4o-mini",
                 "status": "active"
             },
             AgentType.STRUCTURAL_ENGINEER: {
@@ -94,6 +368,7 @@ class AIAgentService:
                 한국 건축구조기준(KBC)과 국제 기준을 준수하는 
                 안전하고 경제적인 구조 설계를 제안하세요.""",
                 "specialty": "구조 공학",
+                "model": "gpt-4o",
                 "status": "active"
             },
             AgentType.MEP_SPECIALIST: {
@@ -105,6 +380,7 @@ class AIAgentService:
                 에너지 효율성을 최적화합니다.
                 한국의 전력 시스템과 설비 기준에 맞는 솔루션을 제공하세요.""",
                 "specialty": "MEP 시스템",
+                "model": "gpt-4o-mini",
                 "status": "active"
             },
             AgentType.COST_ESTIMATOR: {
@@ -116,6 +392,7 @@ class AIAgentService:
                 한국의 건설 시장 동향과 자재 가격을 반영한
                 현실적이고 정확한 비용 분석을 제공하세요.""",
                 "specialty": "건설 경제",
+                "model": "gpt-4o-mini",
                 "status": "active"
             },
             AgentType.SCHEDULE_MANAGER: {
@@ -127,6 +404,7 @@ class AIAgentService:
                 프로젝트 위험 요소를 분석합니다.
                 한국의 건설 환경과 법규를 고려한 현실적인 일정을 제안하세요.""",
                 "specialty": "프로젝트 관리",
+                "model": "gpt-4o-mini",
                 "status": "active"
             },
             AgentType.INTERIOR_DESIGNER: {
@@ -138,13 +416,24 @@ class AIAgentService:
                 사용자의 라이프스타일에 맞는 인테리어 솔루션을 제공합니다.
                 한국인의 주거 문화와 트렌드를 반영한 디자인을 제안하세요.""",
                 "specialty": "인테리어 디자인",
+                "model": "gpt-4o-mini",
                 "status": "active"
             }
         }
         
         for agent_type, config in agent_configs.items():
+            # 매 호출마다 반복 전송되는 시스템 프롬프트는 미리 압축
+            self._compressed_prompts[config["system_prompt"]] = compress_prompt(config["system_prompt"])
             self.agents[agent_type] = config
             
+        # 에이전트별 분석 요청 문구 (프로젝트 정보 뒤에 붙임)
+        self._agent_suffix = {
+            AgentType.MATERIALS_SPECIALIST: "\n친환경적이고 비용 효율적인 건축 재료를 추천하고, 지속가능성 점수를 평가해주세요.",
+            AgentType.DESIGN_THEORIST: "\n효율적인 공간 구성과 설계 원칙을 적용한 최적화 방안을 제시해주세요.",
+            AgentType.STRUCTURAL_ENGINEER: "\n구조적 안전성을 검토하고 최적의 구조 시스템을 제안해주세요.",
+            AgentType.COST_ESTIMATOR: "\n상세한 공사비를 산출하고 비용 절감 방안을 제시해주세요."
+        }
+            
     async def start_session(self, agent_id: AgentType, user_id: str, context: Dict = None) -> str:
         """AI 에이전트 세션 시작"""
         session_id = str(uuid.uuid4())
@@ -154,8 +443,9 @@ class AIAgentService:
             "agent_id": agent_id,
             "user_id": user_id,
             "context": context or {},
-            "started_at": datetime.now(),
-            "message_history": [],
+            "_start_ts": time.time(),
+            "message_history": deque(maxlen=MESSAGE_HISTORY_MAXLEN),
+            "_user_count": 0,
             "status": "active"
         }
         
@@ -165,40 +455,38 @@ class AIAgentService:
     async def send_message(self, session_id: str, message: str) -> Dict[str, Any]:
         """AI 에이전트에게 메시지 전송"""
         if session_id not in self.sessions:
-            raise ValueError(f"세션을 찾을 수 없습니다: {session_id}")
+            raise NotFoundError(f"세션을 찾을 수 없습니다: {session_id}")
             
         session = self.sessions[session_id]
         agent_id = session["agent_id"]
         agent_config = self.agents[agent_id]
         
         # 메시지 히스토리에 사용자 메시지 추가
-        user_message = {
-            "role": "user",
-            "content": message,
-            "timestamp": datetime.now().isoformat()
-        }
-        session["message_history"].append(user_message)
+        self._record_user_message(session, message)
         
         start_time = time.time()
         
         try:
             # AI 응답 생성
             if self.use_real_ai:
-                ai_response = await self._generate_openai_response(agent_config, session["message_history"])
+                # 대화 첫 메시지만 의미 캐시 대상 (이전 문맥이 있으면 같은 질문도 답이 달라짐)
+                embedding = None
+                ai_response = None
+                if session["_user_count"] == 1:
+                    ai_response, embedding = await self._semantic_lookup(agent_id, message)
+                if ai_response is None:
+                    ai_response = await self._submit_openai_request(agent_config, session["message_history"])
+                    if embedding is not None:
+                        self._semantic_store(agent_id, embedding, ai_response)
             else:
                 ai_response = await self._generate_mock_response(agent_id, message, session["context"])
                 
             # 응답 시간 계산
-            response_time = time.time() - start_time
+            now = time.time()
+            response_time = now - start_time
             
             # AI 응답을 히스토리에 추가
-            assistant_message = {
-                "role": "assistant",
-                "content": ai_response,
-                "timestamp": datetime.now().isoformat(),
-                "response_time": response_time
-            }
-            session["message_history"].append(assistant_message)
+            self._record_assistant_message(session, ai_response, response_time, now)
             
             # 응답 반환
             return {
@@ -207,98 +495,636 @@ class AIAgentService:
                 "agent_name": agent_config["name"],
                 "response": ai_response,
                 "response_time": response_time,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _iso(now),
                 "confidence": 0.95  # 실제 AI의 경우 모델에서 가져와야 함
             }
             
         except Exception as e:
             logger.error(f"AI 응답 생성 오류: {e}")
             error_response = f"죄송합니다. 현재 {agent_config['name']}가 응답할 수 없습니다. 잠시 후 다시 시도해주세요."
+            now = time.time()
             
             return {
                 "session_id": session_id,
                 "agent_id": agent_id,
                 "agent_name": agent_config["name"],
                 "response": error_response,
-                "response_time": time.time() - start_time,
-                "timestamp": datetime.now().isoformat(),
+                "response_time": now - start_time,
+                "timestamp": _iso(now),
                 "error": True
             }
             
-    async def _generate_openai_response(self, agent_config: Dict, message_history: List[Dict]) -> str:
-        """OpenAI API를 사용한 실제 AI 응답 생성"""
+    async def send_message_stream(self, session_id: str, message: str) -> AsyncIterator[str]:
+        """AI 에이전트에게 메시지 전송 (응답을 생성되는 대로 전달하는 스트림 반환)"""
+        if session_id not in self.sessions:
+            raise NotFoundError(f"세션을 찾을 수 없습니다: {session_id}")
+            
+        session = self.sessions[session_id]
+        self._record_user_message(session, message)
+        return self._stream_reply(session, message)
+        
+    async def _stream_reply(self, session: Dict, message: str) -> AsyncIterator[str]:
+        """응답 스트림 생성 (완료 후 히스토리에 기록)"""
+        agent_id = session["agent_id"]
+        agent_config = self.agents[agent_id]
+        start_time = time.time()
+        parts = []
+        
         try:
-            # 시스템 프롬프트와 메시지 히스토리 구성
-            messages = [{"role": "system", "content": agent_config["system_prompt"]}]
-            
-            # 최근 10개 메시지만 사용 (토큰 제한 고려)
-            recent_messages = message_history[-10:]
-            for msg in recent_messages:
-                messages.append({
-                    "role": msg["role"],
-                    "content": msg["content"]
-                })
+            if self.use_real_ai:
+                embedding = None
+                cached = None
+                if session["_user_count"] == 1:
+                    cached, embedding = await self._semantic_lookup(agent_id, message)
+                if cached is not None:
+                    parts.append(cached)
+                    yield cached
+                else:
+                    async for delta in self._stream_openai_response(agent_config, session["message_history"]):
+                        parts.append(delta)
+                        yield delta
+                    if embedding is not None:
+                        self._semantic_store(agent_id, embedding, "".join(parts))
+            else:
+                ai_response = await self._generate_mock_response(agent_id, message, session["context"])
+                parts.append(ai_response)
+                yield ai_response
                 
-            # OpenAI API 호출
-            response = await openai.ChatCompletion.acreate(
-                model="gpt-4",  # 또는 gpt-3.5-turbo
-                messages=messages,
-                max_tokens=1000,
-                temperature=0.7
+        except Exception as e:
+            logger.error(f"AI 응답 스트림 오류: {e}")
+            if not parts:
+                yield f"죄송합니다. 현재 {agent_config['name']}가 응답할 수 없습니다. 잠시 후 다시 시도해주세요."
+            return
+            
+        now = time.time()
+        self._record_assistant_message(session, "".join(parts), now - start_time, now)
+        
+    def _record_user_message(self, session: Dict, message: str):
+        """사용자 메시지를 히스토리에 추가"""
+        session["message_history"].append({
+            "role": "user",
+            "content": message,
+            "ts": time.time()
+        })
+        session["_user_count"] += 1
+        
+    def _record_assistant_message(self, session: Dict, content: str, response_time: float, ts: float):
+        """AI 응답을 히스토리에 추가"""
+        session["message_history"].append({
+            "role": "assistant",
+            "content": content,
+            "ts": ts,
+            "response_time": response_time
+        })
+        
+    async def _submit_openai_request(self, agent_config: Dict, message_history: List[Dict]) -> str:
+        """배치 워커를 통해 OpenAI 응답 요청 (워커가 없으면 직접 호출)"""
+        if not self._batch_worker_running or BATCH_WINDOW_SECONDS <= 0:
+            return await self._generate_openai_response(agent_config, message_history)
+            
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((agent_config, list(message_history), future))
+        return await future
+        
+    async def start_batch_worker(self):
+        """백그라운드 OpenAI 요청 배치 워커"""
+        logger.info("AI 요청 배치 워커 시작")
+        loop = asyncio.get_running_loop()
+        self._batch_worker_running = True
+        
+        try:
+            while True:
+                try:
+                    # 첫 요청 이후 배치 윈도우 동안 들어온 요청을 모음
+                    batch = [await self._queue.get()]
+                    deadline = loop.time() + BATCH_WINDOW_SECONDS
+                    while len(batch) < BATCH_MAX_SIZE:
+                        remaining = deadline - loop.time()
+                        if remaining <= 0:
+                            break
+                        try:
+                            batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                        except asyncio.TimeoutError:
+                            break
+                            
+                    # 응답을 기다리는 동안에도 다음 배치를 모을 수 있도록 별도 태스크로 전송
+                    task = asyncio.create_task(self._dispatch_batch(batch))
+                    self._dispatch_tasks.add(task)
+                    task.add_done_callback(self._dispatch_tasks.discard)
+                    
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"AI 요청 배치 워커 오류: {e}")
+                    await asyncio.sleep(1)
+        finally:
+            self._batch_worker_running = False
+            
+    async def _dispatch_batch(self, batch: List[tuple]):
+        """배치 요청 전송 (동일 에이전트의 동일 대화는 한 번만 호출)"""
+        groups: Dict[tuple, List] = {}
+        requests = {}
+        for agent_config, message_history, future in batch:
+            key = (
+                agent_config["name"],
+                agent_config["system_prompt"],
+                tuple((msg["role"], msg["content"]) for msg in message_history)
             )
+            if key not in groups:
+                groups[key] = []
+                requests[key] = (agent_config, message_history)
+            groups[key].append(future)
             
-            return response.choices[0].message.content
+        keys = list(groups)
+        try:
+            results = await asyncio.gather(
+                *(self._generate_openai_response(*requests[key]) for key in keys),
+                return_exceptions=True
+            )
+            
+            for key, result in zip(keys, results):
+                for future in groups[key]:
+                    if future.done():
+                        continue
+                    if isinstance(result, BaseException):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+        finally:
+            # 배치가 취소되더라도 기다리는 호출자가 멈추지 않도록 남은 future를 정리
+            for futures in groups.values():
+                for future in futures:
+                    if not future.done():
+                        future.cancel()
+                    
+    async def _generate_openai_response(self, agent_config: Dict, message_history: List[Dict]) -> str:
+        """OpenAI API를 사용한 실제 AI 응답 생성"""
+        try:
+            model = agent_config.get("model", OPENAI_DEFAULT_MODEL)
+            messages, prompt_tokens = self._build_openai_messages(agent_config, message_history, model)
+            
+            content = await self._complete(model, messages, prompt_tokens)
+            
+            # 저가 모델 응답이 비어 있거나 답을 못 한 경우 상위 모델로 한 번 더 시도
+            if model != OPENAI_ESCALATION_MODEL and self._is_low_quality(content):
+                logger.info(f"{model} 응답 부실 - {OPENAI_ESCALATION_MODEL}로 재시도")
+                content = await self._complete(OPENAI_ESCALATION_MODEL, messages, prompt_tokens)
+                
+            return content
             
         except Exception as e:
             logger.error(f"OpenAI API 오류: {e}")
             raise
             
-    async def _generate_mock_response(self, agent_id: AgentType, message: str, context: Dict) -> str:
-        """모의 AI 응답 생성"""
-        # 각 에이전트별 전문적인 응답 템플릿
-        response_templates = {
-            AgentType.MATERIALS_SPECIALIST: [
-                f"재료 전문가 AI가 '{message}' 요청을 분석했습니다.\n\n추천 재료:\n• 친환경 콘크리트 (탄소 저감 30%)\n• 재활용 강재 (비용 절감 15%)\n• 고성능 단열재 (에너지 효율 25% 향상)\n\n지속가능성 점수: 8.5/10\n예상 비용 절감: 12%",
-                f"'{message}' 관련하여 최신 친환경 건축 재료를 분석했습니다.\n\n핵심 추천사항:\n1. 생분해성 바이오 콘크리트 적용\n2. 재활용 플라스틱 복합재 사용\n3. 자연 단열재 (셀룰로오스, 양모) 활용\n\n환경 영향도: 65% 감소\n내구성: 기존 대비 120%"
-            ],
-            AgentType.DESIGN_THEORIST: [
-                f"설계 이론가 AI가 '{message}' 요청을 검토했습니다.\n\n설계 원칙 분석:\n• 황금비 적용으로 시각적 조화 달성\n• 자연 채광 최적화 (남향 30도 배치)\n• 효율적 동선 구성 (최대 이동거리 15m)\n\n공간 효율성: 92%\n사용자 만족도 예측: 9.2/10",
-                f"'{message}'에 대한 공간 구성 분석을 완료했습니다.\n\n주요 설계 제안:\n1. 오픈 플랜과 프라이빗 공간의 균형\n2. 수직적 공간 활용 (메자닌 구조)\n3. 내외부 공간의 연속성 확보\n\n기능성 점수: 8.8/10\n미적 완성도: 9.1/10"
-            ],
-            AgentType.STRUCTURAL_ENGINEER: [
-                f"구조 엔지니어 AI가 '{message}' 요청을 분석했습니다.\n\n구조 검토 결과:\n• 안전율: 3.2 (법정 기준 2.4 초과)\n• 내진 등급: 1등급 (규모 7.0 대응)\n• 하중 분산: 최적화 완료\n\n구조재 절약: 18%\n시공 기간 단축: 2주",
-                f"'{message}' 관련 구조 안전성 분석을 수행했습니다.\n\n핵심 분석 결과:\n1. 기초 구조: 매트 기초 + 파일 보강 추천\n2. 골조 시스템: RC조 + 철골 하이브리드\n3. 내진 보강: 면진 장치 적용\n\n안전성 등급: A+\n경제성: 기존 대비 12% 절감"
-            ],
-            AgentType.COST_ESTIMATOR: [
-                f"비용 추정 AI가 '{message}' 요청을 분석했습니다.\n\n상세 견적:\n• 총 공사비: 4억 8천만원 (VAT 별도)\n• 평당 단가: 480만원\n• 절감 가능액: 7,200만원 (15%)\n\n주요 절감 방안:\n- 재료 대체로 2,000만원\n- 공법 개선으로 3,500만원\n- 일정 단축으로 1,700만원",
-                f"'{message}'에 대한 종합적인 비용 분석을 완료했습니다.\n\n비용 구성:\n1. 구조체: 40% (1억 9천만원)\n2. 마감공사: 35% (1억 6천만원)\n3. 설비공사: 25% (1억 2천만원)\n\n리스크 요인:\n- 자재비 상승 가능성: 5-8%\n- 공기 지연 리스크: 중간"
-            ]
+    async def _complete(self, model: str, messages: List[Dict], prompt_tokens: int) -> str:
+        """Chat Completions 호출 (동일 입력이면 캐시된 응답 재사용)"""
+        cache_key = self._exact_cache_key(model, OPENAI_TEMPERATURE, messages)
+        cached = await self._response_cache_get(cache_key)
+        if cached is not None:
+            return cached
+            
+        await self._acquire_rate_limit(prompt_tokens)
+        response = await self._client.chat.completions.create(
+            model=model,
+            messages=messages,
+            max_tokens=OPENAI_MAX_TOKENS,
+            temperature=OPENAI_TEMPERATURE
+        )
+        
+        content = response.choices[0].message.content or ""
+        if not self._is_low_quality(content):
+            await self._response_cache_set(cache_key, content)
+        return content
+        
+    @staticmethod
+    def _is_low_quality(content: str) -> bool:
+        """응답이 비어 있거나 N/A뿐인지 확인"""
+        stripped = content.strip()
+        return not stripped or stripped.upper() == "N/A"
+        
+    async def _stream_openai_response(self, agent_config: Dict, message_history: List[Dict]) -> AsyncIterator[str]:
+        """OpenAI API 스트리밍 응답 생성 (완료된 응답은 캐시에 저장)"""
+        model = agent_config.get("model", OPENAI_DEFAULT_MODEL)
+        messages, prompt_tokens = self._build_openai_messages(agent_config, message_history, model)
+        
+        cache_key = self._exact_cache_key(model, OPENAI_TEMPERATURE, messages)
+        cached = await self._response_cache_get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+            
+        await self._acquire_rate_limit(prompt_tokens)
+        stream = await self._client.chat.completions.create(
+            model=model,
+            messages=messages,
+            max_tokens=OPENAI_MAX_TOKENS,
+            temperature=OPENAI_TEMPERATURE,
+            stream=True
+        )
+        
+        parts = []
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield delta
+                
+        content = "".join(parts)
+        if not self._is_low_quality(content):
+            await self._response_cache_set(cache_key, content)
+        
+    def _build_openai_messages(self, agent_config: Dict, message_history: List[Dict], model: str) -> Tuple[List[Dict], int]:
+        """시스템 프롬프트와 메시지 히스토리 구성 (토큰 예산 내 최근 메시지, 예상 프롬프트 토큰 수 함께 반환)"""
+        system_prompt = self._compressed_prompts.get(agent_config["system_prompt"])
+        if system_prompt is None:
+            system_prompt = self._compressed_prompts[agent_config["system_prompt"]] = compress_prompt(agent_config["system_prompt"])
+        system_tokens = self._system_prompt_tokens.get(system_prompt)
+        if system_tokens is None:
+            system_tokens = self._system_prompt_tokens[system_prompt] = count_tokens(system_prompt, model)
+            
+        messages = [{"role": "system", "content": system_prompt}]
+        history, history_tokens = self._trim_history(message_history, model)
+        verbatim_from = len(history) - VERBATIM_RECENT_MESSAGES
+        for i, msg in enumerate(history):
+            messages.append({
+                "role": msg["role"],
+                "content": msg["content"] if i >= verbatim_from else compress_prompt(msg["content"])
+            })
+        return messages, system_tokens + history_tokens
+        
+    async def _acquire_rate_limit(self, prompt_tokens: int):
+        """분당 요청 수와 토큰 수(프롬프트 + 최대 응답) 한도 내에서 대기"""
+        if self._rpm is None:
+            return
+        await self._rpm.acquire()
+        await self._tpm.acquire(min(prompt_tokens + OPENAI_MAX_TOKENS, OPENAI_TPM))
+        
+    def _embed(self, text: str):
+        """문장 임베딩 계산 (정규화, 스레드에서 실행)"""
+        if self._embedder is None:
+            self._embedder = SentenceTransformer(SEMANTIC_MODEL_NAME)
+        return self._embedder.encode([text], normalize_embeddings=True)[0].astype(np.float32)
+        
+    async def _semantic_lookup(self, agent_id: AgentType, message: str):
+        """의미적으로 유사한 이전 질문의 응답 조회"""
+        if not self._semantic_enabled:
+            return None, None
+            
+        try:
+            embedding = await asyncio.to_thread(self._embed, message)
+        except Exception as e:
+            logger.warning(f"임베딩 모델을 사용할 수 없어 의미 캐시를 비활성화합니다: {e}")
+            self._semantic_enabled = False
+            return None, None
+            
+        index = self._sem_index.get(agent_id)
+        if index is not None:
+            if FAISS_AVAILABLE:
+                # 내적 = 코사인 유사도 (정규화된 임베딩)
+                scores, ids = index.search(embedding.reshape(1, -1), 1)
+                score, best = float(scores[0, 0]), int(ids[0, 0])
+            else:
+                # int8 내적을 int32로 누적한 뒤 배율 복원
+                sims = np.einsum("ij,j->i", index, self._quantize(embedding), dtype=np.int32)
+                best = int(sims.argmax())
+                score = float(sims[best]) / (SEMANTIC_INT8_SCALE * SEMANTIC_INT8_SCALE)
+            if best >= 0 and score >= SEMANTIC_THRESHOLD:
+                return self._sem_responses[agent_id][best], embedding
+                
+        return None, embedding
+        
+    def _semantic_store(self, agent_id: AgentType, embedding, response: str):
+        """의미 캐시에 응답 저장 (최대 크기 초과 시 오래된 항목부터 제거)"""
+        index = self._sem_index.get(agent_id)
+        responses = self._sem_responses.setdefault(agent_id, [])
+        
+        if FAISS_AVAILABLE:
+            if index is None:
+                index = self._new_semantic_index(embedding.shape[0])
+            index.add(embedding.reshape(1, -1))
+            responses.append(response)
+            
+            # HNSW는 개별 삭제가 불가능하므로 가장 오래된 1/4을 버리고 재구성
+            if len(responses) > SEMANTIC_CACHE_MAXSIZE:
+                drop = max(len(responses) - SEMANTIC_CACHE_MAXSIZE, SEMANTIC_CACHE_MAXSIZE // 4)
+                vectors = index.reconstruct_n(drop, index.ntotal - drop)
+                index = self._new_semantic_index(embedding.shape[0])
+                index.add(vectors)
+                del responses[:drop]
+        else:
+            quantized = self._quantize(embedding)
+            if index is None:
+                index = quantized.reshape(1, -1)
+            else:
+                index = np.vstack((index, quantized))
+            responses.append(response)
+            
+            overflow = len(responses) - SEMANTIC_CACHE_MAXSIZE
+            if overflow > 0:
+                index = index[overflow:]
+                del responses[:overflow]
+                
+        self._sem_index[agent_id] = index
+        
+    @staticmethod
+    def _quantize(embedding):
+        """정규화 임베딩을 int8로 양자화 (메모리/대역폭 1/4)"""
+        return np.round(embedding * SEMANTIC_INT8_SCALE).astype(np.int8)
+        
+    @staticmethod
+    def _new_semantic_index(dim: int):
+        """코사인 유사도 기반 FAISS HNSW 인덱스 생성 (벡터는 8비트 스칼라 양자화로 저장)"""
+        index = faiss.IndexHNSWSQ(dim, faiss.ScalarQuantizer.QT_8bit, SEMANTIC_HNSW_M, faiss.METRIC_INNER_PRODUCT)
+        # 정규화 임베딩의 각 성분은 [-1, 1] 범위이므로 그 경계로 양자화 범위를 학습
+        bounds = np.vstack((-np.ones(dim), np.ones(dim))).astype(np.float32)
+        index.train(bounds)
+        return index
+        
+    def _load_semantic_indexes(self):
+        """저장된 FAISS 인덱스와 응답 목록 복원"""
+        if not (SEMANTIC_INDEX_DIR and FAISS_AVAILABLE and self._semantic_enabled):
+            return
+            
+        for agent_id in AgentType:
+            index_path = Path(SEMANTIC_INDEX_DIR) / f"{agent_id.value}.faiss"
+            responses_path = index_path.with_suffix(".json")
+            if not (index_path.exists() and responses_path.exists()):
+                continue
+            try:
+                index = faiss.read_index(str(index_path))
+                responses = orjson.loads(responses_path.read_bytes())
+            except Exception as e:
+                logger.warning(f"의미 캐시 인덱스를 읽을 수 없습니다 ({agent_id}): {e}")
+                continue
+            if index.ntotal == len(responses):
+                self._sem_index[agent_id] = index
+                self._sem_responses[agent_id] = responses
+                
+    def _save_semantic_indexes(self):
+        """FAISS 인덱스와 응답 목록을 디스크에 저장 (재시작 후 재사용)"""
+        if not (SEMANTIC_INDEX_DIR and FAISS_AVAILABLE and self._sem_index):
+            return
+            
+        try:
+            directory = Path(SEMANTIC_INDEX_DIR)
+            directory.mkdir(parents=True, exist_ok=True)
+            for agent_id, index in self._sem_index.items():
+                index_path = directory / f"{agent_id.value}.faiss"
+                faiss.write_index(index, str(index_path))
+                index_path.with_suffix(".json").write_bytes(orjson.dumps(self._sem_responses[agent_id]))
+        except Exception as e:
+            logger.warning(f"의미 캐시 인덱스를 저장할 수 없습니다: {e}")
+            
+    async def _redis_call(self, method: str, *args, **kwargs):
+        """Redis 명령 실행 (실패 시 잠시 메모리 캐시만 사용)"""
+        if self.redis is None or time.monotonic() < self._redis_down_until:
+            return None
+        try:
+            result = await getattr(self.redis, method)(*args, **kwargs)
+        except Exception as e:
+            logger.warning(f"Redis 사용 불가 - {REDIS_RETRY_SECONDS:.0f}초간 메모리 캐시 사용: {e}")
+            self._redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+            self._redis_ok = False
+            return None
+        self._redis_ok = True
+        return result
+        
+    async def check_redis(self) -> bool:
+        """시작 시 Redis 연결 확인 (실패하면 재시도 간격 동안 메모리 캐시만 사용)"""
+        if self.redis is None:
+            return False
+        await self._redis_call("ping")
+        if self._redis_ok:
+            logger.info("AI 캐시 Redis 연결됨")
+        return self._redis_ok
+            
+    async def _response_cache_get(self, key: str) -> Optional[str]:
+        """응답 캐시 조회 (메모리 -> Redis 순)"""
+        value = self._exact_cache.get(key)
+        if value is not None:
+            self._exact_cache.move_to_end(key)
+            self._cache_stats["response_hits"] += 1
+            return value
+            
+        value = await self._redis_call("get", f"{REDIS_KEY_PREFIX}resp:{key}")
+        if value is not None:
+            self._exact_cache_put(key, value)
+            self._cache_stats["response_hits"] += 1
+            return value
+            
+        self._cache_stats["response_misses"] += 1
+        return None
+        
+    async def _response_cache_set(self, key: str, value: str):
+        """응답 캐시 저장 (메모리, Redis, 디스크)"""
+        self._exact_cache_put(key, value)
+        await self._redis_call("set", f"{REDIS_KEY_PREFIX}resp:{key}", value, ex=REDIS_CACHE_TTL_SECONDS)
+        self._persist_cache_entry(key, value)
+        
+    async def _analysis_get(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        """분석 결과 조회 (메모리 -> Redis 순)"""
+        result = self.analysis_cache.get(analysis_id)
+        if result is None:
+            result = self._prefetch_cache_get(analysis_id)
+        if result is not None:
+            self._cache_stats["analysis_hits"] += 1
+            return result
+            
+        raw = await self._redis_call("get", f"{REDIS_KEY_PREFIX}analysis:{analysis_id}")
+        if raw is not None:
+            result = orjson.loads(raw)
+            if ":" in analysis_id:
+                # 미리 실행한 분석 ID ("분석 ID:에이전트")는 제한된 저장소에만 보관
+                self._prefetch_cache_put(analysis_id, result)
+            else:
+                self.analysis_cache[analysis_id] = result
+            self._cache_stats["analysis_hits"] += 1
+            return result
+            
+        self._cache_stats["analysis_misses"] += 1
+        return None
+        
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """캐시 적중/미스 통계"""
+        return {
+            **self._cache_stats,
+            "response_cache_size": len(self._exact_cache),
+            "analysis_cache_size": len(self.analysis_cache),
+            "prefetch_cache_size": len(self._prefetch_cache),
+            # 마지막 명령이 성공했고 재시도 대기 중이 아닐 때만 사용 중으로 보고
+            "redis_enabled": self._redis_ok and time.monotonic() >= self._redis_down_until
         }
         
+    def _prefetch_cache_get(self, prefetch_id: str) -> Optional[Dict[str, Any]]:
+        """미리 실행한 분석 결과 조회 (만료된 항목은 제거)"""
+        cached = self._prefetch_cache.get(prefetch_id)
+        if cached is None:
+            return None
+        result, expires_at = cached
+        if expires_at <= time.monotonic():
+            del self._prefetch_cache[prefetch_id]
+            return None
+        self._prefetch_cache.move_to_end(prefetch_id)
+        return result
+        
+    def _prefetch_cache_put(self, prefetch_id: str, result: Dict[str, Any]):
+        """미리 실행한 분석 결과 저장 (최대 크기 초과 시 가장 오래된 항목 제거)"""
+        self._prefetch_cache[prefetch_id] = (result, time.monotonic() + PREFETCH_CACHE_TTL_SECONDS)
+        self._prefetch_cache.move_to_end(prefetch_id)
+        if len(self._prefetch_cache) > PREFETCH_CACHE_MAXSIZE:
+            self._prefetch_cache.popitem(last=False)
+            
+    def _exact_cache_put(self, key: str, value: str):
+        """정확 일치 캐시에 저장 (최대 크기 초과 시 가장 오래된 항목 제거)"""
+        self._exact_cache[key] = value
+        self._exact_cache.move_to_end(key)
+        if len(self._exact_cache) > EXACT_CACHE_MAXSIZE:
+            self._exact_cache.popitem(last=False)
+            
+    def _load_persistent_cache(self):
+        """JSONL 캐시 파일을 읽어 메모리 캐시 복원"""
+        if self._cache_path is None or not self._cache_path.exists():
+            return
+            
+        restored = 0
+        lines_read = 0
+        try:
+            with self._cache_path.open("rb") as f:
+                for line in f:
+                    lines_read += 1
+                    try:
+                        entry = orjson.loads(line)
+                        key, value = entry["k"], entry["v"]
+                    except (ValueError, KeyError, TypeError):
+                        continue  # 손상된 줄은 건너뜀
+                        
+                    if key.startswith(ANALYSIS_CACHE_PREFIX):
+                        analysis_id = value["analysis_id"]
+                        self.analysis_cache[analysis_id] = value
+                        self._analysis_by_project[key[len(ANALYSIS_CACHE_PREFIX):]] = analysis_id
+                    else:
+                        self._exact_cache_put(key, value)
+                    restored += 1
+        except OSError as e:
+            logger.warning(f"AI 캐시 파일을 읽을 수 없습니다: {e}")
+            return
+            
+        logger.info(f"AI 캐시 복원: {restored}개 항목 ({self._cache_path})")
+        
+        # 중복/제거된 항목이 쌓인 파일은 현재 캐시 내용으로 압축 (시작 시 1회)
+        lines = self._cache_snapshot_lines()
+        if lines_read != len(lines):
+            self._write_cache_file(lines, append=False)
+        self._cache_file_lines = len(lines)
+        
+    @staticmethod
+    def _cache_line(key: str, value: Any) -> bytes:
+        """캐시 항목을 JSONL 한 줄로 직렬화"""
+        return orjson.dumps({"k": key, "v": value}, default=str, option=ORJSON_OPTIONS) + b"\n"
+        
+    def _cache_snapshot_lines(self) -> List[bytes]:
+        """현재 메모리 캐시 내용을 JSONL 줄 목록으로 변환 (분석 결과 -> 응답 LRU 순, 최대 줄 수 제한)"""
+        lines = []
+        for project_hash, analysis_id in self._analysis_by_project.items():
+            result = self.analysis_cache.get(analysis_id)
+            if result is not None:
+                lines.append(self._cache_line(ANALYSIS_CACHE_PREFIX + project_hash, result))
+        lines.extend(self._cache_line(key, value) for key, value in self._exact_cache.items())
+        return lines[-CACHE_FILE_MAX_LINES:]
+        
+    def _write_cache_file(self, lines: List[bytes], append: bool):
+        """캐시 파일에 줄 추가 또는 임시 파일로 전체 교체 (블로킹 - 이벤트 루프 밖에서 호출)"""
+        try:
+            if append:
+                with self._cache_path.open("ab") as f:
+                    f.writelines(lines)
+            else:
+                tmp_path = self._cache_path.with_name(self._cache_path.name + ".tmp")
+                with tmp_path.open("wb") as f:
+                    f.writelines(lines)
+                os.replace(tmp_path, self._cache_path)
+        except OSError as e:
+            logger.warning(f"AI 캐시 파일에 쓸 수 없습니다: {e}")
+            
+    def _persist_cache_entry(self, key: str, value: Any):
+        """캐시 항목을 디스크 기록 대기열에 추가 (기록은 백그라운드 태스크가 담당)"""
+        if self._cache_path is None:
+            return
+            
+        self._cache_pending.append(self._cache_line(key, value))
+        if self._cache_flush_task is None or self._cache_flush_task.done():
+            self._cache_flush_task = asyncio.create_task(self._flush_cache_entries())
+            
+    async def _flush_cache_entries(self):
+        """대기 중인 캐시 항목을 스레드에서 기록 (줄 수 상한을 넘으면 현재 캐시 내용으로 다시 씀)"""
+        while self._cache_pending:
+            lines, self._cache_pending = self._cache_pending, []
+            if self._cache_file_lines + len(lines) > CACHE_FILE_MAX_LINES:
+                # 대기 항목은 이미 메모리 캐시에 반영되어 있으므로 스냅샷에 포함됨
+                lines = self._cache_snapshot_lines()
+                await asyncio.to_thread(self._write_cache_file, lines, False)
+                self._cache_file_lines = len(lines)
+            else:
+                await asyncio.to_thread(self._write_cache_file, lines, True)
+                self._cache_file_lines += len(lines)
+            
+    @staticmethod
+    def _project_hash(project_data: Dict) -> str:
+        """프로젝트 데이터 해시"""
+        payload = orjson.dumps(project_data, default=str, option=ORJSON_SORTED_OPTIONS)
+        return hashlib.sha256(payload).hexdigest()
+        
+    @staticmethod
+    def _trim_history(message_history: List[Dict], model: str) -> Tuple[List[Dict], int]:
+        """토큰 예산을 넘지 않는 최근 메시지와 그 토큰 수 (마지막 메시지는 항상 포함)"""
+        picked = []
+        total = 0
+        for msg in reversed(message_history):
+            # 메시지별 토큰 수는 한 번만 계산
+            tokens = msg.get("token_count")
+            if tokens is None:
+                tokens = msg["token_count"] = count_tokens(msg["content"], model)
+            if picked and total + tokens > HISTORY_TOKEN_BUDGET:
+                break
+            total += tokens
+            picked.append(msg)
+        picked.reverse()
+        return picked, total
+        
+    @staticmethod
+    def _exact_cache_key(model: str, temperature: float, messages: List[Dict]) -> str:
+        """정확 일치 캐시 키 생성"""
+        payload = orjson.dumps({"m": model, "t": temperature, "msgs": messages}, option=ORJSON_SORTED_OPTIONS)
+        return hashlib.sha256(payload).hexdigest()
+        
+    async def _generate_mock_response(self, agent_id: AgentType, message: str, context: Dict) -> str:
+        """모의 AI 응답 생성"""
         # 에이전트별 응답 선택 (랜덤)
-        import random
-        if agent_id in response_templates:
-            template = random.choice(response_templates[agent_id])
+        templates = MOCK_RESPONSE_TEMPLATES.get(agent_id)
+        if templates:
+            template = self._rng.choice(templates).format(message=message)
         else:
             template = f"{self.agents[agent_id]['name']}가 '{message}' 요청을 처리했습니다.\n\n전문적인 분석과 최적화된 솔루션을 제공드립니다."
             
         # 응답 생성 지연 시뮬레이션
-        await asyncio.sleep(random.uniform(1, 3))
+        await asyncio.sleep(self._rng.uniform(1, 3))
         
         return template
         
     async def end_session(self, session_id: str) -> Dict[str, Any]:
         """AI 에이전트 세션 종료"""
         if session_id not in self.sessions:
-            raise ValueError(f"세션을 찾을 수 없습니다: {session_id}")
+            raise NotFoundError(f"세션을 찾을 수 없습니다: {session_id}")
             
         session = self.sessions[session_id]
         session["status"] = "ended"
-        session["ended_at"] = datetime.now()
+        session["_end_ts"] = time.time()
         
         # 세션 통계 계산
-        message_count = len([msg for msg in session["message_history"] if msg["role"] == "user"])
-        duration = (session["ended_at"] - session["started_at"]).total_seconds()
+        message_count = session["_user_count"]
+        duration = session["_end_ts"] - session["_start_ts"]
         
         session_summary = {
             "session_id": session_id,
@@ -306,7 +1132,7 @@ class AIAgentService:
             "user_id": session["user_id"],
             "message_count": message_count,
             "duration_seconds": duration,
-            "ended_at": session["ended_at"].isoformat()
+            "ended_at": _iso(session["_end_ts"])
         }
         
         # 세션 정리 (메모리 절약)
@@ -317,6 +1143,17 @@ class AIAgentService:
         
     async def run_comprehensive_analysis(self, project_data: Dict) -> Dict[str, Any]:
         """종합 설계 분석 실행"""
+        # 동일한 프로젝트 데이터는 이전 분석 결과 재사용
+        project_hash = self._project_hash(project_data)
+        cached_id = self._analysis_by_project.get(project_hash)
+        if cached_id is None:
+            cached_id = await self._redis_call("get", f"{REDIS_KEY_PREFIX}analysis_project:{project_hash}")
+        if cached_id is not None:
+            cached = await self._analysis_get(cached_id)
+            if cached is not None:
+                logger.info(f"종합 분석 캐시 사용: {cached_id}")
+                return cached
+            
         analysis_id = str(uuid.uuid4())
         
         logger.info(f"종합 분석 시작: {analysis_id}")
@@ -324,8 +1161,7 @@ class AIAgentService:
         # 각 에이전트별 분석 결과
         analysis_results = {}
         
-        # 병렬로 각 에이전트 분석 실행
-        tasks = []
+        # 병렬로 각 에이전트 분석 실행 (동시 실행 제한 + 재시도)
         agent_types = [
             AgentType.MATERIALS_SPECIALIST,
             AgentType.DESIGN_THEORIST,
@@ -333,16 +1169,23 @@ class AIAgentService:
             AgentType.COST_ESTIMATOR
         ]
         
-        for agent_type in agent_types:
-            task = self._run_agent_analysis(agent_type, project_data)
-            tasks.append(task)
+        # 공통 프로젝트 정보는 한 번만 생성
+        base_info = self._build_project_info(project_data)
+        
+        tasks = [
+            self._guarded(lambda at=agent_type: self._run_agent_analysis(at, project_data, base_info))
+            for agent_type in agent_types
+        ]
             
-        # 모든 분석 완료 대기
-        results = await asyncio.gather(*tasks)
+        # 모든 분석 완료 대기 (일부 실패해도 나머지 결과는 유지)
+        results = await asyncio.gather(*tasks, return_exceptions=True)
         
         # 결과 정리
-        for i, agent_type in enumerate(agent_types):
-            analysis_results[agent_type] = results[i]
+        for agent_type, result in zip(agent_types, results):
+            if isinstance(result, BaseException):
+                logger.error(f"에이전트 분석 실패: {agent_type} ({result!r})")
+                result = self._failed_agent_result(agent_type)
+            analysis_results[agent_type] = result
             
         # 종합 점수 계산
         overall_score = self._calculate_overall_score(analysis_results)
@@ -354,87 +1197,163 @@ class AIAgentService:
             "overall_score": overall_score,
             "recommendations": self._generate_recommendations(analysis_results),
             "generated_at": datetime.now().isoformat(),
-            "processing_time": sum(result.get("processing_time", 0) for result in results)
+            "processing_time": sum(result.get("processing_time", 0) for result in analysis_results.values())
         }
+        if ANALYSIS_PREFETCH_ENABLED:
+            # 미리 실행한 후속 분석은 완료되면 이 ID로 조회 가능
+            comprehensive_result["prefetched_analyses"] = {
+                agent_type: f"{analysis_id}:{agent_type.value}" for agent_type in PREFETCH_AGENT_TYPES
+            }
         
-        # 캐시에 저장
+        # 캐시에 저장 (실패한 에이전트가 있으면 재분석할 수 있도록 디스크에는 남기지 않음)
         self.analysis_cache[analysis_id] = comprehensive_result
+        redis_writes = [self._redis_call(
+            "set",
+            f"{REDIS_KEY_PREFIX}analysis:{analysis_id}",
+            orjson.dumps(comprehensive_result, default=str, option=ORJSON_OPTIONS),
+            ex=REDIS_CACHE_TTL_SECONDS
+        )]
+        if not any(result.get("error") for result in analysis_results.values()):
+            self._analysis_by_project[project_hash] = analysis_id
+            redis_writes.append(self._redis_call(
+                "set", f"{REDIS_KEY_PREFIX}analysis_project:{project_hash}", analysis_id, ex=REDIS_CACHE_TTL_SECONDS
+            ))
+            self._persist_cache_entry(ANALYSIS_CACHE_PREFIX + project_hash, comprehensive_result)
+        # Redis 저장은 서로 독립적이므로 동시에 전송
+        await asyncio.gather(*redis_writes)
+            
+        # 사용자가 후속으로 요청할 가능성이 높은 나머지 에이전트 분석을 백그라운드에서 실행
+        if ANALYSIS_PREFETCH_ENABLED:
+            for agent_type in PREFETCH_AGENT_TYPES:
+                task = asyncio.create_task(self._prefetch(agent_type, project_data, base_info, analysis_id))
+                self._background_tasks.add(task)
+                task.add_done_callback(self._background_tasks.discard)
         
         logger.info(f"종합 분석 완료: {analysis_id} (점수: {overall_score})")
         return comprehensive_result
         
-    async def _run_agent_analysis(self, agent_type: AgentType, project_data: Dict) -> Dict[str, Any]:
-        """개별 에이전트 분석 실행"""
+    async def _prefetch(self, agent_type: AgentType, project_data: Dict, base_info: str, analysis_id: str):
+        """에이전트 분석을 미리 실행해 분석 캐시에 저장"""
+        prefetch_id = f"{analysis_id}:{agent_type.value}"
+        try:
+            async with self._prefetch_sem:
+                result = await asyncio.wait_for(
+                    self._run_agent_analysis(agent_type, project_data, base_info),
+                    timeout=ANALYSIS_TIMEOUT_SECONDS
+                )
+        except Exception as e:
+            logger.warning(f"후속 분석 미리 실행 실패: {prefetch_id} ({e!r})")
+            return
+            
+        self._prefetch_cache_put(prefetch_id, result)
+        await self._redis_call(
+            "set",
+            f"{REDIS_KEY_PREFIX}analysis:{prefetch_id}",
+            orjson.dumps(result, default=str, option=ORJSON_OPTIONS),
+            ex=REDIS_CACHE_TTL_SECONDS
+        )
+        
+    async def _guarded(self, coro_factory):
+        """동시 실행 제한, 시도별 타임아웃, 지수 백오프 재시도로 분석 실행"""
+        async with self._sem:
+            for attempt in range(ANALYSIS_MAX_ATTEMPTS):
+                try:
+                    return await asyncio.wait_for(coro_factory(), timeout=ANALYSIS_TIMEOUT_SECONDS)
+                except RETRYABLE_ERRORS as e:
+                    if attempt == ANALYSIS_MAX_ATTEMPTS - 1:
+                        raise
+                    delay = min(2 ** attempt, ANALYSIS_MAX_BACKOFF_SECONDS)
+                    logger.warning(f"에이전트 분석 재시도 {attempt + 1}/{ANALYSIS_MAX_ATTEMPTS - 1} ({delay}초 후): {e!r}")
+                    await asyncio.sleep(delay)
+                    
+    def _failed_agent_result(self, agent_type: AgentType) -> Dict[str, Any]:
+        """분석에 실패한 에이전트의 결과"""
+        agent_name = self.agents[agent_type]["name"]
+        return {
+            "agent_id": agent_type,
+            "agent_name": agent_name,
+            "analysis_result": {
+                "summary": f"{agent_name} 분석을 완료하지 못했습니다.",
+                "detailed_analysis": "",
+                "score": None,
+                "recommendations": []
+            },
+            "raw_response": "",
+            "confidence": 0.0,
+            "processing_time": 0,
+            "timestamp": datetime.now().isoformat(),
+            "error": True
+        }
+        
+    async def _run_agent_analysis(self, agent_type: AgentType, project_data: Dict, base_info: Optional[str] = None) -> Dict[str, Any]:
+        """개별 에이전트 분석 실행 (세션 없이 1회성 메시지로 호출)"""
         start_time = time.time()
+        agent_config = self.agents[agent_type]
         
         # 에이전트별 분석 요청 메시지 생성
-        analysis_request = self._generate_analysis_request(agent_type, project_data)
+        analysis_request = self._generate_analysis_request(agent_type, project_data, base_info)
+        messages = [{"role": "user", "content": analysis_request, "ts": start_time}]
         
-        # 임시 세션 생성
-        session_id = await self.start_session(agent_type, "system", project_data)
-        
-        try:
-            # 분석 실행
-            response = await self.send_message(session_id, analysis_request)
-            
-            # 에이전트별 특화된 결과 생성
-            specialized_result = await self._process_agent_result(agent_type, response, project_data)
-            
-            processing_time = time.time() - start_time
-            
-            return {
-                "agent_id": agent_type,
-                "agent_name": self.agents[agent_type]["name"],
-                "analysis_result": specialized_result,
-                "raw_response": response["response"],
-                "confidence": response.get("confidence", 0.9),
-                "processing_time": processing_time,
-                "timestamp": datetime.now().isoformat()
-            }
+        # 분석 실행 (오류는 호출자의 재시도 로직으로 전달)
+        if self.use_real_ai:
+            ai_response = await self._generate_openai_response(agent_config, messages)
+        else:
+            ai_response = await self._generate_mock_response(agent_type, analysis_request, project_data)
             
-        finally:
-            # 임시 세션 정리
-            try:
-                await self.end_session(session_id)
-            except:
-                pass
-                
-    def _generate_analysis_request(self, agent_type: AgentType, project_data: Dict) -> str:
-        """에이전트별 분석 요청 메시지 생성"""
-        base_info = f"""
-        프로젝트 정보:
-        - 건물 유형: {project_data.get('building_type', 'N/A')}
-        - 위치: {project_data.get('location', 'N/A')}
-        - 면적: {project_data.get('area', 'N/A')}㎡
-        - 층수: {project_data.get('floors', 'N/A')}층
-        - 예산: {project_data.get('budget', 'N/A')}원
-        - 특수 요구사항: {', '.join(project_data.get('special_requirements', []))}
-        """
-        
-        agent_specific_requests = {
-            AgentType.MATERIALS_SPECIALIST: f"{base_info}\n친환경적이고 비용 효율적인 건축 재료를 추천하고, 지속가능성 점수를 평가해주세요.",
-            AgentType.DESIGN_THEORIST: f"{base_info}\n효율적인 공간 구성과 설계 원칙을 적용한 최적화 방안을 제시해주세요.",
-            AgentType.STRUCTURAL_ENGINEER: f"{base_info}\n구조적 안전성을 검토하고 최적의 구조 시스템을 제안해주세요.",
-            AgentType.COST_ESTIMATOR: f"{base_info}\n상세한 공사비를 산출하고 비용 절감 방안을 제시해주세요."
+        # 에이전트별 특화된 결과 생성
+        specialized_result = await self._process_agent_result(agent_type, {"response": ai_response}, project_data)
+        
+        processing_time = time.time() - start_time
+        
+        return {
+            "agent_id": agent_type,
+            "agent_name": agent_config["name"],
+            "analysis_result": specialized_result,
+            "raw_response": ai_response,
+            "confidence": 0.95,
+            "processing_time": processing_time,
+            "timestamp": datetime.now().isoformat()
         }
         
-        return agent_specific_requests.get(agent_type, f"{base_info}\n전문적인 분석과 권장사항을 제공해주세요.")
+    def _build_project_info(self, project_data: Dict) -> str:
+        """분석 요청 공통 프로젝트 정보 생성 (값이 없는 항목은 보내지 않음)"""
+        lines = ["프로젝트 정보:"]
+        for key, label, unit in PROJECT_INFO_FIELDS:
+            value = project_data.get(key)
+            if value not in (None, ""):
+                lines.append(f"- {label}: {value}{unit}")
+        special_requirements = project_data.get('special_requirements', [])
+        if special_requirements:
+            lines.append(f"- 특수 요구사항: {', '.join(special_requirements)}")
+        return "\n".join(lines)
+        
+    def _generate_analysis_request(self, agent_type: AgentType, project_data: Dict, base_info: Optional[str] = None) -> str:
+        """에이전트별 분석 요청 메시지 생성"""
+        if base_info is None:
+            base_info = self._build_project_info(project_data)
+        return base_info + self._agent_suffix.get(agent_type, DEFAULT_ANALYSIS_SUFFIX)
         
     async def _process_agent_result(self, agent_type: AgentType, response: Dict, project_data: Dict) -> Dict[str, Any]:
         """에이전트별 결과 처리 및 구조화"""
+        text = response["response"]
+        
+        # 응답 해시는 한 번만 계산하고 비트 구간을 나눠 점수에 사용
+        response_hash = stable_hash64(text)
+        
         # 기본 결과 구조
         result = {
-            "summary": response["response"][:200] + "..." if len(response["response"]) > 200 else response["response"],
-            "detailed_analysis": response["response"],
-            "score": round(85 + (hash(response["response"]) % 15), 1),  # 85-100 점수
+            "summary": text[:200] + "..." if len(text) > 200 else text,
+            "detailed_analysis": text,
+            "score": round(85 + (response_hash & 0xF), 1),  # 85-100 점수
             "recommendations": []
         }
         
         # 에이전트별 특화 데이터 추가
         if agent_type == AgentType.MATERIALS_SPECIALIST:
+            project_hash = stable_hash64(orjson.dumps(project_data, default=str, option=ORJSON_SORTED_OPTIONS))
             result.update({
-                "sustainability_score": round(7.5 + (hash(project_data.get('location', '')) % 25) / 10, 1),
-                "cost_efficiency": round(80 + (hash(project_data.get('building_type', '')) % 20), 1),
+                "sustainability_score": round(7.5 + ((project_hash >> 4) & 0xFFFF) % 25 / 10, 1),
+                "cost_efficiency": round(80 + ((project_hash >> 20) & 0xFFFF) % 20, 1),
                 "recommended_materials": [
                     {"name": "친환경 콘크리트", "savings": "15%", "sustainability": "높음"},
                     {"name": "재활용 강재", "savings": "12%", "sustainability": "중간"},
@@ -473,12 +1392,20 @@ class AIAgentService:
             AgentType.COST_ESTIMATOR: 0.20
         }
         
+        total_weight = 0.0
+        
         for agent_type, result in analysis_results.items():
+            # 실패한 에이전트는 제외하고 나머지 가중치로 정규화
+            if result.get("error"):
+                continue
             score = result["analysis_result"].get("score", 85)
             weight = weights.get(agent_type, 0.25)
             scores.append(score * weight)
+            total_weight += weight
             
-        return round(sum(scores), 1)
+        if not total_weight:
+            return 0.0
+        return round(sum(scores) / total_weight, 1)
         
     def _generate_recommendations(self, analysis_results: Dict) -> List[str]:
         """종합 권장사항 생성"""
@@ -493,7 +1420,7 @@ class AIAgentService:
     def get_agent_info(self, agent_id: AgentType) -> Dict[str, Any]:
         """에이전트 정보 반환"""
         if agent_id not in self.agents:
-            raise ValueError(f"에이전트를 찾을 수 없습니다: {agent_id}")
+            raise NotFoundError(f"에이전트를 찾을 수 없습니다: {agent_id}")
             
         return self.agents[agent_id]
         
@@ -504,16 +1431,52 @@ class AIAgentService:
     def get_session_info(self, session_id: str) -> Dict[str, Any]:
         """세션 정보 반환"""
         if session_id not in self.sessions:
-            raise ValueError(f"세션을 찾을 수 없습니다: {session_id}")
+            raise NotFoundError(f"세션을 찾을 수 없습니다: {session_id}")
             
-        return self.sessions[session_id]
+        # 내부 필드(_로 시작)는 제외하고 시각은 ISO 문자열로 변환
+        session = self.sessions[session_id]
+        info = {key: value for key, value in session.items() if not key.startswith("_")}
+        info["started_at"] = _iso(session["_start_ts"])
+        info["message_history"] = [
+            {
+                "role": msg["role"],
+                "content": msg["content"],
+                "timestamp": _iso(msg["ts"]),
+                **({"response_time": msg["response_time"]} if "response_time" in msg else {})
+            }
+            for msg in session["message_history"]
+        ]
+        return info
         
-    def get_analysis_result(self, analysis_id: str) -> Dict[str, Any]:
-        """분석 결과 반환"""
-        if analysis_id not in self.analysis_cache:
-            raise ValueError(f"분석 결과를 찾을 수 없습니다: {analysis_id}")
+    async def get_analysis_result(self, analysis_id: str) -> Dict[str, Any]:
+        """분석 결과 반환 (다른 워커의 결과는 Redis에서 조회)"""
+        result = await self._analysis_get(analysis_id)
+        if result is None:
+            raise NotFoundError(f"분석 결과를 찾을 수 없습니다: {analysis_id}")
             
-        return self.analysis_cache[analysis_id]
+        return result
+
+    async def close(self):
+        """미리 실행 중인 분석 취소, 전송 중인 배치 정리, 디스크 캐시 기록 완료 대기, OpenAI HTTP 연결 풀 및 Redis 연결 정리, 의미 캐시 인덱스 저장"""
+        if self._background_tasks:
+            # 미리 실행 중인 분석은 OpenAI/Redis 연결을 닫기 전에 취소
+            background_tasks = list(self._background_tasks)
+            for task in background_tasks:
+                task.cancel()
+            await asyncio.gather(*background_tasks, return_exceptions=True)
+        if self._dispatch_tasks:
+            # 전송 중인 배치는 잠시 기다리고, 끝나지 않은 것은 취소
+            _, pending = await asyncio.wait(set(self._dispatch_tasks), timeout=BATCH_DRAIN_TIMEOUT_SECONDS)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        if self._cache_flush_task is not None:
+            await self._cache_flush_task
+        self._save_semantic_indexes()
+        if self._client is not None:
+            await self._client.close()
+        if self.redis is not None:
+            await self.redis.aclose()
 
 # 전역 AI 에이전트 서비스 인스턴스
 ai_service = AIAgentService()
\ No newline at end of file
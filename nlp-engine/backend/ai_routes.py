@@ -1,30 +1,54 @@
-from fastapi import APIRouter, HTTPException, Depends, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, HTTPException, Depends, Request, WebSocket, WebSocketDisconnect
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from fastapi.security import HTTPBearer
-from pydantic import BaseModel, Field
-from typing import Dict, List, Optional, Any
-import json
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Annotated, Dict, List, Optional, Any, Tuple, Type, Union
+import asyncio
 import logging
 
-from .ai_agent_service import ai_service, AgentType, AnalysisType
-from .websocket_manager import manager, websocket_handler
-from .auth import get_current_user
+import msgspec
+
+from ai_agent_service import ai_service, AgentType, AnalysisType
+from websocket_manager import manager, websocket_handler
+from auth import ADMIN_USER_IDS, User, get_current_user
+from serialization import json_loads, json_dumps, json_dumps_str
 
 logger = logging.getLogger(__name__)
 security = HTTPBearer()
 
-# API 라우터 생성
-router = APIRouter(prefix="/api/ai", tags=["AI Agents"])
+# 인증 사용자 의존성 (한 번 정의해 모든 엔드포인트가 공유)
+CurrentUser = Annotated[User, Depends(get_current_user)]
+
+# WebSocket 수신 배치: 첫 프레임 이후 이미 도착한 프레임을 짧게 모아 함께 처리
+WS_BATCH_WAIT_SECONDS = 0.001
+WS_BATCH_MAX_SIZE = 32
+
+# API 라우터 생성 (응답은 orjson으로 직렬화)
+router = APIRouter(
+    prefix="/api/ai",
+    tags=["AI Agents"],
+    default_response_class=ORJSONResponse
+)
 
 # Request/Response 모델들
+# 요청 모델은 불변 + 추가 필드 무시로 검증 경로를 단순화
+REQUEST_MODEL_CONFIG = ConfigDict(extra="ignore", validate_assignment=False, frozen=True)
+
 class ChatSessionRequest(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+    
     agent_id: AgentType
     context: Optional[Dict[str, Any]] = None
 
 class ChatMessageRequest(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+    
     session_id: str
     message: str
 
-class AnalysisRequest(BaseModel):
+# 종합 분석 요청은 본문을 msgspec으로 바로 디코딩 (추가 필드는 기본적으로 무시)
+class AnalysisRequest(msgspec.Struct, frozen=True):
     request_type: AnalysisType
     content: str
     building_type: str
@@ -34,7 +58,7 @@ class AnalysisRequest(BaseModel):
     budget: float
     sustainability: str = "medium"
     style: str = "modern"
-    special_requirements: List[str] = []
+    special_requirements: Tuple[str, ...] = ()
 
 class AgentResponse(BaseModel):
     session_id: str
@@ -53,182 +77,227 @@ class AnalysisResponse(BaseModel):
     processing_time: float
     timestamp: str
 
+def _request_body_schema(model: Type[msgspec.Struct]) -> Dict[str, Any]:
+    """본문을 직접 파싱하는 엔드포인트의 OpenAPI requestBody (하위 정의는 인라인)"""
+    _, defs = msgspec.json.schema_components([model], ref_template="{name}")
+    schema = defs[model.__name__]
+    for prop in schema["properties"].values():
+        ref = prop.pop("$ref", None)
+        if ref:
+            prop.update(defs[ref])
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": schema}}
+        }
+    }
+
+# 에이전트 ID → 이름 조회 테이블 (에이전트 구성은 시작 후 바뀌지 않음)
+_AGENT_NAMES: Dict[AgentType, str] = {
+    agent_id: config["name"] for agent_id, config in ai_service.get_all_agents().items()
+}
+
+# 요청마다 바뀌지 않는 응답 본문 (시작 시 1회 직렬화)
+_AGENTS_BODY: bytes = b""
+_HEALTH_PREFIX: bytes = b""
+
+@router.on_event("startup")
+async def _prebuild_static_responses():
+    """에이전트 목록 응답과 헬스체크 고정 필드를 미리 직렬화"""
+    global _AGENTS_BODY, _HEALTH_PREFIX
+    agents = ai_service.get_all_agents()
+    _AGENTS_BODY = json_dumps({
+        "success": True,
+        "agents": agents,
+        "total_count": len(agents)
+    })
+    # 닫는 중괄호를 떼어 두고 동적 필드 객체를 이어 붙인다
+    _HEALTH_PREFIX = json_dumps({
+        "status": "healthy",
+        "agents_available": len(agents),
+        "timestamp": "2025-01-07T10:30:00Z"
+    })[:-1] + b","
+
+def _json_bytes_response(content: bytes) -> Response:
+    return Response(content=content, media_type="application/json")
+
 # AI 에이전트 관련 엔드포인트
+# (InvalidRequestError/NotFoundError는 앱 미들웨어에서 상태 코드로 변환)
 @router.get("/agents")
 async def get_all_agents():
     """모든 AI 에이전트 정보 조회"""
-    try:
-        agents = ai_service.get_all_agents()
-        return {
-            "success": True,
-            "agents": agents,
-            "total_count": len(agents)
-        }
-    except Exception as e:
-        logger.error(f"에이전트 조회 오류: {e}")
-        raise HTTPException(status_code=500, detail="에이전트 정보를 가져올 수 없습니다")
+    if not _AGENTS_BODY:
+        await _prebuild_static_responses()
+    return _json_bytes_response(_AGENTS_BODY)
 
 @router.get("/agents/{agent_id}")
 async def get_agent_info(agent_id: AgentType):
     """특정 AI 에이전트 정보 조회"""
-    try:
-        agent_info = ai_service.get_agent_info(agent_id)
-        return {
-            "success": True,
-            "agent": agent_info
-        }
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except Exception as e:
-        logger.error(f"에이전트 정보 조회 오류: {e}")
-        raise HTTPException(status_code=500, detail="에이전트 정보를 가져올 수 없습니다")
+    return {
+        "success": True,
+        "agent": ai_service.get_agent_info(agent_id)
+    }
 
 @router.post("/chat/start")
 async def start_chat_session(
     request: ChatSessionRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """AI 에이전트와 채팅 세션 시작"""
-    try:
-        session_id = await ai_service.start_session(
-            agent_id=request.agent_id,
-            user_id=current_user["user_id"],
-            context=request.context
-        )
-        
-        agent_info = ai_service.get_agent_info(request.agent_id)
-        
-        return {
-            "success": True,
-            "session_id": session_id,
-            "agent_id": request.agent_id,
-            "agent_name": agent_info["name"],
-            "message": f"{agent_info['name']}와의 채팅 세션이 시작되었습니다."
-        }
-    except Exception as e:
-        logger.error(f"채팅 세션 시작 오류: {e}")
-        raise HTTPException(status_code=500, detail="채팅 세션을 시작할 수 없습니다")
+    session_id = await ai_service.start_session(
+        agent_id=request.agent_id,
+        user_id=current_user.user_id,
+        context=request.context
+    )
+    
+    agent_name = _AGENT_NAMES[request.agent_id]
+    
+    return {
+        "success": True,
+        "session_id": session_id,
+        "agent_id": request.agent_id,
+        "agent_name": agent_name,
+        "message": f"{agent_name}와의 채팅 세션이 시작되었습니다."
+    }
 
-@router.post("/chat/message", response_model=AgentResponse)
+@router.post("/chat/message", response_model=AgentResponse, response_class=ORJSONResponse)
 async def send_chat_message(
     request: ChatMessageRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """AI 에이전트에게 메시지 전송"""
-    try:
-        response = await ai_service.send_message(
-            session_id=request.session_id,
-            message=request.message
-        )
+    response = await ai_service.send_message(
+        session_id=request.session_id,
+        message=request.message
+    )
+    
+    return AgentResponse(**response)
+
+@router.post("/chat/message/stream")
+async def stream_chat_message(
+    request: ChatMessageRequest,
+    current_user: CurrentUser
+):
+    """AI 에이전트에게 메시지 전송 (Server-Sent Events 스트리밍 응답)"""
+    stream = await ai_service.send_message_stream(
+        session_id=request.session_id,
+        message=request.message
+    )
         
-        return AgentResponse(**response)
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except Exception as e:
-        logger.error(f"메시지 전송 오류: {e}")
-        raise HTTPException(status_code=500, detail="메시지를 전송할 수 없습니다")
+    async def event_stream():
+        async for delta in stream:
+            yield f"data: {json_dumps_str({'delta': delta})}\n\n"
+        yield f"data: {json_dumps_str({'done': True, 'session_id': request.session_id})}\n\n"
+        
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
 
 @router.post("/chat/end")
 async def end_chat_session(
     session_id: str,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """AI 에이전트 채팅 세션 종료"""
-    try:
-        session_summary = await ai_service.end_session(session_id)
-        
-        return {
-            "success": True,
-            "session_summary": session_summary,
-            "message": "채팅 세션이 종료되었습니다."
-        }
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except Exception as e:
-        logger.error(f"세션 종료 오류: {e}")
-        raise HTTPException(status_code=500, detail="세션을 종료할 수 없습니다")
+    session_summary = await ai_service.end_session(session_id)
+    
+    return {
+        "success": True,
+        "session_summary": session_summary,
+        "message": "채팅 세션이 종료되었습니다."
+    }
 
-@router.post("/analysis/comprehensive", response_model=AnalysisResponse)
+@router.post(
+    "/analysis/comprehensive",
+    response_model=AnalysisResponse,
+    response_class=ORJSONResponse,
+    openapi_extra=_request_body_schema(AnalysisRequest)
+)
 async def run_comprehensive_analysis(
-    request: AnalysisRequest,
-    current_user: dict = Depends(get_current_user)
+    raw_request: Request,
+    current_user: CurrentUser
 ):
     """종합 설계 분석 실행"""
+    # 요청 본문을 Pydantic을 거치지 않고 바로 디코딩/검증 (Pydantic처럼 문자열 숫자 등 허용)
     try:
-        # 요청 데이터를 딕셔너리로 변환
-        project_data = {
-            "request_type": request.request_type,
-            "content": request.content,
-            "building_type": request.building_type,
-            "location": request.location,
-            "area": request.area,
-            "floors": request.floors,
-            "budget": request.budget,
-            "sustainability": request.sustainability,
-            "style": request.style,
-            "special_requirements": request.special_requirements,
-            "user_id": current_user["user_id"]
-        }
-        
-        # 종합 분석 실행
-        analysis_result = await ai_service.run_comprehensive_analysis(project_data)
-        
-        return AnalysisResponse(
-            analysis_id=analysis_result["analysis_id"],
-            status="completed",
-            results=analysis_result["agent_results"],
-            overall_score=analysis_result["overall_score"],
-            processing_time=analysis_result["processing_time"],
-            timestamp=analysis_result["generated_at"]
-        )
+        request = msgspec.json.decode(await raw_request.body(), type=AnalysisRequest, strict=False)
+    except msgspec.DecodeError as e:
+        raise RequestValidationError([{"loc": ("body",), "msg": str(e), "type": "value_error"}])
         
-    except Exception as e:
-        logger.error(f"종합 분석 오류: {e}")
-        raise HTTPException(status_code=500, detail="분석을 수행할 수 없습니다")
+    # 요청 데이터를 딕셔너리로 변환
+    project_data = msgspec.structs.asdict(request)
+    project_data["user_id"] = current_user.user_id
+    
+    # 종합 분석 실행
+    analysis_result = await ai_service.run_comprehensive_analysis(project_data)
+    
+    return AnalysisResponse(
+        analysis_id=analysis_result["analysis_id"],
+        status="completed",
+        results=analysis_result["agent_results"],
+        overall_score=analysis_result["overall_score"],
+        processing_time=analysis_result["processing_time"],
+        timestamp=analysis_result["generated_at"]
+    )
 
 @router.get("/analysis/{analysis_id}")
 async def get_analysis_result(
     analysis_id: str,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """분석 결과 조회"""
-    try:
-        result = ai_service.get_analysis_result(analysis_id)
-        
-        return {
-            "success": True,
-            "analysis": result
-        }
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except Exception as e:
-        logger.error(f"분석 결과 조회 오류: {e}")
-        raise HTTPException(status_code=500, detail="분석 결과를 가져올 수 없습니다")
+    return {
+        "success": True,
+        "analysis": await ai_service.get_analysis_result(analysis_id)
+    }
 
 @router.get("/sessions/{session_id}")
 async def get_session_info(
     session_id: str,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """세션 정보 조회"""
-    try:
-        session_info = ai_service.get_session_info(session_id)
+    session_info = ai_service.get_session_info(session_id)
+    
+    # 사용자 권한 확인
+    if session_info["user_id"] != current_user.user_id and current_user.user_id not in ADMIN_USER_IDS:
+        raise HTTPException(status_code=403, detail="세션에 접근할 권한이 없습니다")
         
-        # 사용자 권한 확인
-        if session_info["user_id"] != current_user["user_id"] and current_user.get("role") != "admin":
-            raise HTTPException(status_code=403, detail="세션에 접근할 권한이 없습니다")
+    return {
+        "success": True,
+        "session": session_info
+    }
+
+async def _receive_frame(websocket: WebSocket) -> Union[str, bytes]:
+    """WebSocket 프레임 수신 (바이너리 프레임은 bytes 그대로 반환)"""
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+    data = message.get("bytes")
+    return data if data is not None else message["text"]
+
+async def _handle_frames(websocket: WebSocket, connection_id: str, frames: List[Union[str, bytes]]):
+    """수신 프레임 묶음 처리 (프레임별로 파싱해 잘못된 프레임만 오류 응답, 수신 순서 유지)"""
+    messages = []
+    for data in frames:
+        try:
+            message_data = json_loads(data)
+        except ValueError:
+            message_data = None
             
-        return {
-            "success": True,
-            "session": session_info
-        }
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"세션 정보 조회 오류: {e}")
-        raise HTTPException(status_code=500, detail="세션 정보를 가져올 수 없습니다")
+        if isinstance(message_data, dict):
+            messages.append(message_data)
+            continue
+            
+        # 앞서 받은 메시지를 먼저 처리한 뒤 오류 응답
+        if messages:
+            await websocket_handler.handle_batch(websocket, connection_id, messages)
+            messages = []
+        await manager.send_personal_message({
+            "type": "error",
+            "message": "잘못된 메시지 형식입니다."
+        }, connection_id)
+        
+    if messages:
+        await websocket_handler.handle_batch(websocket, connection_id, messages)
 
 # WebSocket 엔드포인트
 @router.websocket("/ws/{user_id}")
@@ -239,20 +308,31 @@ async def websocket_endpoint(websocket: WebSocket, user_id: str):
         # 연결 승인 및 관리자에 등록
         connection_id = await manager.connect(websocket, user_id)
         
-        logger.info(f"AI WebSocket 연결됨: {user_id} ({connection_id})")
+        logger.info("AI WebSocket 연결됨: %s (%s)", user_id, connection_id)
         
-        while True:
-            # 클라이언트로부터 메시지 수신
-            data = await websocket.receive_text()
-            message_data = json.loads(data)
+        disconnected = False
+        while not disconnected:
+            # 클라이언트로부터 메시지 수신 (텍스트/바이너리 프레임 모두 디코딩 없이 파싱)
+            batch = [await _receive_frame(websocket)]
+            while len(batch) < WS_BATCH_MAX_SIZE:
+                try:
+                    batch.append(await asyncio.wait_for(_receive_frame(websocket), timeout=WS_BATCH_WAIT_SECONDS))
+                except asyncio.TimeoutError:
+                    break
+                except WebSocketDisconnect:
+                    # 배치 수집 중 연결이 끊기면 이미 받은 프레임까지 처리하고 종료
+                    disconnected = True
+                    break
             
-            # 메시지 처리
-            await websocket_handler.handle_message(websocket, connection_id, message_data)
+            # 메시지 묶음 처리
+            await _handle_frames(websocket, connection_id, batch)
             
+        logger.info("AI WebSocket 연결 해제: %s", user_id)
+        
     except WebSocketDisconnect:
-        logger.info(f"AI WebSocket 연결 해제: {user_id}")
+        logger.info("AI WebSocket 연결 해제: %s", user_id)
     except Exception as e:
-        logger.error(f"WebSocket 오류: {e}")
+        logger.error("WebSocket 오류: %s", e)
         await manager.send_personal_message({
             "type": "error",
             "message": "연결 오류가 발생했습니다."
@@ -263,83 +343,63 @@ async def websocket_endpoint(websocket: WebSocket, user_id: str):
 
 # AI 에이전트 상태 및 통계
 @router.get("/stats")
-async def get_ai_stats(current_user: dict = Depends(get_current_user)):
+async def get_ai_stats(current_user: CurrentUser):
     """AI 에이전트 통계 정보"""
-    try:
-        # WebSocket 연결 통계
-        connection_stats = manager.get_connection_stats()
-        
-        # AI 에이전트 성능 통계 (모의 데이터)
-        agent_stats = {
-            "total_sessions_today": 47,
-            "average_response_time": 2.3,
-            "user_satisfaction": 4.7,
-            "most_used_agent": "materials_specialist",
-            "analysis_completed_today": 12
-        }
-        
-        return {
-            "success": True,
-            "connection_stats": connection_stats,
-            "agent_stats": agent_stats,
-            "timestamp": "2025-01-07T10:30:00Z"
-        }
-    except Exception as e:
-        logger.error(f"AI 통계 조회 오류: {e}")
-        raise HTTPException(status_code=500, detail="통계 정보를 가져올 수 없습니다")
+    # WebSocket 연결 통계
+    connection_stats = manager.get_connection_stats()
+    
+    # AI 에이전트 성능 통계 (모의 데이터)
+    agent_stats = {
+        "total_sessions_today": 47,
+        "average_response_time": 2.3,
+        "user_satisfaction": 4.7,
+        "most_used_agent": "materials_specialist",
+        "analysis_completed_today": 12
+    }
+    
+    return {
+        "success": True,
+        "connection_stats": connection_stats,
+        "agent_stats": agent_stats,
+        "timestamp": "2025-01-07T10:30:00Z"
+    }
 
 # AI 에이전트 설정 업데이트
 @router.put("/agents/{agent_id}/config")
 async def update_agent_config(
     agent_id: AgentType,
     config: Dict[str, Any],
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """AI 에이전트 설정 업데이트 (관리자 전용)"""
-    if current_user.get("role") != "admin":
+    if current_user.user_id not in ADMIN_USER_IDS:
         raise HTTPException(status_code=403, detail="관리자 권한이 필요합니다")
         
-    try:
-        # 에이전트 설정 업데이트 (실제 구현 필요)
-        logger.info(f"에이전트 설정 업데이트: {agent_id}")
-        
-        return {
-            "success": True,
-            "message": f"{agent_id} 설정이 업데이트되었습니다.",
-            "updated_config": config
-        }
-    except Exception as e:
-        logger.error(f"에이전트 설정 업데이트 오류: {e}")
-        raise HTTPException(status_code=500, detail="설정을 업데이트할 수 없습니다")
-
-# 에러 핸들러
-@router.exception_handler(ValueError)
-async def value_error_handler(request, exc):
-    return HTTPException(status_code=400, detail=str(exc))
-
-@router.exception_handler(Exception)
-async def general_exception_handler(request, exc):
-    logger.error(f"예상치 못한 오류: {exc}")
-    return HTTPException(status_code=500, detail="내부 서버 오류가 발생했습니다")
+    # 에이전트 설정 업데이트 (실제 구현 필요)
+    logger.info("에이전트 설정 업데이트: %s", agent_id)
+    
+    return {
+        "success": True,
+        "message": f"{agent_id} 설정이 업데이트되었습니다.",
+        "updated_config": config
+    }
 
 # 헬스체크
 @router.get("/health")
 async def ai_health_check():
     """AI 서비스 헬스체크"""
     try:
-        # AI 서비스 상태 확인
-        agents_count = len(ai_service.get_all_agents())
-        active_sessions = len(ai_service.sessions)
-        
-        return {
-            "status": "healthy",
-            "agents_available": agents_count,
-            "active_sessions": active_sessions,
+        if not _HEALTH_PREFIX:
+            await _prebuild_static_responses()
+        # 고정 필드는 미리 직렬화된 바이트를 쓰고 동적 필드만 직렬화
+        dynamic = json_dumps({
+            "active_sessions": len(ai_service.sessions),
             "websocket_connections": len(manager.active_connections),
-            "timestamp": "2025-01-07T10:30:00Z"
-        }
+            "cache": ai_service.get_cache_stats()
+        })
+        return _json_bytes_response(_HEALTH_PREFIX + dynamic[1:])
     except Exception as e:
-        logger.error(f"AI 헬스체크 오류: {e}")
+        logger.error("AI 헬스체크 오류: %s", e)
         return {
             "status": "unhealthy",
             "error": str(e),
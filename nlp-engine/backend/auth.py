@@ -1,48 +1,85 @@
+import asyncio
 import jwt
 import hashlib
+import hmac
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from fastapi import HTTPException, Depends, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from functools import lru_cache
+from fastapi import HTTPException, Depends, Request, Security, status
+from fastapi.security import HTTPBearer
 import os
 
+class _BearerDocs(HTTPBearer):
+    """OpenAPI 문서에 Bearer 인증 스킴만 노출 (헤더 파싱은 verify_token에서 직접 수행)"""
+    async def __call__(self, request: Request) -> None:
+        return None
+
 # 보안 설정
 security = HTTPBearer()
+_docs_security = _BearerDocs(scheme_name="HTTPBearer")
 SECRET_KEY = os.getenv("VIBA_SECRET_KEY", "viba-ai-secret-key-2025")
 ALGORITHM = "HS256"
+TOKEN_CACHE_SIZE = 4096
+LAST_SEEN_FLUSH_SECONDS = 5
+# 키 인코딩과 알고리즘 목록은 요청마다 만들지 않도록 미리 준비
+_SECRET_BYTES = SECRET_KEY.encode()
+_ALGORITHMS = [ALGORITHM]
+_PEPPER = _SECRET_BYTES
+
+def hash_password(password: str) -> bytes:
+    """비밀번호 해싱 (pepper 적용, 32바이트 raw digest)"""
+    return hashlib.sha256(_PEPPER + password.encode()).digest()
+
+def verify_password(password: str, hashed: bytes) -> bool:
+    """비밀번호 검증 (상수 시간 비교)"""
+    return hmac.compare_digest(hash_password(password), hashed)
+
+# 시드 사용자 비밀번호 해시 (모듈 로드 시 1회 계산)
+_ADMIN_PW_HASH = hash_password("admin123")
+_ARCHITECT_PW_HASH = hash_password("password123")
+
+@dataclass(slots=True)
+class User:
+    """사용자 레코드 (자주 읽는 필드를 앞에 배치)"""
+    user_id: str
+    username: str
+    role: str
+    last_active: datetime
+    email: str
+    password: bytes
+    full_name: str
+    company: str
+    created_at: datetime
 
 # 임시 사용자 데이터베이스 (실제로는 PostgreSQL 사용)
 users_db = {
-    "admin": {
-        "user_id": "admin-001",
-        "username": "admin",
-        "email": "admin@viba.ai",
-        "password": hashlib.sha256("admin123".encode()).hexdigest(),
-        "role": "admin",
-        "full_name": "VIBA Admin",
-        "company": "VIBA AI",
-        "created_at": datetime.now(),
-        "last_active": datetime.now()
-    },
-    "architect": {
-        "user_id": "user-001", 
-        "username": "architect",
-        "email": "architect@viba.ai",
-        "password": hashlib.sha256("password123".encode()).hexdigest(),
-        "role": "architect",
-        "full_name": "김건축",
-        "company": "건축사사무소",
-        "created_at": datetime.now(),
-        "last_active": datetime.now()
-    }
+    "admin": User(
+        user_id="admin-001",
+        username="admin",
+        role="admin",
+        last_active=datetime.now(),
+        email="admin@viba.ai",
+        password=_ADMIN_PW_HASH,
+        full_name="VIBA Admin",
+        company="VIBA AI",
+        created_at=datetime.now()
+    ),
+    "architect": User(
+        user_id="user-001",
+        username="architect",
+        role="architect",
+        last_active=datetime.now(),
+        email="architect@viba.ai",
+        password=_ARCHITECT_PW_HASH,
+        full_name="김건축",
+        company="건축사사무소",
+        created_at=datetime.now()
+    )
 }
 
-def hash_password(password: str) -> str:
-    """비밀번호 해싱"""
-    return hashlib.sha256(password.encode()).hexdigest()
-
-def verify_password(password: str, hashed: str) -> bool:
-    """비밀번호 검증"""
-    return hash_password(password) == hashed
+# 관리자 user_id 집합 (권한 확인용)
+ADMIN_USER_IDS = frozenset(user.user_id for user in users_db.values() if user.role == "admin")
 
 def create_access_token(data: dict, expires_delta: timedelta = None):
     """JWT 토큰 생성"""
@@ -53,14 +90,29 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
         expire = datetime.utcnow() + timedelta(hours=24)
     
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _SECRET_BYTES, algorithm=ALGORITHM)
     return encoded_jwt
 
-def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def _decode_cached(token: str) -> dict:
+    """JWT 디코딩 결과 캐시 (서명 검증은 토큰당 최초 1회만 수행, 실패는 캐시되지 않음)"""
+    return jwt.decode(token, _SECRET_BYTES, algorithms=_ALGORITHMS)
+
+async def verify_token(request: Request, _docs: None = Security(_docs_security)):
     """토큰 검증"""
+    # Authorization 헤더를 직접 잘라 토큰 추출
+    auth = request.headers.get("authorization")
+    if not auth or auth[:7].lower() != "bearer ":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authenticated"
+        )
+    token = auth[7:]
     try:
-        token = credentials.credentials
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = _decode_cached(token)
+        # 캐시된 페이로드는 만료 여부만 다시 확인
+        if payload.get("exp", 0) <= time.time():
+            raise jwt.ExpiredSignatureError("Signature has expired")
         username: str = payload.get("sub")
         if username is None:
             raise HTTPException(
@@ -74,7 +126,7 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
             detail="Invalid authentication token"
         )
 
-def get_current_user(username: str = Depends(verify_token)):
+async def get_current_user(username: str = Depends(verify_token)) -> User:
     """현재 사용자 정보 가져오기"""
     user = users_db.get(username)
     if user is None:
@@ -82,6 +134,24 @@ def get_current_user(username: str = Depends(verify_token)):
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
-    # 마지막 활동 시간 업데이트
-    user["last_active"] = datetime.now()
-    return user
\ No newline at end of file
+    # 마지막 활동 시간 기록 (users_db 반영은 flush_last_seen_worker가 주기적으로 수행)
+    _LAST_SEEN[username] = time.time()
+    return user
+
+# 사용자별 마지막 활동 시각 (time.time() 값, 주기적으로 users_db에 반영)
+_LAST_SEEN: dict = {}
+
+def flush_last_seen():
+    """누적된 마지막 활동 시각을 users_db에 반영"""
+    global _LAST_SEEN
+    pending, _LAST_SEEN = _LAST_SEEN, {}
+    for username, ts in pending.items():
+        user = users_db.get(username)
+        if user is not None:
+            user.last_active = datetime.fromtimestamp(ts)
+
+async def flush_last_seen_worker():
+    """마지막 활동 시각 반영 워커"""
+    while True:
+        await asyncio.sleep(LAST_SEEN_FLUSH_SECONDS)
+        flush_last_seen()
\ No newline at end of file
@@ -10,21 +10,31 @@
 @date 2025.07.07
 """
 
-import jwt
+import asyncio
+import base64
 import hashlib
+import hmac
 import secrets
+import threading
+import time
 import bcrypt
+import orjson
+from collections import OrderedDict, defaultdict, deque
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Set
+from typing import Dict, FrozenSet, Iterable, List, Optional, Any, Set, Tuple
 from fastapi import HTTPException, Depends, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, Field, EmailStr, computed_field, field_validator
 from enum import Enum
 import os
+import re
 import redis
 import json
 import logging
-from functools import wraps
+from functools import lru_cache, wraps
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +45,71 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 REFRESH_TOKEN_EXPIRE_DAYS = 7
 PASSWORD_RESET_TOKEN_EXPIRE_MINUTES = 15
+# 토큰 만료까지의 초 (토큰 발급마다 timedelta를 계산하지 않도록 미리 변환)
+ACCESS_TOKEN_EXPIRE_SECONDS = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+REFRESH_TOKEN_EXPIRE_SECONDS = REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
+BCRYPT_COST = int(os.getenv("BCRYPT_COST", "12"))
+# bcrypt 전용 스레드 수 (기본: CPU 코어 수, 로그인 폭주 시에도 이 이상은 동시에 해싱하지 않음)
+BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", "0")) or os.cpu_count() or 1
+LOGIN_ATTEMPT_HISTORY = 10
+# 로그인 시도를 기록할 사용자명 수 상한 (없는 사용자명을 바꿔 가며 시도해도 메모리가 무한히 늘지 않음)
+LOGIN_ATTEMPT_USERS_MAXSIZE = 100_000
+IP_BLOCK_FAILURE_THRESHOLD = 5
+BLOCKED_IPS_KEY = "blocked_ips"
+
+# 검증된 JWT 페이로드 캐시 (항목 수명은 min(TTL, 토큰 만료까지 남은 시간))
+JWT_CACHE_MAXSIZE = int(os.getenv("JWT_CACHE_MAXSIZE", "50000"))
+JWT_CACHE_TTL_SECONDS = int(os.getenv("JWT_CACHE_TTL_SECONDS", "30"))
+# 캐시 키용 BLAKE2b 키 (프로세스마다 새로 생성, 외부에서 캐시 키 충돌을 노릴 수 없게 함)
+_JWT_CACHE_KEY = secrets.token_bytes(32)
+
+# JWT 헤더는 항상 같으므로 base64url 인코딩 결과를 미리 계산
+def _b64url_encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+def _b64url_decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+_JWT_HEADER_SEGMENT = _b64url_encode(orjson.dumps({"alg": ALGORITHM, "typ": "JWT"}))
+_JWT_SIGNING_PREFIX = _JWT_HEADER_SEGMENT + b"."
+
+# 인증 실패 시 재사용하는 예외 (실패가 몰릴 때 매번 새로 만들지 않음)
+# 같은 인스턴스를 다시 raise하면 traceback이 누적되므로 with_traceback(None)으로 초기화해서 사용
+_EXC_INVALID_TOKEN = HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+_EXC_TOKEN_EXPIRED = HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has expired")
+_EXC_INVALID_TOKEN_TYPE = HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token type")
+_EXC_INVALID_TOKEN_PAYLOAD = HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
+_EXC_AUTH_REQUIRED = HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication required")
+_EXC_BAD_CREDENTIALS = HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid username or password")
+_EXC_IP_BLOCKED = HTTPException(
+    status_code=status.HTTP_403_FORBIDDEN,
+    detail="IP address is blocked due to multiple failed attempts"
+)
+_EXC_USER_NOT_FOUND = HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
+@lru_cache(maxsize=None)
+def _account_status_exc(user_status) -> HTTPException:
+    """비활성 계정 예외 (상태별로 하나씩 생성)"""
+    return HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=f"Account is {user_status}")
+
+# 세션 활동 갱신 디바운스 (같은 세션은 이 시간 안에 다시 갱신하지 않음)
+SESSION_TTL_SECONDS = int(timedelta(hours=24).total_seconds())
+SESSION_TOUCH_INTERVAL_SECONDS = 3
+SESSION_TOUCH_CACHE_MAXSIZE = 10_000
+# 이 시간 동안 모인 세션 갱신을 Redis 파이프라인 한 번으로 전송
+SESSION_TOUCH_BATCH_SECONDS = 0.01
+
+# 세션 조회 + last_activity 갱신 + TTL 연장을 한 번의 왕복으로 처리
+SESSION_TOUCH_SCRIPT = """
+local v = redis.call('GET', KEYS[1])
+if v then
+    local session = cjson.decode(v)
+    session['last_activity'] = ARGV[2]
+    v = cjson.encode(session)
+    redis.call('SET', KEYS[1], v, 'EX', ARGV[1])
+end
+return v
+"""
 
 # Redis 연결 (세션 관리용)
 try:
@@ -45,6 +120,7 @@ try:
         decode_responses=True
     )
     redis_client.ping()
+    session_touch_script = redis_client.register_script(SESSION_TOUCH_SCRIPT)
     REDIS_AVAILABLE = True
 except:
     logger.warning("Redis 연결 실패 - 메모리 기반 세션 관리 사용")
@@ -62,7 +138,13 @@ class UserRole(str, Enum):
     VIEWER = "viewer"                # 뷰어 (읽기 전용)
 
 class Permission(str, Enum):
-    """권한 정의"""
+    """권한 정의 (각 권한은 정의 순서대로 고유 비트 bit를 가짐)"""
+    def __new__(cls, value: str):
+        member = str.__new__(cls, value)
+        member._value_ = value
+        member.bit = 1 << len(cls.__members__)
+        return member
+        
     # 프로젝트 권한
     PROJECT_CREATE = "project:create"
     PROJECT_READ = "project:read"
@@ -94,8 +176,8 @@ class Permission(str, Enum):
     SYSTEM_CONFIG = "system:config"
 
 # 역할별 권한 매핑
-ROLE_PERMISSIONS: Dict[UserRole, Set[Permission]] = {
-    UserRole.SUPER_ADMIN: {
+ROLE_PERMISSIONS: Dict[UserRole, FrozenSet[Permission]] = {
+    UserRole.SUPER_ADMIN: frozenset({
         # 모든 권한
         Permission.PROJECT_CREATE, Permission.PROJECT_READ, Permission.PROJECT_UPDATE, 
         Permission.PROJECT_DELETE, Permission.PROJECT_MANAGE,
@@ -104,8 +186,8 @@ ROLE_PERMISSIONS: Dict[UserRole, Set[Permission]] = {
         Permission.USER_CREATE, Permission.USER_READ, Permission.USER_UPDATE, 
         Permission.USER_DELETE, Permission.USER_MANAGE,
         Permission.SYSTEM_ADMIN, Permission.SYSTEM_MONITOR, Permission.SYSTEM_CONFIG
-    },
-    UserRole.ADMIN: {
+    }),
+    UserRole.ADMIN: frozenset({
         # 관리자 권한 (시스템 관리 제외)
         Permission.PROJECT_CREATE, Permission.PROJECT_READ, Permission.PROJECT_UPDATE, 
         Permission.PROJECT_DELETE, Permission.PROJECT_MANAGE,
@@ -113,43 +195,54 @@ ROLE_PERMISSIONS: Dict[UserRole, Set[Permission]] = {
         Permission.AI_ANALYZE, Permission.AI_CHAT, Permission.AI_ADVANCED,
         Permission.USER_CREATE, Permission.USER_READ, Permission.USER_UPDATE, Permission.USER_MANAGE,
         Permission.SYSTEM_MONITOR
-    },
-    UserRole.ARCHITECT: {
+    }),
+    UserRole.ARCHITECT: frozenset({
         # 건축사 권한
         Permission.PROJECT_CREATE, Permission.PROJECT_READ, Permission.PROJECT_UPDATE, Permission.PROJECT_DELETE,
         Permission.FILE_UPLOAD, Permission.FILE_DOWNLOAD, Permission.FILE_DELETE, Permission.FILE_ANALYZE,
         Permission.AI_ANALYZE, Permission.AI_CHAT, Permission.AI_ADVANCED,
         Permission.USER_READ
-    },
-    UserRole.ENGINEER: {
+    }),
+    UserRole.ENGINEER: frozenset({
         # 엔지니어 권한
         Permission.PROJECT_CREATE, Permission.PROJECT_READ, Permission.PROJECT_UPDATE,
         Permission.FILE_UPLOAD, Permission.FILE_DOWNLOAD, Permission.FILE_ANALYZE,
         Permission.AI_ANALYZE, Permission.AI_CHAT, Permission.AI_ADVANCED,
         Permission.USER_READ
-    },
-    UserRole.DESIGNER: {
+    }),
+    UserRole.DESIGNER: frozenset({
         # 설계자 권한
         Permission.PROJECT_CREATE, Permission.PROJECT_READ, Permission.PROJECT_UPDATE,
         Permission.FILE_UPLOAD, Permission.FILE_DOWNLOAD, Permission.FILE_ANALYZE,
         Permission.AI_ANALYZE, Permission.AI_CHAT,
         Permission.USER_READ
-    },
-    UserRole.CLIENT: {
+    }),
+    UserRole.CLIENT: frozenset({
         # 클라이언트 권한
         Permission.PROJECT_READ,
         Permission.FILE_DOWNLOAD,
         Permission.AI_CHAT,
         Permission.USER_READ
-    },
-    UserRole.VIEWER: {
+    }),
+    UserRole.VIEWER: frozenset({
         # 뷰어 권한 (읽기 전용)
         Permission.PROJECT_READ,
         Permission.FILE_DOWNLOAD,
         Permission.USER_READ
-    }
+    })
 }
 
+# 역할별 권한 비트마스크 (권한 확인은 AND 한 번)
+ROLE_PERMISSION_MASKS: Dict[UserRole, int] = {
+    role: sum(permission.bit for permission in permissions)
+    for role, permissions in ROLE_PERMISSIONS.items()
+}
+
+@lru_cache(maxsize=None)
+def permissions_from_mask(mask: int) -> FrozenSet[Permission]:
+    """권한 비트마스크를 권한 집합으로 변환 (마스크 종류는 역할 수만큼이라 캐시)"""
+    return frozenset(permission for permission in Permission if mask & permission.bit)
+
 class UserStatus(str, Enum):
     """사용자 상태"""
     ACTIVE = "active"
@@ -166,6 +259,31 @@ class LoginAttempt(BaseModel):
     timestamp: datetime
     failure_reason: Optional[str] = None
 
+@dataclass(slots=True)
+class UserRecord:
+    """사용자 레코드 (dict 대신 슬롯 속성으로 보관해 메모리와 필드 접근 비용을 줄임)"""
+    user_id: str
+    username: str
+    role: UserRole
+    status: UserStatus
+    # status == ACTIVE 여부 (set_user_status로만 변경)
+    status_active: bool
+    permissions_mask: int
+    email: str
+    password: str
+    full_name: Optional[str]
+    company: Optional[str]
+    department: Optional[str]
+    phone: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+    last_login: Optional[datetime]
+    login_count: int
+    failed_login_attempts: int
+    password_changed_at: Optional[datetime]
+    two_factor_enabled: bool
+    profile_image: Optional[str]
+
 class UserSession(BaseModel):
     """사용자 세션"""
     session_id: str
@@ -179,6 +297,9 @@ class UserSession(BaseModel):
     expires_at: datetime
     is_active: bool = True
 
+# Redis에 저장된 세션 JSON에서 datetime으로 되돌릴 필드
+SESSION_DATETIME_FIELDS = ("created_at", "last_activity", "expires_at")
+
 class UserProfile(BaseModel):
     """사용자 프로필"""
     user_id: str
@@ -190,7 +311,8 @@ class UserProfile(BaseModel):
     phone: Optional[str] = None
     role: UserRole
     status: UserStatus
-    permissions: Set[Permission]
+    # 사용자 레코드에는 비트마스크만 저장하고 권한 목록은 응답 시 계산
+    permissions_mask: int = Field(0, exclude=True)
     created_at: datetime
     updated_at: datetime
     last_login: Optional[datetime] = None
@@ -199,6 +321,21 @@ class UserProfile(BaseModel):
     password_changed_at: Optional[datetime] = None
     two_factor_enabled: bool = False
     profile_image: Optional[str] = None
+    
+    @computed_field
+    @property
+    def permissions(self) -> FrozenSet[Permission]:
+        return permissions_from_mask(self.permissions_mask)
+
+# 비밀번호 정책: 8~128자, 대문자/소문자/숫자/특수문자 각 1개 이상 (정규식 한 번으로 검사)
+PASSWORD_POLICY = re.compile(r"^(?=.*[A-Z])(?=.*[a-z])(?=.*\d)(?=.*[^A-Za-z0-9]).{8,128}$")
+
+def _check_password_policy(password: str) -> str:
+    if not PASSWORD_POLICY.match(password):
+        raise ValueError(
+            "Password must be 8-128 characters and include uppercase, lowercase, digit and special character"
+        )
+    return password
 
 class UserCreate(BaseModel):
     """사용자 생성 요청"""
@@ -210,6 +347,8 @@ class UserCreate(BaseModel):
     department: Optional[str] = None
     phone: Optional[str] = None
     role: UserRole = UserRole.DESIGNER
+    
+    validate_password = field_validator("password")(_check_password_policy)
 
 class UserUpdate(BaseModel):
     """사용자 정보 수정 요청"""
@@ -225,6 +364,8 @@ class PasswordChange(BaseModel):
     """비밀번호 변경 요청"""
     current_password: str
     new_password: str = Field(..., min_length=8)
+    
+    validate_new_password = field_validator("new_password")(_check_password_policy)
 
 class PasswordReset(BaseModel):
     """비밀번호 재설정 요청"""
@@ -234,14 +375,42 @@ class AuthEnhanced:
     """강화된 인증 시스템"""
     
     def __init__(self):
-        self.users_db: Dict[str, Dict] = {}
+        self.users_db: Dict[str, UserRecord] = {}
+        # 보조 인덱스 (users_db와 같은 사용자 dict를 가리킴)
+        self.users_by_email: Dict[str, UserRecord] = {}
+        self.users_by_id: Dict[str, UserRecord] = {}
+        # 역할/상태별 사용자 (username -> 사용자, 목록 조회 필터용)
+        self.users_by_role: Dict[UserRole, Dict[str, UserRecord]] = defaultdict(dict)
+        self.users_by_status: Dict[UserStatus, Dict[str, UserRecord]] = defaultdict(dict)
         self.sessions: Dict[str, UserSession] = {}
-        self.login_attempts: Dict[str, List[LoginAttempt]] = {}
+        # 사용자 ID -> 메모리 세션 ID (사용자별 세션 목록 조회용)
+        self.sessions_by_user: Dict[str, Set[str]] = defaultdict(set)
+        # 사용자별 최근 로그인 시도 (최대 LOGIN_ATTEMPT_HISTORY개, 오래 시도가 없던 사용자명부터 제거)
+        self.login_attempts: "OrderedDict[str, deque[LoginAttempt]]" = OrderedDict()
+        # 이 워커가 알고 있는 차단 IP (전체 워커 공유 상태는 Redis 집합)
         self.blocked_ips: Set[str] = set()
-        self.init_default_users()
+        # bcrypt는 해싱 중 GIL을 해제하므로 스레드 풀만으로 여러 코어에서 병렬 처리됨
+        self._bcrypt_pool = ThreadPoolExecutor(max_workers=BCRYPT_WORKERS, thread_name_prefix="bcrypt")
+        # 토큰 해시 -> (페이로드, 만료 시각), 의존성이 스레드 풀에서도 호출되므로 잠금 사용
+        self._jwt_cache: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._jwt_cache_lock = threading.Lock()
+        # 세션 ID -> 마지막 활동 갱신 시각 (로컬 L1, 디바운스용)
+        self._session_touched: "OrderedDict[str, float]" = OrderedDict()
+        self._session_touched_lock = threading.Lock()
+        # Redis 전송 대기 중인 세션 갱신 (이벤트 루프에서만 접근)
+        self._pending_touches: Set[str] = set()
+        self._touch_flush_handle: Optional[asyncio.TimerHandle] = None
+        self._touch_flush_tasks: Set[asyncio.Task] = set()
+        # (단조 시계 초, 해당 초의 datetime) - 같은 초 안에서는 datetime을 재사용
+        self._now_cache: Tuple[int, Optional[datetime]] = (0, None)
+        # 키 스케줄을 마친 HMAC-SHA256 객체 (토큰마다 copy()해서 사용)
+        self._hmac_template = hmac.new(SECRET_KEY.encode(), digestmod=hashlib.sha256)
+        # 없는 사용자 로그인 시에도 bcrypt 검증을 수행해 응답 시간으로 사용자 존재 여부가 드러나지 않게 함
+        self._dummy_password_hash: Optional[str] = None
+        # 기본 사용자는 import 시점이 아니라 앱 시작 시 ensure_default_users()로 생성
         
-    def init_default_users(self):
-        """기본 사용자 생성"""
+    async def ensure_default_users(self):
+        """기본 사용자 생성 (비밀번호 해싱을 병렬로 수행, 이미 있으면 건너뜀)"""
         default_users = [
             {
                 "username": "superadmin",
@@ -277,42 +446,94 @@ class AuthEnhanced:
             }
         ]
         
-        for user_data in default_users:
-            self.create_user_internal(user_data)
+        missing = [user_data for user_data in default_users if user_data["username"] not in self.users_db]
+        hashes, _ = await asyncio.gather(
+            asyncio.gather(*(self.hash_password_async(user_data["password"]) for user_data in missing)),
+            self.get_dummy_password_hash()
+        )
+        for user_data, password_hash in zip(missing, hashes):
+            self.create_user_internal({**user_data, "password_hash": password_hash})
+            
+    async def get_dummy_password_hash(self) -> str:
+        """존재하지 않는 사용자용 bcrypt 해시 (최초 1회 생성)"""
+        if self._dummy_password_hash is None:
+            self._dummy_password_hash = await self.hash_password_async(secrets.token_urlsafe(16))
+        return self._dummy_password_hash
             
     def create_user_internal(self, user_data: Dict):
         """내부 사용자 생성"""
         user_id = self.generate_user_id()
-        hashed_password = self.hash_password(user_data["password"])
+        # 호출 측에서 미리 해싱한 경우(hash_password_async) 그대로 사용
+        hashed_password = user_data.get("password_hash") or self.hash_password(user_data["password"])
         
-        now = datetime.now()
-        permissions = ROLE_PERMISSIONS.get(user_data["role"], set())
-        
-        user = {
-            "user_id": user_id,
-            "username": user_data["username"],
-            "email": user_data["email"],
-            "password": hashed_password,
-            "full_name": user_data.get("full_name"),
-            "company": user_data.get("company"),
-            "department": user_data.get("department"),
-            "phone": user_data.get("phone"),
-            "role": user_data["role"],
-            "status": UserStatus.ACTIVE,
-            "permissions": list(permissions),
-            "created_at": now,
-            "updated_at": now,
-            "last_login": None,
-            "login_count": 0,
-            "failed_login_attempts": 0,
-            "password_changed_at": now,
-            "two_factor_enabled": False,
-            "profile_image": None
-        }
+        now = self._now()
+        user = UserRecord(
+            user_id=user_id,
+            username=user_data["username"],
+            email=user_data["email"],
+            password=hashed_password,
+            full_name=user_data.get("full_name"),
+            company=user_data.get("company"),
+            department=user_data.get("department"),
+            phone=user_data.get("phone"),
+            role=user_data["role"],
+            status=UserStatus.ACTIVE,
+            status_active=True,
+            permissions_mask=ROLE_PERMISSION_MASKS.get(user_data["role"], 0),
+            created_at=now,
+            updated_at=now,
+            last_login=None,
+            login_count=0,
+            failed_login_attempts=0,
+            password_changed_at=now,
+            two_factor_enabled=False,
+            profile_image=None
+        )
         
         self.users_db[user_data["username"]] = user
+        self.users_by_email[user.email] = user
+        self.users_by_id[user_id] = user
+        self.users_by_role[user.role][user.username] = user
+        self.users_by_status[user.status][user.username] = user
         logger.info(f"기본 사용자 생성: {user_data['username']} ({user_data['role']})")
         
+    def _now(self) -> datetime:
+        """초 단위로 캐시한 현재 시각 (같은 초 안의 호출은 datetime을 새로 만들지 않음)"""
+        second = time.monotonic_ns() // 1_000_000_000
+        cached = self._now_cache
+        if cached[0] == second:
+            return cached[1]
+        now = datetime.now()
+        # 튜플 단위로 교체하므로 잠금 없이도 초와 시각이 어긋나지 않음
+        self._now_cache = (second, now)
+        return now
+        
+    def set_user_status(self, user: UserRecord, user_status: UserStatus):
+        """사용자 상태 변경 (활성 여부 플래그와 상태 인덱스도 함께 갱신)"""
+        self.users_by_status[user.status].pop(user.username, None)
+        user.status = user_status
+        user.status_active = user_status == UserStatus.ACTIVE
+        self.users_by_status[user_status][user.username] = user
+        
+    def set_user_role(self, user: UserRecord, role: UserRole):
+        """사용자 역할 변경 (권한 비트마스크와 역할 인덱스도 함께 갱신)"""
+        self.users_by_role[user.role].pop(user.username, None)
+        user.role = role
+        user.permissions_mask = ROLE_PERMISSION_MASKS.get(role, 0)
+        self.users_by_role[role][user.username] = user
+        
+    def is_email_taken(self, email: str, user: Optional[UserRecord] = None) -> bool:
+        """이메일이 다른 사용자에게 등록되어 있는지 확인 (삭제된 사용자 포함)"""
+        owner = self.users_by_email.get(email)
+        return owner is not None and owner is not user
+        
+    def set_user_email(self, user: UserRecord, email: str):
+        """사용자 이메일 변경 (이메일 인덱스도 함께 갱신)"""
+        if self.users_by_email.get(user.email) is user:
+            del self.users_by_email[user.email]
+        user.email = email
+        self.users_by_email[email] = user
+        
     def generate_user_id(self) -> str:
         """고유 사용자 ID 생성"""
         return f"user_{secrets.token_hex(8)}"
@@ -323,7 +544,7 @@ class AuthEnhanced:
         
     def hash_password(self, password: str) -> str:
         """비밀번호 해싱 (bcrypt 사용)"""
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=BCRYPT_COST)
         hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
         return hashed.decode('utf-8')
         
@@ -331,49 +552,130 @@ class AuthEnhanced:
         """비밀번호 검증"""
         return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
         
+    async def hash_password_async(self, password: str) -> str:
+        """비밀번호 해싱 (bcrypt 스레드 풀에서 실행해 이벤트 루프를 막지 않음)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._bcrypt_pool, self.hash_password, password)
+        
+    async def verify_password_async(self, password: str, hashed: str) -> bool:
+        """비밀번호 검증 (bcrypt 스레드 풀에서 실행해 이벤트 루프를 막지 않음)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._bcrypt_pool, bcrypt.checkpw, password.encode('utf-8'), hashed.encode('utf-8')
+        )
+        
+    def _sign(self, message: bytes) -> bytes:
+        """HS256 서명"""
+        h = self._hmac_template.copy()
+        h.update(message)
+        return h.digest()
+        
+    def _encode_jwt(self, claims: dict) -> str:
+        """HS256 JWT 인코딩 (헤더 세그먼트는 미리 계산한 값 사용)"""
+        signing_input = _JWT_SIGNING_PREFIX + _b64url_encode(orjson.dumps(claims))
+        return (signing_input + b"." + _b64url_encode(self._sign(signing_input))).decode()
+        
     def create_access_token(self, data: dict, expires_delta: Optional[timedelta] = None) -> str:
         """액세스 토큰 생성"""
-        to_encode = data.copy()
-        if expires_delta:
-            expire = datetime.utcnow() + expires_delta
-        else:
-            expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-            
-        to_encode.update({"exp": expire, "type": "access"})
-        encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-        return encoded_jwt
+        expires_in = ACCESS_TOKEN_EXPIRE_SECONDS if expires_delta is None else expires_delta.total_seconds()
+        return self._encode_jwt({**data, "exp": int(time.time() + expires_in), "type": "access"})
         
     def create_refresh_token(self, data: dict) -> str:
         """리프레시 토큰 생성"""
-        to_encode = data.copy()
-        expire = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
-        to_encode.update({"exp": expire, "type": "refresh"})
-        encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-        return encoded_jwt
+        return self._encode_jwt({**data, "exp": int(time.time()) + REFRESH_TOKEN_EXPIRE_SECONDS, "type": "refresh"})
         
-    def verify_token(self, token: str) -> Dict[str, Any]:
-        """토큰 검증"""
+    def _decode_jwt(self, token: str) -> Dict[str, Any]:
+        """HS256 JWT 서명 검증 및 페이로드 디코딩 (만료 검사 제외)"""
         try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            return payload
-        except jwt.ExpiredSignatureError:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token has expired"
-            )
-        except jwt.JWTError:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token"
-            )
+            header_segment, payload_segment, signature_segment = token.encode().split(b".")
+            # 이 서버가 발급한 헤더만 허용 (alg 변조 차단)
+            if header_segment != _JWT_HEADER_SEGMENT:
+                raise ValueError("unexpected header")
+            signature = _b64url_decode(signature_segment)
+            if not hmac.compare_digest(signature, self._sign(header_segment + b"." + payload_segment)):
+                raise ValueError("signature mismatch")
+            payload = orjson.loads(_b64url_decode(payload_segment))
+            if not isinstance(payload, dict):
+                raise ValueError("payload is not an object")
+        except (ValueError, UnicodeError):
+            # binascii.Error, orjson.JSONDecodeError 모두 ValueError 하위 타입
+            raise _EXC_INVALID_TOKEN.with_traceback(None)
+        return payload
+        
+    def verify_token(self, token: str) -> Dict[str, Any]:
+        """토큰 검증 (최근 검증한 토큰은 서명 재검증 없이 캐시에서 반환)"""
+        key = hashlib.blake2b(token.encode(), digest_size=16, key=_JWT_CACHE_KEY).digest()
+        now = time.time()
+        with self._jwt_cache_lock:
+            cached = self._jwt_cache.get(key)
+            if cached is not None:
+                payload, expires_at = cached
+                if expires_at > now:
+                    self._jwt_cache.move_to_end(key)
+                    return payload
+                del self._jwt_cache[key]
+                
+        payload = self._decode_jwt(token)
+        exp = payload.get("exp")
+        if exp is not None:
+            if not isinstance(exp, (int, float)) or isinstance(exp, bool):
+                raise _EXC_INVALID_TOKEN.with_traceback(None)
+            if exp <= now:
+                raise _EXC_TOKEN_EXPIRED.with_traceback(None)
+            
+        expires_at = min(now + JWT_CACHE_TTL_SECONDS, payload.get("exp", now))
+        with self._jwt_cache_lock:
+            self._jwt_cache[key] = (payload, expires_at)
+            if len(self._jwt_cache) > JWT_CACHE_MAXSIZE:
+                self._jwt_cache.popitem(last=False)
+        return payload
+        
+    def invalidate_user_tokens(self, username: str):
+        """사용자의 캐시된 토큰 검증 결과 제거 (다음 요청에서 서명 재검증)"""
+        with self._jwt_cache_lock:
+            stale = [key for key, (payload, _) in self._jwt_cache.items() if payload.get("sub") == username]
+            for key in stale:
+                del self._jwt_cache[key]
             
     def is_ip_blocked(self, ip_address: str) -> bool:
         """IP 차단 여부 확인"""
-        return ip_address in self.blocked_ips
+        if ip_address in self.blocked_ips:
+            return True
+        if REDIS_AVAILABLE:
+            # 다른 워커가 차단한 IP도 반영 (확인된 차단은 로컬에 기억)
+            try:
+                if redis_client.sismember(BLOCKED_IPS_KEY, ip_address):
+                    self.blocked_ips.add(ip_address)
+                    return True
+            except Exception as e:
+                logger.error(f"차단 IP 조회 오류: {e}")
+        return False
+        
+    async def is_ip_blocked_async(self, ip_address: str) -> bool:
+        """IP 차단 여부 확인 (Redis 조회는 스레드에서 수행)"""
+        if ip_address in self.blocked_ips:
+            return True
+        if not REDIS_AVAILABLE:
+            return False
+        return await asyncio.to_thread(self.is_ip_blocked, ip_address)
+        
+    def count_blocked_ips(self) -> int:
+        """차단된 IP 수"""
+        if REDIS_AVAILABLE:
+            try:
+                return redis_client.scard(BLOCKED_IPS_KEY)
+            except Exception as e:
+                logger.error(f"차단 IP 조회 오류: {e}")
+        return len(self.blocked_ips)
         
     def block_ip(self, ip_address: str):
         """IP 차단"""
         self.blocked_ips.add(ip_address)
+        if REDIS_AVAILABLE:
+            try:
+                redis_client.sadd(BLOCKED_IPS_KEY, ip_address)
+            except Exception as e:
+                logger.error(f"차단 IP 저장 오류: {e}")
         logger.warning(f"IP 차단: {ip_address}")
         
     def record_login_attempt(self, username: str, ip_address: str, user_agent: str, 
@@ -383,38 +685,40 @@ class AuthEnhanced:
             ip_address=ip_address,
             user_agent=user_agent,
             success=success,
-            timestamp=datetime.now(),
+            timestamp=self._now(),
             failure_reason=failure_reason
         )
         
-        if username not in self.login_attempts:
-            self.login_attempts[username] = []
-            
-        self.login_attempts[username].append(attempt)
-        
-        # 최근 10개만 유지
-        self.login_attempts[username] = self.login_attempts[username][-10:]
+        # 최근 10개만 유지 (deque maxlen)
+        attempts = self.login_attempts.get(username)
+        if attempts is None:
+            attempts = self.login_attempts[username] = deque(maxlen=LOGIN_ATTEMPT_HISTORY)
+            if len(self.login_attempts) > LOGIN_ATTEMPT_USERS_MAXSIZE:
+                self.login_attempts.popitem(last=False)
+        else:
+            self.login_attempts.move_to_end(username)
+        attempts.append(attempt)
         
-        # 실패 시도가 5회 이상이면 IP 차단
+        # 최근 5회 시도가 모두 같은 IP의 실패면 IP 차단
         if not success:
-            recent_failures = [
-                a for a in self.login_attempts[username][-5:]
+            recent_failures = sum(
+                1 for a in islice(reversed(attempts), IP_BLOCK_FAILURE_THRESHOLD)
                 if not a.success and a.ip_address == ip_address
-            ]
-            if len(recent_failures) >= 5:
+            )
+            if recent_failures >= IP_BLOCK_FAILURE_THRESHOLD:
                 self.block_ip(ip_address)
                 
-    def create_session(self, user: Dict, ip_address: str, user_agent: str) -> UserSession:
+    def create_session(self, user: UserRecord, ip_address: str, user_agent: str) -> UserSession:
         """사용자 세션 생성"""
         session_id = self.generate_session_id()
-        now = datetime.now()
+        now = self._now()
         expires_at = now + timedelta(hours=24)
         
         session = UserSession(
             session_id=session_id,
-            user_id=user["user_id"],
-            username=user["username"],
-            role=user["role"],
+            user_id=user.user_id,
+            username=user.username,
+            role=user.role,
             ip_address=ip_address,
             user_agent=user_agent,
             created_at=now,
@@ -427,21 +731,32 @@ class AuthEnhanced:
         if REDIS_AVAILABLE:
             redis_client.setex(
                 f"session:{session_id}",
-                int(timedelta(hours=24).total_seconds()),
-                session.model_dump_json()
+                SESSION_TTL_SECONDS,
+                orjson.dumps(session.__dict__)
             )
         else:
             self.sessions[session_id] = session
+            self.sessions_by_user[session.user_id].add(session_id)
             
         return session
         
+    def get_user_sessions(self, user_id: str) -> List[UserSession]:
+        """사용자의 메모리 세션 목록 (Redis 세션은 포함하지 않음)"""
+        session_ids = self.sessions_by_user.get(user_id, ())
+        return [self.sessions[session_id] for session_id in session_ids if session_id in self.sessions]
+        
     def get_session(self, session_id: str) -> Optional[UserSession]:
         """세션 조회"""
         try:
             if REDIS_AVAILABLE:
                 session_data = redis_client.get(f"session:{session_id}")
                 if session_data:
-                    return UserSession.model_validate_json(session_data)
+                    # 세션은 이 서버만 기록하므로 스키마 검증 없이 복원
+                    raw = orjson.loads(session_data)
+                    for field in SESSION_DATETIME_FIELDS:
+                        raw[field] = datetime.fromisoformat(raw[field])
+                    raw["role"] = UserRole(raw["role"])
+                    return UserSession.model_construct(**raw)
             else:
                 return self.sessions.get(session_id)
         except Exception as e:
@@ -449,101 +764,149 @@ class AuthEnhanced:
             
         return None
         
-    def update_session_activity(self, session_id: str):
-        """세션 활동 시간 업데이트"""
-        session = self.get_session(session_id)
-        if session:
-            session.last_activity = datetime.now()
+    async def update_session_activity(self, session_id: str):
+        """세션 활동 시간 업데이트 (최근 갱신한 세션은 건너뛰고, Redis 갱신은 모아서 전송)"""
+        if not self.claim_session_touch(session_id):
+            return
+        if not REDIS_AVAILABLE:
+            self.touch_sessions((session_id,))
+            return
             
-            if REDIS_AVAILABLE:
-                redis_client.setex(
-                    f"session:{session_id}",
-                    int(timedelta(hours=24).total_seconds()),
-                    session.model_dump_json()
-                )
-            else:
-                self.sessions[session_id] = session
+        self._pending_touches.add(session_id)
+        if self._touch_flush_handle is None:
+            self._touch_flush_handle = asyncio.get_running_loop().call_later(
+                SESSION_TOUCH_BATCH_SECONDS, self._flush_pending_touches
+            )
+            
+    def _flush_pending_touches(self):
+        """대기 중인 세션 갱신을 스레드에서 파이프라인으로 전송"""
+        self._touch_flush_handle = None
+        batch, self._pending_touches = self._pending_touches, set()
+        task = asyncio.create_task(asyncio.to_thread(self.touch_sessions, batch))
+        # 실행 중인 태스크가 GC되지 않도록 참조 유지
+        self._touch_flush_tasks.add(task)
+        task.add_done_callback(self._touch_flush_tasks.discard)
+            
+    def claim_session_touch(self, session_id: str) -> bool:
+        """세션 활동 갱신이 필요한지 확인하고 갱신 시각을 선점"""
+        now = time.time()
+        with self._session_touched_lock:
+            touched_at = self._session_touched.get(session_id)
+            if touched_at is not None and now - touched_at < SESSION_TOUCH_INTERVAL_SECONDS:
+                return False
+            self._session_touched[session_id] = now
+            self._session_touched.move_to_end(session_id)
+            if len(self._session_touched) > SESSION_TOUCH_CACHE_MAXSIZE:
+                self._session_touched.popitem(last=False)
+        return True
+        
+    def touch_sessions(self, session_ids: Iterable[str]):
+        """세션 last_activity 갱신 및 TTL 연장 (Redis는 한 번의 왕복)"""
+        now = self._now()
+        if REDIS_AVAILABLE:
+            try:
+                pipe = redis_client.pipeline(transaction=False)
+                args = [SESSION_TTL_SECONDS, now.isoformat()]
+                for session_id in session_ids:
+                    session_touch_script(keys=[f"session:{session_id}"], args=args, client=pipe)
+                pipe.execute()
+            except Exception as e:
+                logger.error(f"세션 활동 갱신 오류: {e}")
+        else:
+            for session_id in session_ids:
+                session = self.sessions.get(session_id)
+                if session:
+                    session.last_activity = now
                 
     def revoke_session(self, session_id: str):
         """세션 무효화"""
+        session = self.get_session(session_id)
+        if session:
+            self.invalidate_user_tokens(session.username)
+        with self._session_touched_lock:
+            self._session_touched.pop(session_id, None)
+            
         if REDIS_AVAILABLE:
             redis_client.delete(f"session:{session_id}")
         else:
-            self.sessions.pop(session_id, None)
+            session = self.sessions.pop(session_id, None)
+            if session:
+                user_session_ids = self.sessions_by_user.get(session.user_id)
+                if user_session_ids is not None:
+                    user_session_ids.discard(session_id)
+                    if not user_session_ids:
+                        del self.sessions_by_user[session.user_id]
             
-    def authenticate_user(self, username: str, password: str, 
-                         ip_address: str, user_agent: str) -> Optional[Dict]:
-        """사용자 인증"""
-        # IP 차단 확인
-        if self.is_ip_blocked(ip_address):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="IP address is blocked due to multiple failed attempts"
-            )
+    async def authenticate_user(self, username: str, password: str, 
+                         ip_address: str, user_agent: str) -> Optional[UserRecord]:
+        """사용자 인증 (IP 차단 조회와 bcrypt 검증을 동시에 수행)"""
+        # 이 워커가 이미 알고 있는 차단 IP는 bcrypt 없이 바로 거부
+        if ip_address in self.blocked_ips:
+            raise _EXC_IP_BLOCKED.with_traceback(None)
             
         user = self.users_db.get(username)
+        # 없는 사용자도 더미 해시로 같은 비용의 검증을 수행
+        password_hash = user.password if user else await self.get_dummy_password_hash()
+        ip_blocked, password_ok = await asyncio.gather(
+            self.is_ip_blocked_async(ip_address),
+            self.verify_password_async(password, password_hash)
+        )
+        
+        # IP 차단 확인
+        if ip_blocked:
+            raise _EXC_IP_BLOCKED.with_traceback(None)
+            
         if not user:
             self.record_login_attempt(username, ip_address, user_agent, False, "User not found")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid username or password"
-            )
+            raise _EXC_BAD_CREDENTIALS.with_traceback(None)
             
         # 사용자 상태 확인
-        if user["status"] != UserStatus.ACTIVE:
-            self.record_login_attempt(username, ip_address, user_agent, False, f"User status: {user['status']}")
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Account is {user['status']}"
-            )
+        if not user.status_active:
+            self.record_login_attempt(username, ip_address, user_agent, False, f"User status: {user.status}")
+            raise _account_status_exc(user.status).with_traceback(None)
             
         # 비밀번호 검증
-        if not self.verify_password(password, user["password"]):
-            user["failed_login_attempts"] += 1
+        if not password_ok:
+            user.failed_login_attempts += 1
             self.record_login_attempt(username, ip_address, user_agent, False, "Invalid password")
             
             # 5회 실패 시 계정 일시 정지
-            if user["failed_login_attempts"] >= 5:
-                user["status"] = UserStatus.SUSPENDED
+            if user.failed_login_attempts >= 5:
+                self.set_user_status(user, UserStatus.SUSPENDED)
                 logger.warning(f"계정 일시 정지: {username} (비밀번호 5회 실패)")
                 
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid username or password"
-            )
+            raise _EXC_BAD_CREDENTIALS.with_traceback(None)
             
         # 로그인 성공
-        user["failed_login_attempts"] = 0
-        user["login_count"] += 1
-        user["last_login"] = datetime.now()
+        user.failed_login_attempts = 0
+        user.login_count += 1
+        user.last_login = self._now()
         
         self.record_login_attempt(username, ip_address, user_agent, True)
         
         return user
         
-    def has_permission(self, user: Dict, permission: Permission) -> bool:
+    def has_permission(self, user: UserRecord, permission: Permission) -> bool:
         """사용자 권한 확인"""
-        user_permissions = set(user.get("permissions", []))
-        return permission in user_permissions
+        return (user.permissions_mask & permission.bit) != 0
         
     def require_permission(self, permission: Permission):
         """권한 요구 데코레이터"""
+        permission_denied = HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Permission '{permission}' required"
+        )
+        
         def decorator(func):
             @wraps(func)
             async def wrapper(*args, **kwargs):
                 # current_user를 kwargs에서 찾기
                 current_user = kwargs.get("current_user")
                 if not current_user:
-                    raise HTTPException(
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        detail="Authentication required"
-                    )
+                    raise _EXC_AUTH_REQUIRED.with_traceback(None)
                     
                 if not self.has_permission(current_user, permission):
-                    raise HTTPException(
-                        status_code=status.HTTP_403_FORBIDDEN,
-                        detail=f"Permission '{permission}' required"
-                    )
+                    raise permission_denied.with_traceback(None)
                     
                 return await func(*args, **kwargs)
             return wrapper
@@ -553,100 +916,95 @@ class AuthEnhanced:
 auth_enhanced = AuthEnhanced()
 
 def get_client_ip(request: Request) -> str:
-    """클라이언트 IP 주소 추출"""
-    forwarded = request.headers.get("X-Forwarded-For")
-    if forwarded:
-        return forwarded.split(",")[0].strip()
-    return request.client.host
+    """클라이언트 IP 주소 추출 (요청당 한 번만 파싱해 request.state에 보관)"""
+    client_ip = getattr(request.state, "client_ip", None)
+    if client_ip is None:
+        forwarded = request.headers.get("X-Forwarded-For")
+        client_ip = forwarded.partition(",")[0].strip() if forwarded else request.client.host
+        request.state.client_ip = client_ip
+    return client_ip
 
 def get_user_agent(request: Request) -> str:
-    """User-Agent 추출"""
-    return request.headers.get("User-Agent", "Unknown")
-
-def verify_access_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    """액세스 토큰 검증"""
-    try:
-        token = credentials.credentials
-        payload = auth_enhanced.verify_token(token)
-        
-        if payload.get("type") != "access":
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token type"
-            )
-            
-        username = payload.get("sub")
-        if not username:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token payload"
-            )
-            
-        return username
+    """User-Agent 추출 (요청당 한 번만 조회해 request.state에 보관)"""
+    user_agent = getattr(request.state, "user_agent", None)
+    if user_agent is None:
+        user_agent = request.headers.get("User-Agent", "Unknown")
+        request.state.user_agent = user_agent
+    return user_agent
+
+async def verify_access_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """액세스 토큰 검증 (서명/만료 오류는 verify_token에서 401로 변환)"""
+    payload = auth_enhanced.verify_token(credentials.credentials)
+    
+    if payload.get("type") != "access":
+        raise _EXC_INVALID_TOKEN_TYPE.with_traceback(None)
         
-    except jwt.PyJWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication token"
-        )
+    username = payload.get("sub")
+    if not username:
+        raise _EXC_INVALID_TOKEN_PAYLOAD.with_traceback(None)
+        
+    return username
 
-def get_current_user(
+async def get_current_user(
     username: str = Depends(verify_access_token),
     request: Request = None
 ):
     """현재 사용자 정보 가져오기"""
     user = auth_enhanced.users_db.get(username)
     if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
+        raise _EXC_USER_NOT_FOUND.with_traceback(None)
         
     # 사용자 상태 확인
-    if user["status"] != UserStatus.ACTIVE:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=f"Account is {user['status']}"
-        )
+    if not user.status_active:
+        raise _account_status_exc(user.status).with_traceback(None)
         
     # 세션 활동 시간 업데이트 (요청이 있을 때만)
     if request:
         session_id = request.headers.get("X-Session-ID")
         if session_id:
-            auth_enhanced.update_session_activity(session_id)
+            await auth_enhanced.update_session_activity(session_id)
             
     return user
 
+@lru_cache(maxsize=None)
 def require_permission(permission: Permission):
-    """권한 요구 의존성"""
-    def dependency(current_user: Dict = Depends(get_current_user)):
+    """권한 요구 의존성 (같은 권한은 같은 의존성 객체를 공유)"""
+    permission_denied = HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail=f"Permission '{permission}' required"
+    )
+    
+    async def dependency(current_user: UserRecord = Depends(get_current_user)):
         if not auth_enhanced.has_permission(current_user, permission):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Permission '{permission}' required"
-            )
+            raise permission_denied.with_traceback(None)
         return current_user
     return dependency
 
+@lru_cache(maxsize=None)
 def require_role(role: UserRole):
-    """역할 요구 의존성"""
-    def dependency(current_user: Dict = Depends(get_current_user)):
-        if current_user["role"] != role:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Role '{role}' required"
-            )
+    """역할 요구 의존성 (같은 역할은 같은 의존성 객체를 공유)"""
+    role_denied = HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail=f"Role '{role}' required"
+    )
+    
+    async def dependency(current_user: UserRecord = Depends(get_current_user)):
+        if current_user.role != role:
+            raise role_denied.with_traceback(None)
         return current_user
     return dependency
 
+@lru_cache(maxsize=None)
 def require_any_role(*roles: UserRole):
-    """여러 역할 중 하나 요구 의존성"""
-    def dependency(current_user: Dict = Depends(get_current_user)):
-        if current_user["role"] not in roles:
-            role_names = [role.value for role in roles]
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"One of roles {role_names} required"
-            )
+    """여러 역할 중 하나 요구 의존성 (같은 역할 조합은 같은 의존성 객체를 공유)"""
+    role_names = [role.value for role in roles]
+    role_denied = HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail=f"One of roles {role_names} required"
+    )
+    
+    async def dependency(current_user: UserRecord = Depends(get_current_user)):
+        if current_user.role not in roles:
+            raise role_denied.with_traceback(None)
         return current_user
     return dependency
\ No newline at end of file
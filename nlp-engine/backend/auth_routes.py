@@ -10,23 +10,103 @@
 @date 2025.07.07
 """
 
-from fastapi import APIRouter, HTTPException, Depends, status, Request, BackgroundTasks
-from fastapi.responses import JSONResponse
-from typing import List, Dict, Any, Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, status, Request, BackgroundTasks
+from fastapi.responses import ORJSONResponse, Response
+from typing import List, Dict, Any, FrozenSet, Optional
 from datetime import datetime, timedelta
 import logging
+from itertools import islice
+
+import msgspec
 
 from auth_enhanced import (
     auth_enhanced, UserCreate, UserUpdate, PasswordChange, PasswordReset,
     UserProfile, UserSession, UserRole, UserStatus, Permission,
-    get_current_user, get_client_ip, get_user_agent,
-    require_permission, require_role, require_any_role
+    UserRecord, get_current_user, get_client_ip, get_user_agent,
+    require_permission, require_role, require_any_role, permissions_from_mask,
+    ROLE_PERMISSIONS
 )
+from serialization import json_dumps
 
 logger = logging.getLogger(__name__)
 
-# API 라우터 생성
-router = APIRouter(prefix="/api/auth", tags=["Enhanced Authentication"])
+# API 라우터 생성 (응답은 orjson으로 직렬화)
+router = APIRouter(
+    prefix="/api/auth",
+    tags=["Enhanced Authentication"],
+    default_response_class=ORJSONResponse
+)
+
+# 사용자 레코드에서 UserProfile로 옮길 필드
+_PROFILE_FIELDS = tuple(UserProfile.model_fields)
+
+def _profile_from_user(user: UserRecord) -> UserProfile:
+    """사용자 레코드로 UserProfile 생성 (내부 데이터라 검증 생략)"""
+    return UserProfile.model_construct(**{field: getattr(user, field) for field in _PROFILE_FIELDS})
+
+# 응답에 노출되는 UserProfile 필드 (permissions_mask 등 exclude 필드 제외)
+_PROFILE_PUBLIC_FIELDS = tuple(
+    name for name, field in UserProfile.model_fields.items() if not field.exclude
+)
+
+def _profile_content(user: UserRecord) -> Dict[str, Any]:
+    """UserProfile 스키마와 같은 응답 dict (모델 생성/출력 검증 없이 orjson으로 바로 직렬화)"""
+    content = {field: getattr(user, field) for field in _PROFILE_PUBLIC_FIELDS}
+    content["permissions"] = list(permissions_from_mask(user.permissions_mask))
+    return content
+
+# 인증된 요청마다 호출되는 /me, /permissions 응답은 msgspec 구조체로 직렬화
+class UserProfileMsg(msgspec.Struct):
+    """UserProfile 응답 구조체 (필드는 UserProfile 출력과 동일)"""
+    user_id: str
+    username: str
+    email: str
+    full_name: Optional[str]
+    company: Optional[str]
+    department: Optional[str]
+    phone: Optional[str]
+    role: UserRole
+    status: UserStatus
+    created_at: datetime
+    updated_at: datetime
+    last_login: Optional[datetime]
+    login_count: int
+    failed_login_attempts: int
+    password_changed_at: Optional[datetime]
+    two_factor_enabled: bool
+    profile_image: Optional[str]
+    permissions: FrozenSet[Permission]
+
+class PermissionsMsg(msgspec.Struct, kw_only=True):
+    """현재 사용자 권한 응답 구조체"""
+    success: bool = True
+    user_id: str
+    username: str
+    role: UserRole
+    permissions: FrozenSet[Permission]
+
+_msgspec_encoder = msgspec.json.Encoder()
+
+def _msgspec_response(content: msgspec.Struct) -> Response:
+    return Response(content=_msgspec_encoder.encode(content), media_type="application/json")
+
+# 문서에는 UserProfile 스키마를 그대로 노출
+_PROFILE_RESPONSES = {200: {"model": UserProfile}}
+_PROFILE_LIST_RESPONSES = {200: {"model": List[UserProfile]}}
+
+# 역할 목록은 요청과 무관하므로 import 시 한 번만 직렬화
+_ROLES_BODY = json_dumps({
+    "success": True,
+    "roles": [
+        {
+            "role": role.value,
+            "name": role.value.replace("_", " ").title(),
+            "permissions": sorted(permission.value for permission in permissions),
+            "permission_count": len(permissions)
+        }
+        for role, permissions in ROLE_PERMISSIONS.items()
+    ]
+})
 
 # ==================== 인증 엔드포인트 ====================
 
@@ -42,10 +122,10 @@ async def login(
     
     try:
         # 사용자 인증
-        user = auth_enhanced.authenticate_user(username, password, ip_address, user_agent)
+        user = await auth_enhanced.authenticate_user(username, password, ip_address, user_agent)
         
         # 토큰 생성
-        token_data = {"sub": user["username"], "role": user["role"]}
+        token_data = {"sub": user.username, "role": user.role}
         access_token = auth_enhanced.create_access_token(token_data)
         refresh_token = auth_enhanced.create_refresh_token(token_data)
         
@@ -53,26 +133,7 @@ async def login(
         session = auth_enhanced.create_session(user, ip_address, user_agent)
         
         # 사용자 프로필 생성
-        user_profile = UserProfile(
-            user_id=user["user_id"],
-            username=user["username"],
-            email=user["email"],
-            full_name=user.get("full_name"),
-            company=user.get("company"),
-            department=user.get("department"),
-            phone=user.get("phone"),
-            role=user["role"],
-            status=user["status"],
-            permissions=set(user["permissions"]),
-            created_at=user["created_at"],
-            updated_at=user["updated_at"],
-            last_login=user.get("last_login"),
-            login_count=user["login_count"],
-            failed_login_attempts=user["failed_login_attempts"],
-            password_changed_at=user.get("password_changed_at"),
-            two_factor_enabled=user["two_factor_enabled"],
-            profile_image=user.get("profile_image")
-        )
+        user_profile = _profile_from_user(user)
         
         logger.info(f"사용자 로그인 성공: {username} from {ip_address}")
         
@@ -117,14 +178,14 @@ async def refresh_token(refresh_token: str):
             )
             
         user = auth_enhanced.users_db.get(username)
-        if not user or user["status"] != UserStatus.ACTIVE:
+        if not user or not user.status_active:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="User not found or inactive"
             )
             
         # 새 액세스 토큰 생성
-        token_data = {"sub": user["username"], "role": user["role"]}
+        token_data = {"sub": user.username, "role": user.role}
         new_access_token = auth_enhanced.create_access_token(token_data)
         
         return {
@@ -146,7 +207,7 @@ async def refresh_token(refresh_token: str):
 @router.post("/logout")
 async def logout(
     request: Request,
-    current_user: Dict = Depends(get_current_user)
+    current_user: UserRecord = Depends(get_current_user)
 ):
     """로그아웃"""
     try:
@@ -154,7 +215,7 @@ async def logout(
         if session_id:
             auth_enhanced.revoke_session(session_id)
             
-        logger.info(f"사용자 로그아웃: {current_user['username']}")
+        logger.info(f"사용자 로그아웃: {current_user.username}")
         
         return {
             "success": True,
@@ -168,55 +229,50 @@ async def logout(
             "message": "Logged out (with errors)"
         }
 
-@router.get("/me", response_model=UserProfile)
-async def get_current_user_profile(current_user: Dict = Depends(get_current_user)):
+@router.get("/me", responses=_PROFILE_RESPONSES)
+async def get_current_user_profile(current_user: UserRecord = Depends(get_current_user)):
     """현재 사용자 프로필 조회"""
-    return UserProfile(
-        user_id=current_user["user_id"],
-        username=current_user["username"],
-        email=current_user["email"],
-        full_name=current_user.get("full_name"),
-        company=current_user.get("company"),
-        department=current_user.get("department"),
-        phone=current_user.get("phone"),
-        role=current_user["role"],
-        status=current_user["status"],
-        permissions=set(current_user["permissions"]),
-        created_at=current_user["created_at"],
-        updated_at=current_user["updated_at"],
-        last_login=current_user.get("last_login"),
-        login_count=current_user["login_count"],
-        failed_login_attempts=current_user["failed_login_attempts"],
-        password_changed_at=current_user.get("password_changed_at"),
-        two_factor_enabled=current_user["two_factor_enabled"],
-        profile_image=current_user.get("profile_image")
-    )
+    return _msgspec_response(UserProfileMsg(
+        **{field: getattr(current_user, field) for field in _PROFILE_PUBLIC_FIELDS},
+        permissions=permissions_from_mask(current_user.permissions_mask)
+    ))
 
 @router.put("/me")
 async def update_current_user_profile(
     user_update: UserUpdate,
-    current_user: Dict = Depends(get_current_user)
+    current_user: UserRecord = Depends(get_current_user)
 ):
     """현재 사용자 프로필 수정"""
     try:
+        if user_update.email is not None and auth_enhanced.is_email_taken(user_update.email, current_user):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email already exists"
+            )
+            
         # 업데이트 가능한 필드만 수정
         updateable_fields = ["email", "full_name", "company", "department", "phone"]
         
         for field in updateable_fields:
             value = getattr(user_update, field, None)
             if value is not None:
-                current_user[field] = value
+                if field == "email":
+                    auth_enhanced.set_user_email(current_user, value)
+                else:
+                    setattr(current_user, field, value)
                 
-        current_user["updated_at"] = datetime.now()
+        current_user.updated_at = datetime.now()
         
-        logger.info(f"사용자 프로필 수정: {current_user['username']}")
+        logger.info(f"사용자 프로필 수정: {current_user.username}")
         
         return {
             "success": True,
             "message": "Profile updated successfully",
-            "user": UserProfile(**current_user).model_dump(exclude={"permissions"})
+            "user": _profile_from_user(current_user).model_dump(exclude={"permissions"})
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"프로필 수정 오류: {e}")
         raise HTTPException(
@@ -227,24 +283,25 @@ async def update_current_user_profile(
 @router.post("/change-password")
 async def change_password(
     password_change: PasswordChange,
-    current_user: Dict = Depends(get_current_user)
+    current_user: UserRecord = Depends(get_current_user)
 ):
     """비밀번호 변경"""
     try:
         # 현재 비밀번호 확인
-        if not auth_enhanced.verify_password(password_change.current_password, current_user["password"]):
+        if not await auth_enhanced.verify_password_async(password_change.current_password, current_user.password):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Current password is incorrect"
             )
             
         # 새 비밀번호 해싱 및 저장
-        new_hashed_password = auth_enhanced.hash_password(password_change.new_password)
-        current_user["password"] = new_hashed_password
-        current_user["password_changed_at"] = datetime.now()
-        current_user["updated_at"] = datetime.now()
+        new_hashed_password = await auth_enhanced.hash_password_async(password_change.new_password)
+        current_user.password = new_hashed_password
+        now = datetime.now()
+        current_user.password_changed_at = now
+        current_user.updated_at = now
         
-        logger.info(f"비밀번호 변경: {current_user['username']}")
+        logger.info(f"비밀번호 변경: {current_user.username}")
         
         return {
             "success": True,
@@ -265,7 +322,7 @@ async def change_password(
 @router.post("/users", response_model=UserProfile)
 async def create_user(
     user_create: UserCreate,
-    current_user: Dict = Depends(require_permission(Permission.USER_CREATE))
+    current_user: UserRecord = Depends(require_permission(Permission.USER_CREATE))
 ):
     """사용자 생성 (관리자 권한 필요)"""
     try:
@@ -277,18 +334,17 @@ async def create_user(
             )
             
         # 이메일 중복 확인
-        for user in auth_enhanced.users_db.values():
-            if user["email"] == user_create.email:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Email already exists"
-                )
+        if auth_enhanced.is_email_taken(user_create.email):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email already exists"
+            )
                 
         # 사용자 생성
         user_data = {
             "username": user_create.username,
             "email": user_create.email,
-            "password": user_create.password,
+            "password_hash": await auth_enhanced.hash_password_async(user_create.password),
             "full_name": user_create.full_name,
             "company": user_create.company,
             "department": user_create.department,
@@ -301,9 +357,9 @@ async def create_user(
         # 생성된 사용자 반환
         created_user = auth_enhanced.users_db[user_create.username]
         
-        logger.info(f"사용자 생성: {user_create.username} by {current_user['username']}")
+        logger.info(f"사용자 생성: {user_create.username} by {current_user.username}")
         
-        return UserProfile(**created_user)
+        return _profile_from_user(created_user)
         
     except HTTPException:
         raise
@@ -314,33 +370,30 @@ async def create_user(
             detail="User creation failed"
         )
 
-@router.get("/users", response_model=List[UserProfile])
+@router.get("/users", responses=_PROFILE_LIST_RESPONSES)
 async def get_users(
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
     role: Optional[UserRole] = None,
     status: Optional[UserStatus] = None,
-    current_user: Dict = Depends(require_permission(Permission.USER_READ))
+    current_user: UserRecord = Depends(require_permission(Permission.USER_READ))
 ):
     """사용자 목록 조회"""
     try:
-        users = list(auth_enhanced.users_db.values())
-        
-        # 필터링
-        if role:
-            users = [u for u in users if u["role"] == role]
-        if status:
-            users = [u for u in users if u["status"] == status]
+        # 필터링 (역할/상태 인덱스에서 후보만 순회)
+        if role and status:
+            by_role = auth_enhanced.users_by_role.get(role, {})
+            by_status = auth_enhanced.users_by_status.get(status, {})
+            users = (user for name, user in by_role.items() if name in by_status)
+        elif role:
+            users = iter(auth_enhanced.users_by_role.get(role, {}).values())
+        elif status:
+            users = iter(auth_enhanced.users_by_status.get(status, {}).values())
+        else:
+            users = iter(auth_enhanced.users_db.values())
             
-        # 페이징
-        users = users[skip:skip + limit]
-        
-        # UserProfile로 변환
-        user_profiles = []
-        for user in users:
-            user_profiles.append(UserProfile(**user))
-            
-        return user_profiles
+        # 페이징 (앞쪽 skip개는 리스트로 만들지 않고 건너뜀)
+        return ORJSONResponse([_profile_content(user) for user in islice(users, skip, skip + limit)])
         
     except Exception as e:
         logger.error(f"사용자 목록 조회 오류: {e}")
@@ -349,10 +402,10 @@ async def get_users(
             detail="Failed to retrieve users"
         )
 
-@router.get("/users/{username}", response_model=UserProfile)
+@router.get("/users/{username}", responses=_PROFILE_RESPONSES)
 async def get_user(
     username: str,
-    current_user: Dict = Depends(require_permission(Permission.USER_READ))
+    current_user: UserRecord = Depends(require_permission(Permission.USER_READ))
 ):
     """특정 사용자 조회"""
     user = auth_enhanced.users_db.get(username)
@@ -362,13 +415,13 @@ async def get_user(
             detail="User not found"
         )
         
-    return UserProfile(**user)
+    return ORJSONResponse(_profile_content(user))
 
 @router.put("/users/{username}")
 async def update_user(
     username: str,
     user_update: UserUpdate,
-    current_user: Dict = Depends(require_permission(Permission.USER_UPDATE))
+    current_user: UserRecord = Depends(require_permission(Permission.USER_UPDATE))
 ):
     """사용자 정보 수정 (관리자 권한 필요)"""
     try:
@@ -379,27 +432,36 @@ async def update_user(
                 detail="User not found"
             )
             
+        if user_update.email is not None and auth_enhanced.is_email_taken(user_update.email, user):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email already exists"
+            )
+            
         # 수정 가능한 필드 업데이트
         update_fields = ["email", "full_name", "company", "department", "phone", "role", "status"]
         
         for field in update_fields:
             value = getattr(user_update, field, None)
             if value is not None:
-                user[field] = value
-                
-                # 역할 변경 시 권한 업데이트
-                if field == "role":
-                    from auth_enhanced import ROLE_PERMISSIONS
-                    user["permissions"] = list(ROLE_PERMISSIONS.get(value, set()))
+                if field == "email":
+                    auth_enhanced.set_user_email(user, value)
+                elif field == "status":
+                    auth_enhanced.set_user_status(user, value)
+                elif field == "role":
+                    # 역할 변경 시 권한도 함께 갱신
+                    auth_enhanced.set_user_role(user, value)
+                else:
+                    setattr(user, field, value)
                     
-        user["updated_at"] = datetime.now()
+        user.updated_at = datetime.now()
         
-        logger.info(f"사용자 정보 수정: {username} by {current_user['username']}")
+        logger.info(f"사용자 정보 수정: {username} by {current_user.username}")
         
         return {
             "success": True,
             "message": "User updated successfully",
-            "user": UserProfile(**user).model_dump(exclude={"permissions"})
+            "user": _profile_from_user(user).model_dump(exclude={"permissions"})
         }
         
     except HTTPException:
@@ -414,7 +476,7 @@ async def update_user(
 @router.delete("/users/{username}")
 async def delete_user(
     username: str,
-    current_user: Dict = Depends(require_permission(Permission.USER_DELETE))
+    current_user: UserRecord = Depends(require_permission(Permission.USER_DELETE))
 ):
     """사용자 삭제 (관리자 권한 필요)"""
     try:
@@ -425,17 +487,17 @@ async def delete_user(
             )
             
         # 자기 자신은 삭제할 수 없음
-        if username == current_user["username"]:
+        if username == current_user.username:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Cannot delete yourself"
             )
             
         # 사용자 삭제 (실제로는 상태를 DELETED로 변경)
-        auth_enhanced.users_db[username]["status"] = UserStatus.DELETED
-        auth_enhanced.users_db[username]["updated_at"] = datetime.now()
+        auth_enhanced.set_user_status(auth_enhanced.users_db[username], UserStatus.DELETED)
+        auth_enhanced.users_db[username].updated_at = datetime.now()
         
-        logger.info(f"사용자 삭제: {username} by {current_user['username']}")
+        logger.info(f"사용자 삭제: {username} by {current_user.username}")
         
         return {
             "success": True,
@@ -455,18 +517,15 @@ async def delete_user(
 
 @router.get("/sessions")
 async def get_user_sessions(
-    current_user: Dict = Depends(get_current_user)
+    current_user: UserRecord = Depends(get_current_user)
 ):
     """현재 사용자의 세션 목록"""
     try:
-        user_sessions = []
+        # 사용자별 세션 인덱스에서 본인 세션만 조회
+        user_sessions = [
+            session.model_dump() for session in auth_enhanced.get_user_sessions(current_user.user_id)
+        ]
         
-        # Redis 또는 메모리에서 세션 조회
-        if hasattr(auth_enhanced, 'sessions'):
-            for session in auth_enhanced.sessions.values():
-                if session.user_id == current_user["user_id"]:
-                    user_sessions.append(session.model_dump())
-                    
         return {
             "success": True,
             "sessions": user_sessions
@@ -482,7 +541,7 @@ async def get_user_sessions(
 @router.delete("/sessions/{session_id}")
 async def revoke_session(
     session_id: str,
-    current_user: Dict = Depends(get_current_user)
+    current_user: UserRecord = Depends(get_current_user)
 ):
     """특정 세션 무효화"""
     try:
@@ -494,7 +553,7 @@ async def revoke_session(
             )
             
         # 본인의 세션만 무효화 가능 (관리자는 모든 세션 가능)
-        if session.user_id != current_user["user_id"] and current_user["role"] not in [UserRole.ADMIN, UserRole.SUPER_ADMIN]:
+        if session.user_id != current_user.user_id and current_user.role not in [UserRole.ADMIN, UserRole.SUPER_ADMIN]:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Cannot revoke other user's session"
@@ -519,54 +578,42 @@ async def revoke_session(
 # ==================== 권한 관리 엔드포인트 ====================
 
 @router.get("/permissions")
-async def get_permissions(current_user: Dict = Depends(get_current_user)):
+async def get_permissions(current_user: UserRecord = Depends(get_current_user)):
     """현재 사용자 권한 조회"""
-    return {
-        "success": True,
-        "user_id": current_user["user_id"],
-        "username": current_user["username"],
-        "role": current_user["role"],
-        "permissions": current_user["permissions"]
-    }
+    return _msgspec_response(PermissionsMsg(
+        user_id=current_user.user_id,
+        username=current_user.username,
+        role=current_user.role,
+        permissions=permissions_from_mask(current_user.permissions_mask)
+    ))
 
 @router.get("/roles")
-async def get_roles(current_user: Dict = Depends(require_permission(Permission.USER_READ))):
+async def get_roles(current_user: UserRecord = Depends(require_permission(Permission.USER_READ))):
     """역할 목록 조회"""
-    from auth_enhanced import ROLE_PERMISSIONS
-    
-    roles_info = []
-    for role, permissions in ROLE_PERMISSIONS.items():
-        roles_info.append({
-            "role": role.value,
-            "name": role.value.replace("_", " ").title(),
-            "permissions": list(permissions),
-            "permission_count": len(permissions)
-        })
-        
-    return {
-        "success": True,
-        "roles": roles_info
-    }
+    return Response(content=_ROLES_BODY, media_type="application/json")
 
 # ==================== 보안 모니터링 엔드포인트 ====================
 
 @router.get("/security/stats")
 async def get_security_stats(
-    current_user: Dict = Depends(require_permission(Permission.SYSTEM_MONITOR))
+    current_user: UserRecord = Depends(require_permission(Permission.SYSTEM_MONITOR))
 ):
     """보안 통계 조회"""
     try:
         total_users = len(auth_enhanced.users_db)
-        active_users = len([u for u in auth_enhanced.users_db.values() if u["status"] == UserStatus.ACTIVE])
-        blocked_ips = len(auth_enhanced.blocked_ips)
+        # 상태별 인덱스 크기로 계산 (전체 사용자 순회 없음)
+        active_users = len(auth_enhanced.users_by_status.get(UserStatus.ACTIVE, {}))
+        suspended_users = len(auth_enhanced.users_by_status.get(UserStatus.SUSPENDED, {}))
+        blocked_ips = auth_enhanced.count_blocked_ips()
         
         # 최근 로그인 시도 통계
         recent_attempts = 0
         failed_attempts = 0
+        cutoff = datetime.now() - timedelta(hours=24)
         
         for attempts in auth_enhanced.login_attempts.values():
-            for attempt in attempts[-10:]:  # 최근 10개
-                if attempt.timestamp > datetime.now() - timedelta(hours=24):
+            for attempt in attempts:  # 사용자별 최근 10개만 보관됨
+                if attempt.timestamp > cutoff:
                     recent_attempts += 1
                     if not attempt.success:
                         failed_attempts += 1
@@ -576,11 +623,11 @@ async def get_security_stats(
             "statistics": {
                 "total_users": total_users,
                 "active_users": active_users,
-                "suspended_users": len([u for u in auth_enhanced.users_db.values() if u["status"] == UserStatus.SUSPENDED]),
+                "suspended_users": suspended_users,
                 "blocked_ips": blocked_ips,
                 "recent_login_attempts_24h": recent_attempts,
                 "failed_attempts_24h": failed_attempts,
-                "active_sessions": len(getattr(auth_enhanced, 'sessions', {}))
+                "active_sessions": len(auth_enhanced.sessions)
             }
         }
         
@@ -594,12 +641,12 @@ async def get_security_stats(
 @router.get("/security/login-history/{username}")
 async def get_login_history(
     username: str,
-    current_user: Dict = Depends(require_permission(Permission.USER_READ))
+    current_user: UserRecord = Depends(require_permission(Permission.USER_READ))
 ):
     """사용자 로그인 기록 조회"""
     try:
         # 본인이거나 관리자만 조회 가능
-        if username != current_user["username"] and current_user["role"] not in [UserRole.ADMIN, UserRole.SUPER_ADMIN]:
+        if username != current_user.username and current_user.role not in [UserRole.ADMIN, UserRole.SUPER_ADMIN]:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Cannot view other user's login history"
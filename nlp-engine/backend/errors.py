@@ -0,0 +1,10 @@
+"""
+VIBA AI 백엔드 도메인 예외
+앱 미들웨어(main.EXC_MAP)가 HTTP 상태 코드로 변환하며, 메시지는 그대로 응답 detail이 됨
+"""
+
+class InvalidRequestError(ValueError):
+    """클라이언트 요청 값이 잘못됨 (400)"""
+
+class NotFoundError(LookupError):
+    """요청한 리소스가 없음 (404)"""
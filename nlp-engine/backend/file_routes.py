@@ -6,7 +6,7 @@ import logging
 from datetime import datetime
 
 from file_processor import file_processor, bim_analyzer, FileType, ProcessingStatus
-from auth import get_current_user
+from auth import ADMIN_USER_IDS, User, get_current_user
 
 logger = logging.getLogger(__name__)
 
@@ -49,7 +49,7 @@ async def upload_file(
     project_id: str,
     background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
-    current_user: dict = Depends(get_current_user)
+    current_user: User = Depends(get_current_user)
 ):
     """파일 업로드"""
     try:
@@ -61,7 +61,7 @@ async def upload_file(
             file_content=file.file,
             filename=file.filename,
             project_id=project_id,
-            user_id=current_user["user_id"]
+            user_id=current_user.user_id
         )
         
         # 백그라운드에서 파일 처리
@@ -93,7 +93,7 @@ async def upload_multiple_files(
     project_id: str,
     background_tasks: BackgroundTasks,
     files: List[UploadFile] = File(...),
-    current_user: dict = Depends(get_current_user)
+    current_user: User = Depends(get_current_user)
 ):
     """여러 파일 동시 업로드"""
     if len(files) > 10:
@@ -114,7 +114,7 @@ async def upload_multiple_files(
                 file_content=file.file,
                 filename=file.filename,
                 project_id=project_id,
-                user_id=current_user["user_id"]
+                user_id=current_user.user_id
             )
             
             # 백그라운드에서 파일 처리
@@ -148,14 +148,14 @@ async def upload_multiple_files(
 @router.get("/status/{file_id}")
 async def get_file_status(
     file_id: str,
-    current_user: dict = Depends(get_current_user)
+    current_user: User = Depends(get_current_user)
 ):
     """파일 처리 상태 조회"""
     try:
         status = await file_processor.get_processing_status(file_id)
         
         # 권한 확인
-        if status["user_id"] != current_user["user_id"] and current_user.get("role") != "admin":
+        if status["user_id"] != current_user.user_id and current_user.user_id not in ADMIN_USER_IDS:
             raise HTTPException(status_code=403, detail="파일에 접근할 권한이 없습니다.")
         
         return {
@@ -178,15 +178,15 @@ async def get_file_status(
 @router.get("/project/{project_id}")
 async def get_project_files(
     project_id: str,
-    current_user: dict = Depends(get_current_user)
+    current_user: User = Depends(get_current_user)
 ):
     """프로젝트의 모든 파일 조회"""
     try:
         files = await file_processor.get_project_files(project_id)
         
         # 사용자별 필터링 (관리자가 아닌 경우)
-        if current_user.get("role") != "admin":
-            files = [f for f in files if f["user_id"] == current_user["user_id"]]
+        if current_user.user_id not in ADMIN_USER_IDS:
+            files = [f for f in files if f["user_id"] == current_user.user_id]
         
         return {
             "success": True,
@@ -202,11 +202,11 @@ async def get_project_files(
 @router.delete("/{file_id}")
 async def delete_file(
     file_id: str,
-    current_user: dict = Depends(get_current_user)
+    current_user: User = Depends(get_current_user)
 ):
     """파일 삭제"""
     try:
-        result = await file_processor.delete_file(file_id, current_user["user_id"])
+        result = await file_processor.delete_file(file_id, current_user.user_id)
         
         return {
             "success": True,
@@ -225,14 +225,14 @@ async def delete_file(
 @router.get("/download/{file_id}")
 async def download_file(
     file_id: str,
-    current_user: dict = Depends(get_current_user)
+    current_user: User = Depends(get_current_user)
 ):
     """파일 다운로드"""
     try:
         file_metadata = await file_processor.get_processing_status(file_id)
         
         # 권한 확인
-        if file_metadata["user_id"] != current_user["user_id"] and current_user.get("role") != "admin":
+        if file_metadata["user_id"] != current_user.user_id and current_user.user_id not in ADMIN_USER_IDS:
             raise HTTPException(status_code=403, detail="파일에 접근할 권한이 없습니다.")
         
         file_path = file_metadata["upload_path"]
@@ -258,7 +258,7 @@ async def download_file(
 async def analyze_bim_file(
     file_id: str,
     background_tasks: BackgroundTasks,
-    current_user: dict = Depends(get_current_user)
+    current_user: User = Depends(get_current_user)
 ):
     """BIM 파일 상세 분석"""
     try:
@@ -266,7 +266,7 @@ async def analyze_bim_file(
         file_metadata = await file_processor.get_processing_status(file_id)
         
         # 권한 확인
-        if file_metadata["user_id"] != current_user["user_id"] and current_user.get("role") != "admin":
+        if file_metadata["user_id"] != current_user.user_id and current_user.user_id not in ADMIN_USER_IDS:
             raise HTTPException(status_code=403, detail="파일에 접근할 권한이 없습니다.")
         
         # BIM 파일인지 확인
@@ -301,7 +301,7 @@ async def analyze_bim_file(
         raise HTTPException(status_code=500, detail="BIM 분석 중 오류가 발생했습니다.")
 
 @router.get("/stats")
-async def get_file_statistics(current_user: dict = Depends(get_current_user)):
+async def get_file_statistics(current_user: User = Depends(get_current_user)):
     """파일 통계 정보"""
     try:
         stats = file_processor.get_file_stats()
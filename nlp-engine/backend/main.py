@@ -10,10 +10,10 @@ VIBA AI FastAPI 백엔드 서버
 @date 2025.07.06
 """
 
-from fastapi import FastAPI, HTTPException, Depends, status, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Depends, Request, status, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 import uvicorn
@@ -26,15 +26,35 @@ import hashlib
 import os
 import json
 
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+try:
+    import httptools
+    HTTPTOOLS_AVAILABLE = True
+except ImportError:
+    HTTPTOOLS_AVAILABLE = False
+
 # AI 에이전트 관련 임포트
 from ai_routes import router as ai_router
+from ai_agent_service import ai_service
 from file_routes import router as file_router
 from auth_routes import router as auth_router
 from websocket_manager import manager
 from file_processor import file_processor
+from auth import flush_last_seen_worker
+from auth_enhanced import auth_enhanced
+from errors import InvalidRequestError, NotFoundError
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
+# LogRecord마다 수집하는 스레드/프로세스 정보 생략
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
 logger = logging.getLogger(__name__)
 
 # FastAPI 앱 초기화
@@ -46,7 +66,26 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
-# CORS 설정
+# 라우트에서 처리되지 않은 도메인 예외 → HTTP 상태 코드 매핑
+# (pydantic ValidationError 등 일반 ValueError/KeyError는 내부 오류로 기록하고 500)
+EXC_MAP = {
+    InvalidRequestError: 400,
+    NotFoundError: 404,
+}
+
+@app.middleware("http")
+async def error_mw(request: Request, call_next):
+    """예외를 EXC_MAP의 상태 코드로 변환 (매핑되지 않은 예외는 500)"""
+    try:
+        return await call_next(request)
+    except Exception as e:
+        for exc_type in type(e).__mro__:
+            if exc_type in EXC_MAP:
+                return ORJSONResponse({"detail": str(e)}, status_code=EXC_MAP[exc_type])
+        logger.exception("예상치 못한 오류: %s", e)
+        return ORJSONResponse({"detail": "내부 서버 오류가 발생했습니다"}, status_code=500)
+
+# CORS 설정 (오류 응답에도 CORS 헤더가 붙도록 오류 미들웨어보다 바깥에 등록)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # 프로덕션에서는 구체적인 도메인으로 제한
@@ -60,6 +99,21 @@ app.include_router(auth_router)  # 강화된 인증 라우터
 app.include_router(ai_router)
 app.include_router(file_router)
 
+# WebSocket 서버 설정: C 가속 마스킹을 쓰는 websockets 구현 사용,
+# 작은 제어 메시지마다 zlib 압축이 돌지 않도록 per-message deflate 비활성화
+UVICORN_WS_OPTIONS = {
+    "ws": "websockets",
+    "ws_per_message_deflate": False,
+    "ws_max_size": 2 ** 20,
+}
+
+# 이벤트 루프/HTTP 파서: uvicorn[standard]에 포함된 uvloop, httptools 사용 (Windows 등 미설치 환경은 기본 구현)
+UVICORN_SERVER_OPTIONS = {
+    "loop": "uvloop" if UVLOOP_AVAILABLE else "asyncio",
+    "http": "httptools" if HTTPTOOLS_AVAILABLE else "h11",
+    **UVICORN_WS_OPTIONS,
+}
+
 # 보안 설정
 security = HTTPBearer()
 SECRET_KEY = os.getenv("VIBA_SECRET_KEY", "viba-ai-secret-key-2025")
@@ -506,14 +560,30 @@ async def startup_event():
     """서버 시작 시 실행"""
     logger.info("VIBA AI 서버 시작...")
     
+    # 기본 사용자 생성 (bcrypt 해싱은 병렬 처리)
+    await auth_enhanced.ensure_default_users()
+    
+    # AI 캐시용 Redis 연결 확인 (실패 시 메모리 캐시 사용)
+    await ai_service.check_redis()
+    
     # 파일 처리 워커 시작
     asyncio.create_task(file_processor.start_processing_worker())
     logger.info("파일 처리 워커 시작됨")
+    
+    # AI 요청 배치 워커 시작
+    asyncio.create_task(ai_service.start_batch_worker())
+    logger.info("AI 요청 배치 워커 시작됨")
+    
+    # 사용자 마지막 활동 시각 반영 워커 시작
+    asyncio.create_task(flush_last_seen_worker())
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """서버 종료 시 실행"""
     logger.info("VIBA AI 서버 종료...")
+    
+    # OpenAI 연결 풀 정리
+    await ai_service.close()
 
 if __name__ == "__main__":
     print("🚀 VIBA AI FastAPI 서버 시작")
@@ -525,5 +595,6 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=True,
-        log_level="info"
+        log_level="info",
+        **UVICORN_SERVER_OPTIONS
     )
\ No newline at end of file
@@ -0,0 +1,46 @@
+"""
+JSON 직렬화 헬퍼
+==============
+
+WebSocket 등 메시지 처리 경로에서 사용하는 orjson 기반 JSON 변환 함수
+"""
+
+import json
+from typing import Any, Union
+
+import orjson
+
+try:
+    import simdjson
+    SIMDJSON_AVAILABLE = True
+except ImportError:
+    SIMDJSON_AVAILABLE = False
+
+# AgentType 같은 str 하위 타입 키를 허용
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+# 이 크기(bytes)를 넘는 메시지만 simdjson으로 파싱 (작은 메시지는 orjson이 더 빠름)
+SIMDJSON_MIN_SIZE = 4096
+
+# 파서는 내부 버퍼를 재사용하도록 하나만 유지 (이벤트 루프 단일 스레드에서만 사용)
+_simdjson_parser = simdjson.Parser() if SIMDJSON_AVAILABLE else None
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """JSON 파싱 (orjson이 거부하는 NaN 등 비표준 입력은 표준 json으로 재시도)"""
+    if _simdjson_parser is not None and len(data) > SIMDJSON_MIN_SIZE:
+        try:
+            return _simdjson_parser.parse(data.encode() if isinstance(data, str) else data, recursive=True)
+        except ValueError:
+            pass
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        return json.loads(data)
+
+def json_dumps(obj: Any) -> bytes:
+    """JSON 직렬화 (UTF-8 bytes 반환, datetime 등은 orjson 기본 변환, 그 외는 str)"""
+    return orjson.dumps(obj, default=str, option=ORJSON_OPTIONS)
+
+def json_dumps_str(obj: Any) -> str:
+    """JSON 직렬화 (텍스트 프레임 전송용 str 반환)"""
+    return json_dumps(obj).decode()
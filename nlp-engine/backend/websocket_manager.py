@@ -1,11 +1,12 @@
 import asyncio
-import json
 import logging
 from typing import Dict, List, Optional, Set
 from fastapi import WebSocket, WebSocketDisconnect
 from datetime import datetime
 import uuid
 
+from serialization import json_dumps_str
+
 logger = logging.getLogger(__name__)
 
 class ConnectionManager:
@@ -34,7 +35,7 @@ class ConnectionManager:
             self.user_connections[user_id] = set()
         self.user_connections[user_id].add(connection_id)
         
-        logger.info(f"User {user_id} connected with connection {connection_id}")
+        logger.info("User %s connected with connection %s", user_id, connection_id)
         
         # 연결 확인 메시지 전송
         await self.send_personal_message({
@@ -64,7 +65,7 @@ class ConnectionManager:
         if connection_id in self.ai_agent_sessions:
             del self.ai_agent_sessions[connection_id]
             
-        logger.info(f"Connection {connection_id} disconnected")
+        logger.info("Connection %s disconnected", connection_id)
         
     async def join_project(self, connection_id: str, project_id: str):
         """프로젝트 채널 참여"""
@@ -94,9 +95,10 @@ class ConnectionManager:
         if connection_id in self.active_connections:
             websocket = self.active_connections[connection_id]
             try:
-                await websocket.send_text(json.dumps(message))
+                # 브라우저 클라이언트가 JSON.parse로 읽으므로 텍스트 프레임 유지
+                await websocket.send_text(json_dumps_str(message))
             except Exception as e:
-                logger.error(f"Error sending message to {connection_id}: {e}")
+                logger.error("Error sending message to %s: %s", connection_id, e)
                 self.disconnect(connection_id)
                 
     async def send_to_user(self, message: dict, user_id: str):
@@ -253,40 +255,53 @@ class WebSocketHandler:
     
     def __init__(self, connection_manager: ConnectionManager):
         self.manager = connection_manager
+        # 메시지 타입 → 처리 메서드 (if/elif 비교 대신 dict 조회 한 번으로 분기)
+        self._handlers = {
+            "ping": self.handle_ping,
+            "join_project": self.handle_join_project,
+            "leave_project": self.handle_leave_project,
+            "start_ai_session": self.handle_start_ai_session,
+            "ai_message": self.handle_ai_message,
+            "end_ai_session": self.handle_end_ai_session,
+            "project_update": self.handle_project_update
+        }
         
     async def handle_message(self, websocket: WebSocket, connection_id: str, message_data: dict):
         """메시지 처리"""
         message_type = message_data.get("type")
         
         try:
-            if message_type == "ping":
-                await self.handle_ping(connection_id)
-            elif message_type == "join_project":
-                await self.handle_join_project(connection_id, message_data)
-            elif message_type == "leave_project":
-                await self.handle_leave_project(connection_id, message_data)
-            elif message_type == "start_ai_session":
-                await self.handle_start_ai_session(connection_id, message_data)
-            elif message_type == "ai_message":
-                await self.handle_ai_message(connection_id, message_data)
-            elif message_type == "end_ai_session":
-                await self.handle_end_ai_session(connection_id)
-            elif message_type == "project_update":
-                await self.handle_project_update(connection_id, message_data)
+            handler = self._handlers.get(message_type)
+            if handler is not None:
+                await handler(connection_id, message_data)
             else:
-                await self.manager.send_personal_message({
-                    "type": "error",
-                    "message": f"Unknown message type: {message_type}"
-                }, connection_id)
+                await self.handle_unknown(connection_id, message_type)
                 
         except Exception as e:
-            logger.error(f"Error handling message: {e}")
+            logger.error("Error handling message: %s", e)
             await self.manager.send_personal_message({
                 "type": "error",
                 "message": "메시지 처리 중 오류가 발생했습니다."
             }, connection_id)
             
-    async def handle_ping(self, connection_id: str):
+    async def handle_batch(self, websocket: WebSocket, connection_id: str, messages: list):
+        """메시지 묶음 처리 (수신 순서 유지, 같은 묶음의 ping은 pong 1회로 응답)"""
+        ponged = False
+        for message_data in messages:
+            if message_data.get("type") == "ping":
+                if ponged:
+                    continue
+                ponged = True
+            await self.handle_message(websocket, connection_id, message_data)
+            
+    async def handle_unknown(self, connection_id: str, message_type):
+        """알 수 없는 메시지 타입"""
+        await self.manager.send_personal_message({
+            "type": "error",
+            "message": f"Unknown message type: {message_type}"
+        }, connection_id)
+        
+    async def handle_ping(self, connection_id: str, message_data: dict = None):
         """핑 응답"""
         await self.manager.send_personal_message({
             "type": "pong",
@@ -319,7 +334,7 @@ class WebSocketHandler:
         if message and user_id:
             await self.manager.send_ai_message(connection_id, message, user_id)
             
-    async def handle_end_ai_session(self, connection_id: str):
+    async def handle_end_ai_session(self, connection_id: str, message_data: dict = None):
         """AI 세션 종료"""
         await self.manager.end_ai_session(connection_id)
         
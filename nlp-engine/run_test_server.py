@@ -40,7 +40,10 @@ def run_server():
             host="0.0.0.0",
             port=8000,
             reload=True,
-            log_level="info"
+            log_level="info",
+            ws="websockets",
+            ws_per_message_deflate=False,
+            ws_max_size=2 ** 20
         )
     except KeyboardInterrupt:
         print("\n\n✅ 서버가 정상적으로 종료되었습니다.")
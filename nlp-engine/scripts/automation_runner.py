@@ -63,7 +63,10 @@ class VIBAAutomationRunner:
         
         try:
             process = subprocess.Popen(
-                [sys.executable, "-m", "uvicorn", "main:app", "--reload", "--host", "0.0.0.0", "--port", "8000"],
+                [
+                    sys.executable, "-m", "uvicorn", "main:app", "--reload", "--host", "0.0.0.0", "--port", "8000",
+                    "--ws", "websockets", "--ws-per-message-deflate", "false", "--ws-max-size", str(2 ** 20)
+                ],
                 cwd=backend_dir,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+에이전트 시스템 프롬프트 압축 단위 테스트
+압축 프롬프트는 OpenAI 요청에만 쓰이고 공개 에이전트 정보에는 노출되지 않는지 검증
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ai_agent_service import AIAgentService, AgentType, compress_prompt
+from ai_routes import router
+
+class TestAgentPrompts(unittest.TestCase):
+    """_initialize_agents / _build_openai_messages 테스트"""
+
+    def setUp(self):
+        self.service = AIAgentService()
+
+    def test_agent_info_has_no_internal_fields(self):
+        """에이전트 정보에는 압축 프롬프트가 없음"""
+        for agent_id, config in self.service.get_all_agents().items():
+            with self.subTest(agent_id=agent_id):
+                self.assertNotIn("system_prompt_compressed", config)
+
+    def test_agents_endpoint_has_no_internal_fields(self):
+        """/api/ai/agents 응답에도 압축 프롬프트가 없음"""
+        app = FastAPI()
+        app.include_router(router)
+        with TestClient(app) as client:
+            agents = client.get("/api/ai/agents").json()["agents"]
+        self.assertTrue(agents)
+        for config in agents.values():
+            self.assertNotIn("system_prompt_compressed", config)
+
+    def test_openai_messages_use_compressed_prompt(self):
+        """OpenAI 요청의 시스템 메시지는 압축된 프롬프트"""
+        config = self.service.get_agent_info(AgentType.MATERIALS_SPECIALIST)
+        messages, _ = self.service._build_openai_messages(config, [], config["model"])
+        self.assertEqual(messages[0], {"role": "system", "content": compress_prompt(config["system_prompt"])})
+
+if __name__ == '__main__':
+    unittest.main()
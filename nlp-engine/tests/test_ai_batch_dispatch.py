@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AI 요청 배치 전송 단위 테스트
+동일 요청 병합, future 결과/예외 전달, 종료 시 전송 태스크 정리 검증
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+from unittest.mock import AsyncMock, patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from ai_agent_service import AIAgentService
+
+AGENT = {"name": "materials", "system_prompt": "재료 전문가"}
+
+def make_history(content):
+    return [{"role": "user", "content": content}]
+
+class TestBatchDispatch(unittest.TestCase):
+    """_dispatch_batch / start_batch_worker / close 테스트"""
+
+    def setUp(self):
+        self.service = AIAgentService()
+        self.service.redis = None
+
+    def test_identical_requests_are_coalesced(self):
+        """같은 에이전트의 같은 대화는 한 번만 호출하고 모든 future에 결과 전달"""
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            futures = [loop.create_future() for _ in range(3)]
+            batch = [
+                (AGENT, make_history("원목 마루 추천"), futures[0]),
+                (AGENT, make_history("원목 마루 추천"), futures[1]),
+                (AGENT, make_history("타일 추천"), futures[2]),
+            ]
+            generate = AsyncMock(side_effect=lambda config, history: f"답변:{history[0]['content']}")
+            with patch.object(self.service, "_generate_openai_response", generate):
+                await self.service._dispatch_batch(batch)
+            return generate.await_count, [future.result() for future in futures]
+
+        call_count, results = asyncio.run(scenario())
+        self.assertEqual(call_count, 2)
+        self.assertEqual(results, ["답변:원목 마루 추천", "답변:원목 마루 추천", "답변:타일 추천"])
+
+    def test_exception_is_set_on_group_futures_only(self):
+        """실패한 요청의 예외는 해당 그룹 future에만 전달"""
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            failed, succeeded = loop.create_future(), loop.create_future()
+
+            async def generate(config, history):
+                if history[0]["content"] == "실패":
+                    raise RuntimeError("rate limited")
+                return "성공"
+
+            with patch.object(self.service, "_generate_openai_response", generate):
+                await self.service._dispatch_batch([
+                    (AGENT, make_history("실패"), failed),
+                    (AGENT, make_history("정상"), succeeded),
+                ])
+            return failed, succeeded
+
+        failed, succeeded = asyncio.run(scenario())
+        self.assertIsInstance(failed.exception(), RuntimeError)
+        self.assertEqual(succeeded.result(), "성공")
+
+    def test_cancelled_dispatch_cancels_pending_futures(self):
+        """전송 태스크가 취소되면 기다리던 future도 취소되어 호출자가 멈추지 않음"""
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            async def hang(config, history):
+                await asyncio.sleep(3600)
+
+            with patch.object(self.service, "_generate_openai_response", hang):
+                task = asyncio.create_task(self.service._dispatch_batch([(AGENT, make_history("대기"), future)]))
+                await asyncio.sleep(0)
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+            return future
+
+        self.assertTrue(asyncio.run(scenario()).cancelled())
+
+    def test_worker_keeps_dispatch_tasks_and_close_drains_them(self):
+        """배치 워커는 전송 태스크 참조를 유지하고 close()는 끝날 때까지 기다림"""
+        async def scenario():
+            release = asyncio.Event()
+
+            async def generate(config, history):
+                await release.wait()
+                return "완료"
+
+            with patch.object(self.service, "_generate_openai_response", generate):
+                worker = asyncio.create_task(self.service.start_batch_worker())
+                await asyncio.sleep(0)
+                request = asyncio.create_task(
+                    self.service._submit_openai_request(AGENT, make_history("질문"))
+                )
+                while not self.service._dispatch_tasks:
+                    await asyncio.sleep(0.005)
+                tracked = len(self.service._dispatch_tasks)
+
+                loop = asyncio.get_running_loop()
+                loop.call_later(0.01, release.set)
+                await self.service.close()
+                worker.cancel()
+                await asyncio.gather(worker, return_exceptions=True)
+                return tracked, await request, len(self.service._dispatch_tasks)
+
+        tracked, result, remaining = asyncio.run(scenario())
+        self.assertEqual(tracked, 1)
+        self.assertEqual(result, "완료")
+        self.assertEqual(remaining, 0)
+
+    def test_close_cancels_dispatch_after_drain_timeout(self):
+        """제한 시간 안에 끝나지 않은 전송은 취소되고 호출자는 CancelledError를 받음"""
+        async def scenario():
+            async def generate(config, history):
+                await asyncio.sleep(3600)
+
+            with patch("ai_agent_service.BATCH_DRAIN_TIMEOUT_SECONDS", 0.01), \
+                 patch.object(self.service, "_generate_openai_response", generate):
+                worker = asyncio.create_task(self.service.start_batch_worker())
+                await asyncio.sleep(0)
+                request = asyncio.create_task(
+                    self.service._submit_openai_request(AGENT, make_history("질문"))
+                )
+                while not self.service._dispatch_tasks:
+                    await asyncio.sleep(0.005)
+                await self.service.close()
+                worker.cancel()
+                await asyncio.gather(worker, return_exceptions=True)
+                results = await asyncio.gather(request, return_exceptions=True)
+                return results[0], len(self.service._dispatch_tasks)
+
+        result, remaining = asyncio.run(scenario())
+        self.assertIsInstance(result, asyncio.CancelledError)
+        self.assertEqual(remaining, 0)
+
+if __name__ == '__main__':
+    unittest.main()
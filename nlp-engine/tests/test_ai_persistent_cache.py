@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AI 응답 디스크 캐시 단위 테스트
+백그라운드 기록, 시작 시 압축, 파일 줄 수 상한 검증
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import orjson
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import ai_agent_service as service_module
+from ai_agent_service import AIAgentService
+
+class TestPersistentCache(unittest.TestCase):
+    """_persist_cache_entry / _load_persistent_cache 테스트"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache_file = Path(self.tmpdir.name) / "ai_cache.jsonl"
+        patches = [
+            patch.object(service_module, "CACHE_PATH", str(self.cache_file)),
+            patch.object(service_module, "EXACT_CACHE_MAXSIZE", 3),
+            patch.object(service_module, "CACHE_FILE_MAX_LINES", 5),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def make_service(self):
+        service = AIAgentService()
+        service.redis = None
+        return service
+
+    def read_keys(self):
+        with self.cache_file.open("rb") as f:
+            return [orjson.loads(line)["k"] for line in f]
+
+    def store(self, service, items):
+        async def scenario():
+            for key, value in items:
+                await service._response_cache_set(key, value)
+            await service.close()
+        asyncio.run(scenario())
+
+    def test_empty_path_disables_disk_cache(self):
+        """AI_CACHE_PATH가 비어 있으면 파일을 만들지 않음 (기본값)"""
+        with patch.object(service_module, "CACHE_PATH", ""):
+            service = self.make_service()
+            self.store(service, [("a", "응답A")])
+        self.assertIsNone(service._cache_path)
+        self.assertFalse(self.cache_file.exists())
+
+    def test_entries_are_written_in_background_and_restored(self):
+        """저장된 항목은 close() 전에 기록이 끝나고 재시작 시 복원됨"""
+        self.store(self.make_service(), [("a", "응답A"), ("b", "응답B")])
+        self.assertEqual(self.read_keys(), ["a", "b"])
+
+        restored = self.make_service()
+        self.assertEqual(list(restored._exact_cache.items()), [("a", "응답A"), ("b", "응답B")])
+
+    def test_file_is_compacted_on_load(self):
+        """시작 시 중복/제거된 항목을 버리고 현재 LRU 내용으로 다시 씀"""
+        lines = [orjson.dumps({"k": key, "v": key.upper()}) + b"\n" for key in ["a", "b", "a", "c", "d"]]
+        self.cache_file.write_bytes(b"".join(lines) + b"broken\n")
+
+        service = self.make_service()
+        self.assertEqual(list(service._exact_cache), ["a", "c", "d"])
+        self.assertEqual(self.read_keys(), ["a", "c", "d"])
+
+    def test_file_line_count_is_capped(self):
+        """기록 중 줄 수 상한을 넘으면 현재 캐시 내용으로 다시 씀"""
+        service = self.make_service()
+        self.store(service, [(f"k{index}", f"v{index}") for index in range(8)])
+
+        keys = self.read_keys()
+        self.assertLessEqual(len(keys), service_module.CACHE_FILE_MAX_LINES)
+        self.assertEqual(keys[-3:], ["k5", "k6", "k7"])
+        self.assertEqual(list(self.make_service()._exact_cache), ["k5", "k6", "k7"])
+
+if __name__ == '__main__':
+    unittest.main()
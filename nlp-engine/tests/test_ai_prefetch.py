@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+후속 분석 미리 실행 단위 테스트
+결과 보관 한도(LRU/만료)와 종료 시 백그라운드 분석 취소 검증
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import ai_agent_service as service_module
+from ai_agent_service import AIAgentService, AgentType
+from errors import NotFoundError
+
+class TestPrefetch(unittest.TestCase):
+    """_prefetch / close 테스트"""
+
+    def setUp(self):
+        self.service = AIAgentService()
+        self.service.redis = None
+
+    def start_prefetch(self, agent_type=AgentType.MATERIALS_SPECIALIST, analysis_id="analysis-1"):
+        task = asyncio.create_task(self.service._prefetch(agent_type, {}, "", analysis_id))
+        self.service._background_tasks.add(task)
+        task.add_done_callback(self.service._background_tasks.discard)
+        return task
+
+    def run_prefetches(self, analysis_ids):
+        async def scenario():
+            async def analyze(agent_type, project_data, base_info):
+                return {"agent": agent_type.value}
+
+            with patch.object(self.service, "_run_agent_analysis", analyze):
+                for analysis_id in analysis_ids:
+                    await self.service._prefetch(AgentType.MATERIALS_SPECIALIST, {}, "", analysis_id)
+        asyncio.run(scenario())
+
+    @unittest.skipIf("AI_ANALYSIS_PREFETCH" in os.environ, "환경 변수로 설정을 지정함")
+    def test_prefetch_is_opt_in(self):
+        """AI_ANALYSIS_PREFETCH 미설정 시 미리 실행하지 않음 (기본값)"""
+        self.assertFalse(service_module.ANALYSIS_PREFETCH_ENABLED)
+
+    def test_prefetched_results_use_bounded_store(self):
+        """미리 실행한 결과는 analysis_cache가 아니라 크기 제한 LRU에 보관"""
+        with patch.object(service_module, "PREFETCH_CACHE_MAXSIZE", 2):
+            self.run_prefetches(["a1", "a2", "a3"])
+
+        self.assertEqual(self.service.analysis_cache, {})
+        self.assertEqual(list(self.service._prefetch_cache), ["a2:materials_specialist", "a3:materials_specialist"])
+        result = asyncio.run(self.service.get_analysis_result("a3:materials_specialist"))
+        self.assertEqual(result, {"agent": "materials_specialist"})
+        with self.assertRaises(NotFoundError):
+            asyncio.run(self.service.get_analysis_result("a1:materials_specialist"))
+
+    def test_prefetched_results_expire(self):
+        """보관 시간이 지난 결과는 조회되지 않고 제거됨"""
+        with patch.object(service_module, "PREFETCH_CACHE_TTL_SECONDS", 0):
+            self.run_prefetches(["a1"])
+
+        with self.assertRaises(NotFoundError):
+            asyncio.run(self.service.get_analysis_result("a1:materials_specialist"))
+        self.assertEqual(len(self.service._prefetch_cache), 0)
+
+    def test_close_cancels_prefetch_before_closing_client(self):
+        """close()는 OpenAI 클라이언트를 닫기 전에 미리 실행 중인 분석을 취소"""
+        async def scenario():
+            async def hang(*args):
+                await asyncio.sleep(3600)
+
+            with patch.object(self.service, "_run_agent_analysis", hang):
+                task = self.start_prefetch()
+                await asyncio.sleep(0)
+
+                client = MagicMock()
+                client.close = AsyncMock(side_effect=lambda: self.assertTrue(task.done()))
+                self.service._client = client
+                await self.service.close()
+            return task, client
+
+        task, client = asyncio.run(scenario())
+        self.assertTrue(task.cancelled())
+        client.close.assert_awaited_once()
+        self.assertEqual(len(self.service._background_tasks), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AI 캐시 Redis 상태 보고 단위 테스트
+서버가 없으면 redis_enabled가 False이고, 마지막 명령 결과를 따라가는지 검증
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+from unittest.mock import AsyncMock, patch
+
+import fakeredis
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from ai_agent_service import AIAgentService
+
+class TestRedisStatus(unittest.TestCase):
+    """check_redis / get_cache_stats 테스트"""
+
+    def test_unreachable_server_is_reported_disabled(self):
+        """연결할 수 없는 Redis는 시작 확인 후 비활성으로 보고"""
+        async def scenario():
+            with patch.dict(os.environ, {"REDIS_HOST": "127.0.0.1", "REDIS_PORT": "1"}):
+                service = AIAgentService()
+            before = service.get_cache_stats()["redis_enabled"]
+            connected = await service.check_redis()
+            return before, connected, service.get_cache_stats()["redis_enabled"]
+
+        self.assertEqual(asyncio.run(scenario()), (False, False, False))
+
+    def test_status_follows_last_command(self):
+        """ping 성공 후 사용 중으로 보고하고 명령이 실패하면 비활성으로 전환"""
+        async def scenario():
+            service = AIAgentService()
+            service.redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+            connected = await service.check_redis()
+            enabled = service.get_cache_stats()["redis_enabled"]
+
+            with patch.object(service.redis, "get", AsyncMock(side_effect=ConnectionError("down"))):
+                await service._response_cache_get("missing")
+            return connected, enabled, service.get_cache_stats()["redis_enabled"]
+
+        self.assertEqual(asyncio.run(scenario()), (True, True, False))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AI WebSocket 수신 배치 단위 테스트
+프레임별 파싱, 잘못된 JSON 오류 응답, 배치 수집 중 연결 해제 처리 검증
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from serialization import json_loads
+from websocket_manager import manager
+import ai_routes
+
+class FakeWebSocket:
+    """미리 정한 프레임을 한 번에 돌려주고 마지막에 연결 해제를 알리는 WebSocket"""
+
+    def __init__(self, frames):
+        self.incoming = [{"type": "websocket.receive", "text": frame} for frame in frames]
+        self.incoming.append({"type": "websocket.disconnect", "code": 1001})
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def receive(self):
+        return self.incoming.pop(0)
+
+    async def send_text(self, data):
+        self.sent.append(json_loads(data))
+
+def run_endpoint(frames):
+    websocket = FakeWebSocket(frames)
+    asyncio.run(ai_routes.websocket_endpoint(websocket, "ws_batch_user"))
+    # 연결 확인 메시지는 제외
+    return websocket.sent[1:]
+
+class TestWebSocketBatch(unittest.TestCase):
+    """websocket_endpoint / _handle_frames 테스트"""
+
+    def test_frames_received_before_disconnect_are_processed(self):
+        """배치 수집 중 연결이 끊겨도 이미 받은 프레임은 순서대로 처리"""
+        sent = run_endpoint(['{"type": "ping"}', '{"type": "ping"}', '{"type": "custom"}'])
+        self.assertEqual([message["type"] for message in sent], ["pong", "error"])
+        self.assertEqual(sent[1]["message"], "Unknown message type: custom")
+        self.assertNotIn("ws_batch_user", manager.user_connections)
+
+    def test_bad_json_frame_does_not_drop_batch(self):
+        """잘못된 JSON 프레임은 해당 프레임만 오류 응답하고 나머지는 처리"""
+        sent = run_endpoint(['{"type": "ping"}', '{"type": ', '[1, 2]', '{"type": "custom"}'])
+        self.assertEqual([message["type"] for message in sent], ["pong", "error", "error", "error"])
+        self.assertEqual(sent[1]["message"], "잘못된 메시지 형식입니다.")
+        self.assertEqual(sent[2]["message"], "잘못된 메시지 형식입니다.")
+        self.assertEqual(sent[3]["message"], "Unknown message type: custom")
+
+    def test_pings_in_one_batch_get_single_pong(self):
+        """같은 배치의 ping은 pong 1회로 응답"""
+        sent = run_endpoint(['{"type": "ping"}'] * 5)
+        self.assertEqual([message["type"] for message in sent], ["pong"])
+
+if __name__ == '__main__':
+    unittest.main()
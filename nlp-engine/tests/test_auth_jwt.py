@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+강화된 인증 JWT 단위 테스트
+HS256 인코딩/검증, PyJWT 호환성, 변조/만료 토큰 거부 검증
+"""
+
+import os
+import sys
+import time
+import unittest
+from datetime import timedelta
+
+import jwt
+import orjson
+from fastapi import HTTPException
+
+# 테스트 속도를 위해 bcrypt 비용을 낮춤 (auth_enhanced import 전에 설정)
+os.environ.setdefault("BCRYPT_COST", "4")
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import auth_enhanced as auth_module
+from auth_enhanced import AuthEnhanced, SECRET_KEY, _b64url_encode
+
+class TestJWTCodec(unittest.TestCase):
+    """_encode_jwt / _decode_jwt / verify_token 테스트"""
+
+    def setUp(self):
+        self.auth = AuthEnhanced()
+
+    def assert_rejected(self, token, detail="Invalid token"):
+        with self.assertRaises(HTTPException) as ctx:
+            self.auth.verify_token(token)
+        self.assertEqual((ctx.exception.status_code, ctx.exception.detail), (401, detail))
+
+    def test_round_trip(self):
+        """발급한 토큰은 같은 클레임으로 검증됨"""
+        payload = self.auth.verify_token(self.auth.create_access_token({"sub": "alice", "role": "admin"}))
+        self.assertEqual((payload["sub"], payload["role"], payload["type"]), ("alice", "admin", "access"))
+        self.assertEqual(self.auth.verify_token(self.auth.create_refresh_token({"sub": "alice"}))["type"], "refresh")
+
+    def test_pyjwt_interoperability(self):
+        """표준 HS256 구현(PyJWT)과 서로 검증 가능"""
+        token = self.auth.create_access_token({"sub": "alice"})
+        self.assertEqual(jwt.decode(token, SECRET_KEY, algorithms=["HS256"])["sub"], "alice")
+
+        foreign = jwt.encode({"sub": "bob", "exp": int(time.time()) + 60}, SECRET_KEY, algorithm="HS256")
+        self.assertEqual(self.auth.verify_token(foreign)["sub"], "bob")
+
+    def test_tampered_tokens_are_rejected(self):
+        """페이로드/서명 변조, 다른 키, 형식 오류는 모두 401"""
+        header, payload, signature = self.auth.create_access_token({"sub": "alice"}).split(".")
+        forged_payload = _b64url_encode(orjson.dumps({"sub": "admin", "exp": int(time.time()) + 60})).decode()
+        flipped = ("A" if signature[0] != "A" else "B") + signature[1:]
+        other_key = jwt.encode({"sub": "alice"}, "another-secret-key-for-tests-0000", algorithm="HS256")
+
+        for token in (f"{header}.{forged_payload}.{signature}", f"{header}.{payload}.{flipped}",
+                      other_key, f"{header}.{payload}", "not-a-token", f"{header}.@@@.{signature}"):
+            with self.subTest(token=token):
+                self.assert_rejected(token)
+
+    def test_algorithm_header_is_pinned(self):
+        """alg=none 등 서버가 발급하지 않은 헤더는 서명과 무관하게 거부"""
+        payload = _b64url_encode(orjson.dumps({"sub": "admin", "exp": int(time.time()) + 60})).decode()
+        none_header = _b64url_encode(orjson.dumps({"alg": "none", "typ": "JWT"})).decode()
+        self.assert_rejected(f"{none_header}.{payload}.")
+
+        hs512 = jwt.encode({"sub": "admin"}, SECRET_KEY + "-padding-for-hs512-key-length-000000000000", algorithm="HS512")
+        self.assert_rejected(hs512)
+
+    def test_non_object_payload_is_rejected(self):
+        """서명이 맞아도 페이로드가 객체가 아니면 거부"""
+        signing_input = auth_module._JWT_SIGNING_PREFIX + _b64url_encode(b"[1, 2]")
+        token = (signing_input + b"." + _b64url_encode(self.auth._sign(signing_input))).decode()
+        self.assert_rejected(token)
+
+    def test_expiry(self):
+        """만료된 토큰과 숫자가 아닌 exp는 거부"""
+        expired = self.auth.create_access_token({"sub": "alice"}, expires_delta=timedelta(seconds=-1))
+        self.assert_rejected(expired, "Token has expired")
+        self.assert_rejected(self.auth._encode_jwt({"sub": "alice", "exp": "tomorrow"}))
+        self.assert_rejected(self.auth._encode_jwt({"sub": "alice", "exp": True}))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JWT 검증 결과 캐시 단위 테스트
+캐시 적중, 만료, 사용자별 무효화 검증
+"""
+
+import os
+import sys
+import time
+import unittest
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from fastapi import HTTPException
+
+# 테스트 속도를 위해 bcrypt 비용을 낮춤 (auth_enhanced import 전에 설정)
+os.environ.setdefault("BCRYPT_COST", "4")
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import auth_enhanced as auth_module
+from auth_enhanced import AuthEnhanced
+
+class TestJWTCache(unittest.TestCase):
+    """verify_token 검증 결과 캐시 테스트"""
+
+    def setUp(self):
+        self.auth = AuthEnhanced()
+        self.decode = patch.object(self.auth, "_decode_jwt", wraps=self.auth._decode_jwt).start()
+        self.addCleanup(patch.stopall)
+
+    def test_repeated_token_skips_signature_check(self):
+        """같은 토큰은 캐시에서 반환"""
+        token = self.auth.create_access_token({"sub": "alice"})
+        first = self.auth.verify_token(token)
+        self.assertIs(self.auth.verify_token(token), first)
+        self.assertEqual(self.decode.call_count, 1)
+
+    def test_cache_entry_expires_with_ttl(self):
+        """캐시 TTL이 지나면 다시 서명 검증"""
+        with patch.object(auth_module, "JWT_CACHE_TTL_SECONDS", 0):
+            token = self.auth.create_access_token({"sub": "alice"})
+            self.auth.verify_token(token)
+            self.auth.verify_token(token)
+        self.assertEqual(self.decode.call_count, 2)
+
+    def test_cached_token_still_expires(self):
+        """캐시된 토큰도 exp가 지나면 만료 오류"""
+        token = self.auth.create_access_token({"sub": "alice"}, expires_delta=timedelta(seconds=5))
+        self.auth.verify_token(token)
+
+        later = time.time() + 10
+        with patch.object(auth_module, "time", SimpleNamespace(time=lambda: later)):
+            with self.assertRaises(HTTPException) as ctx:
+                self.auth.verify_token(token)
+        self.assertEqual(ctx.exception.detail, "Token has expired")
+
+    def test_invalidate_user_tokens(self):
+        """사용자 토큰 무효화 시 해당 사용자 항목만 제거"""
+        alice = self.auth.create_access_token({"sub": "alice"})
+        bob = self.auth.create_access_token({"sub": "bob"})
+        self.auth.verify_token(alice)
+        self.auth.verify_token(bob)
+
+        self.auth.invalidate_user_tokens("alice")
+        self.auth.verify_token(alice)
+        self.auth.verify_token(bob)
+        self.assertEqual(self.decode.call_count, 3)
+
+    def test_cache_size_is_bounded(self):
+        """최대 크기를 넘으면 가장 오래 사용하지 않은 토큰부터 제거"""
+        tokens = [self.auth.create_access_token({"sub": f"user{index}"}) for index in range(3)]
+        with patch.object(auth_module, "JWT_CACHE_MAXSIZE", 2):
+            for token in tokens:
+                self.auth.verify_token(token)
+            self.assertEqual(len(self.auth._jwt_cache), 2)
+            self.auth.verify_token(tokens[0])
+        self.assertEqual(self.decode.call_count, 4)
+
+if __name__ == '__main__':
+    unittest.main()
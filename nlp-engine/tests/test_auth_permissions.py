@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+권한 비트마스크 단위 테스트
+권한 비트, 역할 마스크, has_permission 검증
+"""
+
+import os
+import sys
+import unittest
+
+# 테스트 속도를 위해 bcrypt 비용을 낮춤 (auth_enhanced import 전에 설정)
+os.environ.setdefault("BCRYPT_COST", "4")
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from auth_enhanced import (
+    AuthEnhanced, Permission, UserRole, ROLE_PERMISSIONS, ROLE_PERMISSION_MASKS, permissions_from_mask
+)
+
+class TestPermissionMasks(unittest.TestCase):
+    """권한 비트마스크 테스트"""
+
+    def test_bits_are_unique_powers_of_two(self):
+        bits = [permission.bit for permission in Permission]
+        self.assertEqual(len(set(bits)), len(bits))
+        for bit in bits:
+            self.assertEqual(bit & (bit - 1), 0)
+
+    def test_role_masks_match_permission_sets(self):
+        """역할 마스크는 역할 권한 집합과 정확히 대응"""
+        for role, permissions in ROLE_PERMISSIONS.items():
+            with self.subTest(role=role):
+                self.assertEqual(permissions_from_mask(ROLE_PERMISSION_MASKS[role]), permissions)
+
+    def test_has_permission_follows_role_changes(self):
+        """has_permission은 역할 권한 집합과 같고 역할 변경 시 함께 갱신"""
+        auth = AuthEnhanced()
+        auth.create_user_internal({
+            "username": "mask_user", "email": "mask_user@viba.ai",
+            "password_hash": "unused", "role": UserRole.VIEWER
+        })
+        user = auth.users_db["mask_user"]
+
+        for role in (UserRole.VIEWER, UserRole.ADMIN, UserRole.DESIGNER):
+            auth.set_user_role(user, role)
+            for permission in Permission:
+                with self.subTest(role=role, permission=permission):
+                    self.assertEqual(auth.has_permission(user, permission), permission in ROLE_PERMISSIONS[role])
+
+if __name__ == '__main__':
+    unittest.main()
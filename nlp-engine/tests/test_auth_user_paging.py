@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+사용자 목록 조회 API 단위 테스트
+역할/상태 인덱스 필터링과 skip/limit 페이징 경계값 검증
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+# 테스트 속도를 위해 bcrypt 비용을 낮춤 (auth_enhanced import 전에 설정)
+os.environ.setdefault("BCRYPT_COST", "4")
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import auth_enhanced as auth_module
+from auth_enhanced import auth_enhanced, UserRole, UserStatus
+from auth_routes import router
+
+class TestUserPaging(unittest.TestCase):
+    """GET /api/auth/users 테스트"""
+
+    @classmethod
+    def setUpClass(cls):
+        # Redis 없이 메모리 저장소로 동작하도록 고정
+        cls.redis_patch = patch.object(auth_module, "REDIS_AVAILABLE", False)
+        cls.redis_patch.start()
+        asyncio.run(auth_enhanced.ensure_default_users())
+
+        # 필터링 검증용 사용자 (designer 3명 중 1명 정지)
+        for index in range(3):
+            username = f"paging_designer_{index}"
+            if username not in auth_enhanced.users_db:
+                auth_enhanced.create_user_internal({
+                    "username": username,
+                    "email": f"{username}@viba.ai",
+                    "password_hash": "unused",
+                    "role": UserRole.DESIGNER
+                })
+        auth_enhanced.set_user_status(auth_enhanced.users_db["paging_designer_1"], UserStatus.SUSPENDED)
+
+        app = FastAPI()
+        app.include_router(router)
+        cls.client = TestClient(app)
+
+        response = cls.client.post("/api/auth/login", params={"username": "admin", "password": "Admin123!"})
+        cls.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.redis_patch.stop()
+
+    def get_usernames(self, **params):
+        response = self.client.get("/api/auth/users", params=params, headers=self.headers)
+        self.assertEqual(response.status_code, 200, response.text)
+        return [user["username"] for user in response.json()]
+
+    def test_pagination_follows_users_db_order(self):
+        """skip/limit는 전체 목록 순서의 구간과 같아야 함"""
+        all_usernames = list(auth_enhanced.users_db)
+        self.assertEqual(self.get_usernames(limit=1000), all_usernames)
+        self.assertEqual(self.get_usernames(skip=1, limit=2), all_usernames[1:3])
+        self.assertEqual(self.get_usernames(skip=len(all_usernames)), [])
+
+    def test_role_filter(self):
+        """역할 필터는 해당 역할 사용자만 반환"""
+        usernames = self.get_usernames(role="designer")
+        self.assertEqual(
+            [name for name in usernames if name.startswith("paging_")],
+            ["paging_designer_0", "paging_designer_1", "paging_designer_2"]
+        )
+        for name in usernames:
+            self.assertEqual(auth_enhanced.users_db[name].role, UserRole.DESIGNER)
+
+    def test_status_filter(self):
+        """상태 필터는 해당 상태 사용자만 반환"""
+        self.assertIn("paging_designer_1", self.get_usernames(status="suspended"))
+        self.assertNotIn("paging_designer_1", self.get_usernames(status="active", limit=1000))
+
+    def test_role_and_status_filter(self):
+        """역할과 상태를 함께 지정하면 교집합을 순서대로 반환"""
+        usernames = self.get_usernames(role="designer", status="active")
+        self.assertIn("paging_designer_0", usernames)
+        self.assertIn("paging_designer_2", usernames)
+        self.assertNotIn("paging_designer_1", usernames)
+        self.assertLess(usernames.index("paging_designer_0"), usernames.index("paging_designer_2"))
+        self.assertEqual(self.get_usernames(role="designer", status="active", skip=1, limit=1), usernames[1:2])
+
+    def test_invalid_paging_bounds_return_422(self):
+        """음수 skip, 0 이하 또는 상한 초과 limit은 422"""
+        for params in ({"skip": -1}, {"limit": -5}, {"limit": 0}, {"limit": 1001}):
+            with self.subTest(params=params):
+                response = self.client.get("/api/auth/users", params=params, headers=self.headers)
+                self.assertEqual(response.status_code, 422)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+앱 오류 미들웨어 단위 테스트
+도메인 예외만 400/404로 변환하고 나머지 예외는 500으로 숨기는지 검증
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+import main
+from errors import InvalidRequestError, NotFoundError
+
+class Item(BaseModel):
+    count: int
+
+def build_client():
+    app = FastAPI()
+    app.middleware("http")(main.error_mw)
+
+    @app.get("/invalid")
+    async def invalid():
+        raise InvalidRequestError("면적은 0보다 커야 합니다")
+
+    @app.get("/missing")
+    async def missing():
+        raise NotFoundError("세션을 찾을 수 없습니다: s-1")
+
+    @app.get("/validation")
+    async def validation():
+        Item(count="not-a-number")
+
+    @app.get("/value-error")
+    async def value_error():
+        raise ValueError("internal detail")
+
+    @app.get("/key-error")
+    async def key_error():
+        return {}["secret_key"]
+
+    return TestClient(app)
+
+class TestErrorMiddleware(unittest.TestCase):
+    """main.error_mw 테스트"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.client = build_client()
+
+    def test_domain_errors_keep_message(self):
+        """도메인 예외는 매핑된 상태 코드와 메시지로 응답"""
+        response = self.client.get("/invalid")
+        self.assertEqual((response.status_code, response.json()["detail"]), (400, "면적은 0보다 커야 합니다"))
+
+        response = self.client.get("/missing")
+        self.assertEqual((response.status_code, response.json()["detail"]), (404, "세션을 찾을 수 없습니다: s-1"))
+
+    def test_other_errors_are_hidden_as_500(self):
+        """ValidationError, 일반 ValueError/KeyError는 내용을 노출하지 않고 500"""
+        for path in ("/validation", "/value-error", "/key-error"):
+            with self.subTest(path=path), self.assertLogs(main.logger, level="ERROR"):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 500)
+                self.assertEqual(response.json()["detail"], "내부 서버 오류가 발생했습니다")
+
+if __name__ == '__main__':
+    unittest.main()